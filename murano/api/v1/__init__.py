@@ -20,7 +20,7 @@ stats = None
 SUPPORTED_PARAMS = ('id', 'order_by', 'category', 'marker', 'tag',
                     'class_name', 'limit', 'type', 'fqn', 'category', 'owned',
                     'search', 'include_disabled', 'sort_dir', 'name')
-LIST_PARAMS = ('id', 'category', 'tag', 'class', 'order_by')
+LIST_PARAMS = ('id', 'category', 'tag', 'class', 'class_name', 'order_by')
 ORDER_VALUES = ('fqn', 'name', 'created')
 PKG_PARAMS_MAP = {'display_name': 'name',
                   'full_name': 'fully_qualified_name',
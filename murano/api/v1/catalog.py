@@ -13,7 +13,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import base64
 import cgi
+import hashlib
 import os
 import tempfile
 
@@ -393,6 +395,18 @@ class Controller(object):
         db_api.category_delete(category_id)
 
 
+class PackageResponseSerializer(wsgi.ResponseSerializer):
+    def serialize_body(self, response, data, content_type, action):
+        super(PackageResponseSerializer, self).serialize_body(
+            response, data, content_type, action)
+        if action == 'download' and data is not None:
+            # NOTE: allows clients streaming the archive to verify its
+            # integrity. Must be set after the body, since assigning the
+            # body resets Content-MD5
+            response.content_md5 = base64.b64encode(
+                hashlib.md5(data).digest()).decode('ascii')
+
+
 def create_resource():
     specific_content_types = {
         'get_ui': ['text/plain'],
@@ -401,4 +415,6 @@ def create_resource():
         'get_supplier_logo': ['application/octet-stream']}
     deserializer = wsgi.RequestDeserializer(
         specific_content_types=specific_content_types)
-    return wsgi.Resource(Controller(), deserializer=deserializer)
+    serializer = PackageResponseSerializer()
+    return wsgi.Resource(Controller(), deserializer=deserializer,
+                         serializer=serializer)
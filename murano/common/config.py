@@ -54,7 +54,18 @@ rabbit_opts = [
                 help='Boolean flag to enable SSL communication through the '
                 'RabbitMQ broker between murano-engine and guest agents.'),
     cfg.StrOpt('ca_certs', default='',
-               help='SSL cert file (valid only if SSL enabled).')
+               help='SSL cert file (valid only if SSL enabled).'),
+    cfg.IntOpt('connection_pool_size', default=10, min=0,
+               help='Maximum number of idle RabbitMQ connections that each '
+               'murano-engine process keeps open for communication with '
+               'guest agents.'),
+    cfg.IntOpt('results_prefetch_count', default=20, min=1,
+               help='Maximum number of unacknowledged agent results that '
+               'the broker delivers to a murano-engine process.'),
+    cfg.IntOpt('results_ack_batch_size', default=10, min=1,
+               help='Number of agent results acknowledged to the broker '
+               'at once. Results are also acknowledged when no new ones '
+               'arrive for a second.')
 ]
 
 heat_opts = [
@@ -200,7 +211,17 @@ engine_opts = [
                help=_('Time for waiting for a response from murano agent '
                       'during the deployment')),
     cfg.IntOpt('workers',
-               help=_('Number of workers'))
+               help=_('Number of workers')),
+    cfg.IntOpt('trace_sampling_rate', default=1, min=1,
+               help=_('When TRACE logging is enabled, log only every Nth '
+                      'MuranoPL method call. The default is to log all '
+                      'calls.')),
+    cfg.ListOpt('traced_methods', default=[],
+                help=_('Patterns of MuranoPL methods to log when TRACE '
+                       'logging is enabled, in the form '
+                       'Class::method with fnmatch wildcards, for example '
+                       'io.murano.resources.*::deploy. All methods are '
+                       'logged if the list is empty.'))
 ]
 
 # TODO(sjmc7): move into engine opts?
@@ -223,6 +244,36 @@ packages_opts = [
                 help=_('List of directories to load local packages from. '
                        'If not provided, packages will be loaded only API')),
 
+    cfg.IntOpt('load_packages_from_refresh_interval', default=0,
+               help=_('Minimal interval in seconds between scans of '
+                      'load_packages_from directories for added, removed or '
+                      'modified packages. Local packages are indexed once per '
+                      'murano-engine process and only modified packages are '
+                      'loaded again. 0 means that directories are scanned '
+                      'at the beginning of each task.')),
+
+    cfg.IntOpt('class_cache_size', default=500,
+               help=_('Maximum number of parsed class definitions kept in '
+                      'memory of each murano-engine process and shared '
+                      'between deployments. 0 disables the cache.')),
+
+    cfg.IntOpt('resource_cache_size', default=200,
+               help=_('Maximum number of package resource files kept in '
+                      'memory of each murano-engine process, both as read '
+                      'and as parsed by the io.murano.system.Resources '
+                      'class. 0 disables the cache.')),
+
+    cfg.IntOpt('package_definitions_ttl', default=60,
+               help=_('Time in seconds for which murano-engine reuses '
+                      'results of package lookups in the catalog made for '
+                      'the same tenant. 0 disables caching of lookups.')),
+
+    cfg.IntOpt('prefetch_pool_size', default=8,
+               help=_('Maximum number of packages that are downloaded '
+                      'concurrently when murano-engine fetches packages '
+                      'required by the object model before loading it. '
+                      '0 disables prefetching.')),
+
     cfg.IntOpt('package_size_limit', default=5,
                help='Maximum application package size, Mb'),
 
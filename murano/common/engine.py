@@ -24,11 +24,13 @@ import oslo_messaging as messaging
 from oslo_messaging import target
 from oslo_serialization import jsonutils
 from oslo_service import service
+import six
 
 from murano.common import auth_utils
 from murano.common.helpers import token_sanitizer
 from murano.common.plugins import extensions_loader
 from murano.common import rpc
+from murano.dsl import constants
 from murano.dsl import context_manager
 from murano.dsl import dsl_exception
 from murano.dsl import executor as dsl_executor
@@ -119,6 +121,21 @@ class TaskProcessingEndpoint(object):
                 task_desc=jsonutils.dumps(result)))
 
 
+def _find_object_headers(data):
+    """Yields system headers of all the objects in the model"""
+    if isinstance(data, dict):
+        header = data.get('?')
+        if isinstance(header, dict) and 'type' in header:
+            yield header
+        for value in six.itervalues(data):
+            for header in _find_object_headers(value):
+                yield header
+    elif isinstance(data, list):
+        for item in data:
+            for header in _find_object_headers(item):
+                yield header
+
+
 class TaskExecutor(object):
     @property
     def action(self):
@@ -169,8 +186,15 @@ class TaskExecutor(object):
     def _execute(self, pkg_loader):
         get_plugin_loader().register_in_loader(pkg_loader)
 
+        try:
+            self._prefetch_packages(pkg_loader)
+        except Exception:
+            LOG.warning(_LW('Unable to prefetch packages'), exc_info=True)
+
         executor = dsl_executor.MuranoDslExecutor(
-            pkg_loader, ContextManager(), self.session)
+            pkg_loader, ContextManager(), self.session,
+            trace_sampling=CONF.engine.trace_sampling_rate,
+            traced_methods=CONF.engine.traced_methods)
         try:
             obj = executor.load(self.model)
         except Exception as e:
@@ -191,25 +215,32 @@ class TaskExecutor(object):
         finally:
             LOG.debug('Invoking post-cleanup hooks')
             self.session.finish()
-        self._model['ObjectsCopy'] = copy.deepcopy(self._model.get('Objects'))
 
         action_result = None
         if self.action:
+            # serialized model comes with its own ObjectsCopy
+            model_serialized = False
             try:
                 LOG.debug('Invoking pre-execution hooks')
                 self.session.start()
                 try:
                     action_result = self._invoke(executor)
                 finally:
+                    self._log_lock_statistics(executor)
                     try:
                         self._model = serializer.serialize_model(obj, executor)
+                        model_serialized = True
                     except Exception as e:
                         return self.exception_result(e, None, '<model>')
             except Exception as e:
                 return self.exception_result(e, obj, self.action['method'])
             finally:
+                if not model_serialized:
+                    self._copy_objects()
                 LOG.debug('Invoking post-execution hooks')
                 self.session.finish()
+        else:
+            self._copy_objects()
 
         try:
             action_result = serializer.serialize(action_result)
@@ -223,6 +254,33 @@ class TaskExecutor(object):
             }
         }
 
+    @staticmethod
+    def _log_lock_statistics(executor):
+        statistics = sorted(
+            six.iteritems(executor.lock_statistics),
+            key=lambda t: t[1]['wait_time'], reverse=True)
+        for name, stats in statistics:
+            LOG.debug('Method {name} waited for lock {waits} times, '
+                      '{time:.3f} s total'.format(
+                          name=name, waits=stats['waits'],
+                          time=stats['wait_time']))
+
+    def _prefetch_packages(self, pkg_loader):
+        class_specs = {}
+        package_specs = {}
+        for key in (constants.DM_OBJECTS, constants.DM_OBJECTS_COPY):
+            for header in _find_object_headers(self.model.get(key)):
+                version_spec = helpers.parse_version_spec(
+                    header.get('classVersion'))
+                if 'package' in header:
+                    package_specs.setdefault(header['package'], version_spec)
+                else:
+                    class_specs.setdefault(header['type'], version_spec)
+        pkg_loader.prefetch(class_specs, package_specs)
+
+    def _copy_objects(self):
+        self._model['ObjectsCopy'] = copy.deepcopy(self._model.get('Objects'))
+
     def exception_result(self, exception, root, method_name):
         if isinstance(exception, dsl_exception.MuranoPlException):
             LOG.error('\n' + exception.format(prefix='  '))
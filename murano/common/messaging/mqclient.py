@@ -14,6 +14,7 @@
 # limitations under the License.
 
 import ssl as ssl_module
+import time
 
 from eventlet import patcher
 from oslo_serialization import jsonutils
@@ -24,8 +25,11 @@ kombu = patcher.import_patched('kombu')
 
 
 class MqClient(object):
+    # number of reconnection attempts made when broker connection is lost
+    max_retries = 2
+
     def __init__(self, login, password, host, port, virtual_host,
-                 ssl=False, ca_certs=None):
+                 ssl=False, ca_certs=None, declared_queues=None):
         ssl_params = None
 
         if ssl is True:
@@ -45,6 +49,9 @@ class MqClient(object):
         )
         self._channel = None
         self._connected = False
+        self._producer = None
+        # queue declarations made by this process, shared by pooled clients
+        self._declared_queues = declared_queues
 
     def __enter__(self):
         self.connect()
@@ -62,6 +69,16 @@ class MqClient(object):
     def close(self):
         self._connection.close()
         self._connected = False
+        self._producer = None
+
+    @property
+    def connected(self):
+        return self._connected
+
+    @property
+    def connection_errors(self):
+        return (self._connection.connection_errors +
+                self._connection.channel_errors)
 
     def declare(self, queue, exchange='', enable_ha=False, ttl=0):
         if not self._connected:
@@ -79,18 +96,34 @@ class MqClient(object):
         if ttl > 0:
             queue_arguments['x-expires'] = ttl
 
+        key = (queue, exchange)
+        if self._declared_queues is not None:
+            declared_at = self._declared_queues.get(key)
+            # queue may expire if it is not used, so it is re-declared
+            # well before that could happen
+            if declared_at is not None and (
+                    ttl <= 0 or time.time() - declared_at < ttl / 2000.0):
+                return
+
         exchange = kombu.Exchange(exchange, type='direct', durable=True)
         queue = kombu.Queue(queue, exchange, queue, durable=True,
                             queue_arguments=queue_arguments)
         bound_queue = queue(self._connection)
-        bound_queue.declare()
+        self._connection.ensure(
+            bound_queue, bound_queue.declare, max_retries=self.max_retries)()
+        if self._declared_queues is not None:
+            self._declared_queues[key] = time.time()
 
     def send(self, message, key, exchange=''):
         if not self._connected:
             raise RuntimeError('Not connected to RabbitMQ')
 
-        producer = kombu.Producer(self._connection)
-        producer.publish(
+        if self._producer is None:
+            self._producer = kombu.Producer(self._connection)
+        publish = self._connection.ensure(
+            self._producer, self._producer.publish,
+            max_retries=self.max_retries)
+        publish(
             exchange=str(exchange),
             routing_key=str(key),
             body=jsonutils.dumps(message.body),
@@ -103,3 +136,10 @@ class MqClient(object):
 
         return subscription.Subscription(
             self._connection, queue, prefetch_count)
+
+    def open_multiplexed(self, prefetch_count=1, ack_batch_size=1):
+        if not self._connected:
+            raise RuntimeError('Not connected to RabbitMQ')
+
+        return subscription.MultiplexedSubscription(
+            self._connection, prefetch_count, ack_batch_size)
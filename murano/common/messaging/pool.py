@@ -0,0 +1,77 @@
+#    Copyright (c) 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import contextlib
+
+from oslo_log import log as logging
+
+LOG = logging.getLogger(__name__)
+
+
+class ConnectionPool(object):
+    """Connected MqClient instances reused by the engine process
+
+    Clients are taken from the pool for the duration of a with block and
+    are returned to it afterwards. A client that failed is closed and
+    dropped, so the next use of the pool connects to the broker again.
+    """
+
+    def __init__(self, factory, max_size=10):
+        self._factory = factory
+        self._max_size = max_size
+        self._idle = collections.deque()
+        self._declared_queues = {}
+        self.connections_created = 0
+
+    def _create(self):
+        client = self._factory(declared_queues=self._declared_queues)
+        client.connect()
+        self.connections_created += 1
+        return client
+
+    @contextlib.contextmanager
+    def acquire(self):
+        client = None
+        while self._idle and client is None:
+            client = self._idle.pop()
+            if not client.connected:
+                client = None
+        if client is None:
+            client = self._create()
+        try:
+            yield client
+        except BaseException as e:
+            # state of the connection is unknown after the failure
+            if isinstance(e, client.connection_errors):
+                LOG.debug('Dropping broker connection after error: '
+                          '{err}'.format(err=e))
+                self._declared_queues.clear()
+            self._close(client)
+            raise
+        if len(self._idle) < self._max_size:
+            self._idle.append(client)
+        else:
+            self._close(client)
+
+    @staticmethod
+    def _close(client):
+        try:
+            client.close()
+        except Exception:
+            LOG.debug('Error closing broker connection', exc_info=True)
+
+    def close(self):
+        while self._idle:
+            self._close(self._idle.pop())
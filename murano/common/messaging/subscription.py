@@ -18,10 +18,14 @@ import socket
 import time
 
 from eventlet import patcher
+from oslo_log import log as logging
+import six
 
+from murano.common.i18n import _LE
 from murano.common.messaging import message
 
 kombu = patcher.import_patched('kombu')
+LOG = logging.getLogger(__name__)
 
 
 class Subscription(object):
@@ -65,3 +69,69 @@ class Subscription(object):
 
     def _receive(self, message_data, message):
         self._buffer.append(message)
+
+
+class MultiplexedSubscription(object):
+    """Consumes messages from several queues over a single channel
+
+    Messages are acknowledged in batches after they were handled, using
+    a single acknowledgement for all the messages received so far.
+    """
+
+    def __init__(self, connection, prefetch_count=1, ack_batch_size=1):
+        self._connection = connection
+        self._channel = connection.channel()
+        self._prefetch_count = prefetch_count
+        # acks must not be held back once prefetch window is full
+        self._ack_batch_size = max(1, min(ack_batch_size, prefetch_count))
+        self._consumers = {}
+        self._last_delivery_tag = None
+        self._unacked = 0
+
+    @property
+    def queues(self):
+        return six.viewkeys(self._consumers)
+
+    def add_queue(self, queue, callback):
+        consumer = kombu.Consumer(
+            self._channel, queues=[kombu.Queue(name=queue, exchange=None)],
+            auto_declare=False)
+        consumer.register_callback(
+            lambda body, msg_handle: self._receive(callback, msg_handle))
+        consumer.qos(prefetch_count=self._prefetch_count)
+        consumer.consume()
+        self._consumers[queue] = consumer
+
+    def remove_queue(self, queue):
+        consumer = self._consumers.pop(queue, None)
+        if consumer is not None:
+            consumer.cancel()
+
+    def drain(self, timeout=None):
+        """Handles incoming messages, returns False on timeout"""
+        try:
+            self._connection.drain_events(timeout=timeout)
+        except socket.timeout:
+            self.flush()
+            return False
+        return True
+
+    def flush(self):
+        if self._last_delivery_tag is not None:
+            self._channel.basic_ack(self._last_delivery_tag, multiple=True)
+            self._last_delivery_tag = None
+            self._unacked = 0
+
+    def _receive(self, callback, msg_handle):
+        # NOTE: a message that cannot be handled is acknowledged anyway,
+        # otherwise it would be redelivered to the consumer over and over
+        try:
+            callback(message.Message(self._connection, msg_handle))
+        except Exception:
+            LOG.exception(_LE('Unable to handle message {tag}').format(
+                tag=msg_handle.delivery_tag))
+        finally:
+            self._last_delivery_tag = msg_handle.delivery_tag
+            self._unacked += 1
+            if self._unacked >= self._ack_batch_size:
+                self.flush()
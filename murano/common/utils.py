@@ -14,6 +14,8 @@
 
 import collections
 import functools as func
+import threading
+import time
 
 import eventlet
 import jsonschema
@@ -194,6 +196,80 @@ def is_different(obj1, obj2):
         return False
 
 
+class LruCache(object):
+    """Bounded mapping which evicts least recently used entries first.
+
+    Safe to share between threads and greenthreads of the same process.
+    Number of successful and failed lookups is tracked in `hits` and
+    `misses` attributes. If `ttl` is set entries expire after that number
+    of seconds.
+    """
+
+    def __init__(self, capacity, ttl=None):
+        self._capacity = capacity
+        self._data = collections.OrderedDict()
+        self._lock = threading.RLock()
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    @capacity.setter
+    def capacity(self, value):
+        with self._lock:
+            self._capacity = value
+            self._shrink()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value, expires = self._data.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            if expires is not None and expires <= time.time():
+                self.misses += 1
+                return default
+            self._data[key] = value, expires
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data.pop(key, None)
+            if self._capacity > 0:
+                expires = time.time() + self.ttl if self.ttl else None
+                self._data[key] = value, expires
+                self._shrink()
+
+    def pop(self, key, default=None):
+        with self._lock:
+            value, expires = self._data.pop(key, (default, None))
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _shrink(self):
+        while len(self._data) > max(self._capacity, 0):
+            self._data.popitem(last=False)
+
+    def __contains__(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and (
+                entry[1] is None or entry[1] > time.time())
+
+    def __len__(self):
+        return len(self._data)
+
+
 def build_entity_map(value):
     def build_entity_map_recursive(value, id_map):
         if isinstance(value, dict):
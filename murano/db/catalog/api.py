@@ -20,6 +20,7 @@ from oslo_log import log as logging
 import six
 import sqlalchemy as sa
 from sqlalchemy import or_
+from sqlalchemy import orm
 from sqlalchemy.orm import attributes
 # TODO(ruhe) use exception declared in openstack/common/db
 from webob import exc
@@ -36,6 +37,8 @@ SEARCH_MAPPING = {'fqn': 'fully_qualified_name',
                   'created': 'created'
                   }
 
+PACKAGE_BLOB_COLUMNS = ('archive', 'logo', 'supplier_logo', 'ui_definition')
+
 LOG = logging.getLogger(__name__)
 
 
@@ -293,7 +296,10 @@ def package_search(filters, context, manage_public=False,
     session = db_session.get_session()
     pkg = models.Package
 
-    query = session.query(pkg)
+    # NOTE: search results are never used to fetch package blobs, so
+    # there is no need to transfer them from the database
+    query = session.query(pkg).options(
+        *[orm.defer(column) for column in PACKAGE_BLOB_COLUMNS])
 
     if catalog:
         # Only show packages one can deploy, i.e. own + public
@@ -327,8 +333,11 @@ def package_search(filters, context, manage_public=False,
         query = query.filter(pkg.tags.any(
             models.Tag.name.in_(filters['tag'])))
     if 'class_name' in filters.keys():
+        class_names = filters['class_name']
+        if isinstance(class_names, six.string_types):
+            class_names = [class_names]
         query = query.filter(pkg.class_definitions.any(
-            models.Class.name == filters['class_name']))
+            models.Class.name.in_(class_names)))
     if 'fqn' in filters.keys():
         query = query.filter(pkg.fully_qualified_name == filters['fqn'])
     if 'name' in filters.keys():
@@ -16,6 +16,7 @@ import semantic_version
 
 EXPRESSION_MEMORY_QUOTA = 512 * 1024
 ITERATORS_LIMIT = 2000
+PARSE_CACHE_SIZE = 5000
 
 CTX_ACTIONS_ONLY = '?actionsOnly'
 CTX_ALLOW_PROPERTY_WRITES = '$?allowPropertyWrites'
@@ -42,6 +43,7 @@ DM_ATTRIBUTES = 'Attributes'
 
 META_MURANO_METHOD = '?muranoMethod'
 META_NO_TRACE = '?noTrace'
+META_NO_LOCK = '?noLock'
 META_MPL_META = 'Meta'
 META_USAGE = 'Usage'
 
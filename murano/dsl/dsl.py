@@ -83,6 +83,34 @@ class MuranoObjectParameter(yaqltypes.PythonType):
             return result.object
 
 
+class MuranoObjectSequenceParameter(yaqltypes.Sequence):
+    def __init__(self, murano_class=None, nullable=False, version_spec=None,
+                 decorate=True):
+        self.item_type = MuranoObjectParameter(
+            murano_class, False, version_spec, decorate)
+        super(MuranoObjectSequenceParameter, self).__init__(
+            nullable=nullable)
+
+    def check(self, value, context, *args, **kwargs):
+        if not super(MuranoObjectSequenceParameter, self).check(
+                value, context, *args, **kwargs):
+            return False
+        if value is None or isinstance(value, yaql_expressions.Expression):
+            return True
+        return all(self.item_type.check(item, context, *args, **kwargs)
+                   for item in value)
+
+    def convert(self, value, sender, context, function_spec, engine,
+                *args, **kwargs):
+        result = super(MuranoObjectSequenceParameter, self).convert(
+            value, sender, context, function_spec, engine, *args, **kwargs)
+        if result is None:
+            return None
+        return [self.item_type.convert(item, sender, context, function_spec,
+                                       engine, *args, **kwargs)
+                for item in result]
+
+
 class ThisParameter(yaqltypes.HiddenParameterType, yaqltypes.SmartType):
     def __init__(self):
         super(ThisParameter, self).__init__(False)
@@ -311,8 +339,7 @@ class Interfaces(object):
 
     @property
     def class_config(self):
-        return self.__object.type.package.get_class_config(
-            self.__object.type.name)
+        return self.__object.type.config
 
     @property
     def package_loader(self):
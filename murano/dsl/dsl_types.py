@@ -70,7 +70,7 @@ class MuranoMetaClass(MuranoClass):
 
 
 class MuranoObject(object):
-    pass
+    __slots__ = ()
 
 
 class MuranoMethod(object):
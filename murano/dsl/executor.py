@@ -14,11 +14,10 @@
 
 import collections
 import contextlib
+import fnmatch
 import itertools
 import weakref
 
-import eventlet
-import eventlet.event
 from oslo_log import log as logging
 import six
 from yaql.language import specs
@@ -30,6 +29,7 @@ from murano.dsl import constants
 from murano.dsl import dsl
 from murano.dsl import dsl_types
 from murano.dsl import helpers
+from murano.dsl import method_locks
 from murano.dsl import object_store
 from murano.dsl.principal_objects import stack_trace
 from murano.dsl import yaql_integration
@@ -38,14 +38,19 @@ LOG = logging.getLogger(__name__)
 
 
 class MuranoDslExecutor(object):
-    def __init__(self, package_loader, context_manager, session=None):
+    def __init__(self, package_loader, context_manager, session=None,
+                 trace_sampling=1, traced_methods=None):
         self._package_loader = package_loader
         self._context_manager = context_manager
         self._session = session
         self._attribute_store = attribute_store.AttributeStore()
         self._object_store = object_store.ObjectStore(self)
-        self._locks = {}
+        self._locks = method_locks.MethodLockManager()
         self._root_context_cache = {}
+        self._trace_sampling = max(1, trace_sampling or 1)
+        self._traced_methods = traced_methods or None
+        self._trace_counter = itertools.count()
+        self._trace_filter = {}
 
     @property
     def object_store(self):
@@ -59,6 +64,19 @@ class MuranoDslExecutor(object):
     def package_loader(self):
         return self._package_loader
 
+    @property
+    def method_locks(self):
+        return self._locks
+
+    @property
+    def lock_statistics(self):
+        """Time spent waiting for method locks, per method"""
+        return dict(
+            ('{0}/{1}::{2}'.format(method.declaring_type.name,
+                                   method.declaring_type.version,
+                                   method.name), stats)
+            for method, stats in six.iteritems(self._locks.statistics))
+
     @property
     def context_manager(self):
         return self._context_manager
@@ -111,7 +129,17 @@ class MuranoDslExecutor(object):
             args, kwargs = self._canonize_parameters(
                 method.arguments_scheme, args, kwargs)
 
-        with self._acquire_method_lock(method, this):
+        if (isinstance(method.body, specs.FunctionDefinition) and
+                method.body.meta.get(constants.META_NO_LOCK)):
+            lock_key = None
+        elif method.is_static:
+            lock_key = (method, method.declaring_type)
+        else:
+            lock_key = (method, this.object_id)
+        if lock_key is not None and not self._locks.acquire(
+                lock_key, helpers.get_current_thread_id(), method):
+            lock_key = None
+        try:
             for i, arg in enumerate(args, 2):
                 context[str(i)] = arg
             for key, value in six.iteritems(kwargs):
@@ -132,42 +160,37 @@ class MuranoDslExecutor(object):
                     return (None if method.body is None
                             else method.body.execute(context))
 
-            if (not isinstance(method.body, specs.FunctionDefinition) or
-                    not method.body.meta.get(constants.META_NO_TRACE)):
+            if self._is_traced(method):
                 with self._log_method(context, args, kwargs) as log:
                     result = call()
                     log(result)
                     return result
             else:
                 return call()
-
-    @contextlib.contextmanager
-    def _acquire_method_lock(self, method, this):
-        method_id = id(method)
-        if method.is_static:
-            this_id = id(method.declaring_type)
-        else:
-            this_id = this.object_id
-        thread_id = helpers.get_current_thread_id()
-        while True:
-            event, event_owner = self._locks.get(
-                (method_id, this_id), (None, None))
-            if event:
-                if event_owner == thread_id:
-                    event = None
-                    break
-                else:
-                    event.wait()
-            else:
-                event = eventlet.event.Event()
-                self._locks[(method_id, this_id)] = (event, thread_id)
-                break
-        try:
-            yield
         finally:
-            if event is not None:
-                del self._locks[(method_id, this_id)]
-                event.send()
+            if lock_key is not None:
+                self._locks.release(lock_key)
+
+    def _is_traced(self, method):
+        # nothing is formatted for method calls that are not logged
+        if not LOG.isEnabledFor(logging.TRACE):
+            return False
+        traced = self._trace_filter.get(method)
+        if traced is None:
+            if (isinstance(method.body, specs.FunctionDefinition) and
+                    method.body.meta.get(constants.META_NO_TRACE)):
+                traced = False
+            elif self._traced_methods is None:
+                traced = True
+            else:
+                method_name = '::'.join(
+                    (method.declaring_type.name, method.name))
+                traced = any(fnmatch.fnmatchcase(method_name, pattern)
+                             for pattern in self._traced_methods)
+            self._trace_filter[method] = traced
+        if traced and self._trace_sampling > 1:
+            return next(self._trace_counter) % self._trace_sampling == 0
+        return traced
 
     @contextlib.contextmanager
     def _log_method(self, context, args, kwargs):
@@ -232,12 +255,20 @@ class MuranoDslExecutor(object):
         objects_copy = data.get(constants.DM_OBJECTS_COPY)
         if not objects_copy:
             return
+        removed = [
+            system_key for system_key in
+            self._list_potential_objects(objects_copy)
+            if not self._object_store.has(system_key['id'])]
+        # the copy is loaded only to call destructors of removed objects
+        if not any(self._has_destructor(system_key)
+                   for system_key in removed):
+            return
+        removed_ids = [system_key['id'] for system_key in removed]
         gc_object_store = object_store.ObjectStore(self)
         gc_object_store.load(objects_copy, None)
         objects_to_clean = []
-        for object_id in self._list_potential_object_ids(objects_copy):
-            if (gc_object_store.has(object_id) and
-                    not self._object_store.has(object_id)):
+        for object_id in removed_ids:
+            if gc_object_store.has(object_id):
                 obj = gc_object_store.get(object_id)
                 objects_to_clean.append(obj)
         if objects_to_clean:
@@ -251,19 +282,23 @@ class MuranoDslExecutor(object):
                             'Muted exception during execution of .destroy '
                             'on {0}: {1}').format(obj, e), exc_info=True)
 
-    def _list_potential_object_ids(self, data):
+    def _has_destructor(self, system_key):
+        murano_class = self._object_store.get_class(system_key)
+        return bool(murano_class.find_methods(lambda m: m.name == '.destroy'))
+
+    def _list_potential_objects(self, data):
         if isinstance(data, dict):
             sys_dict = data.get('?')
             if (isinstance(sys_dict, dict) and
                     sys_dict.get('id') and sys_dict.get('type')):
-                yield sys_dict['id']
+                yield sys_dict
             for val in six.itervalues(data):
-                for res in self._list_potential_object_ids(val):
+                for res in self._list_potential_objects(val):
                     yield res
         elif isinstance(data, collections.Iterable) and not isinstance(
                 data, six.string_types):
             for val in data:
-                for res in self._list_potential_object_ids(val):
+                for res in self._list_potential_objects(val):
                     yield res
 
     def create_root_context(self, runtime_version):
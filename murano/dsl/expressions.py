@@ -12,6 +12,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import inspect
 
 import six
 
@@ -21,6 +22,8 @@ from murano.dsl import lhs_expression
 from murano.dsl import yaql_expression
 
 _macros = []
+_macro_signatures = {}
+_macro_index = {}
 
 
 class InstructionStub(object):
@@ -34,6 +37,44 @@ class InstructionStub(object):
 
 def register_macro(cls):
     _macros.append(cls)
+    _macro_signatures[cls] = _get_macro_signature(cls)
+    _macro_index.clear()
+
+
+def _get_macro_signature(cls):
+    try:
+        if six.PY3:
+            spec = inspect.getfullargspec(cls.__init__)
+            keywords = spec.varkw
+        else:
+            spec = inspect.getargspec(cls.__init__)
+            keywords = spec.keywords
+    except TypeError:
+        return None
+    if keywords:
+        return None
+    args = spec.args[1:]
+    required = args[:len(args) - len(spec.defaults or ())]
+    if six.PY3 and spec.kwonlyargs:
+        args = args + spec.kwonlyargs
+        required = required + [
+            t for t in spec.kwonlyargs if t not in (spec.kwonlydefaults or {})]
+    return frozenset(required), frozenset(args)
+
+
+def _get_macro_candidates(keywords):
+    # macros whose constructor can accept given set of keywords, in the
+    # order of registration
+    candidates = _macro_index.get(keywords)
+    if candidates is None:
+        candidates = []
+        for cls in _macros:
+            signature = _macro_signatures[cls]
+            if signature is None or (
+                    signature[0] <= keywords <= signature[1]):
+                candidates.append(cls)
+        candidates = _macro_index[keywords] = tuple(candidates)
+    return candidates
 
 
 class DslExpression(object):
@@ -56,6 +97,7 @@ class Statement(DslExpression):
 
         self._destination = lhs_expression.LhsExpression(key) if key else None
         self._expression = value
+        self._evaluate = helpers.compile_evaluator(value)
 
     @property
     def destination(self):
@@ -67,9 +109,9 @@ class Statement(DslExpression):
 
     def execute(self, context):
         try:
-            result = helpers.evaluate(self.expression, context)
-            if self.destination:
-                self.destination(result, context)
+            result = self._evaluate(context)
+            if self._destination is not None:
+                self._destination(result, context)
             return result
         except dsl_exception.MuranoPlException:
             raise
@@ -93,7 +135,7 @@ def parse_expression(expr):
                 kwds[key] = value
 
         if result is None:
-            for cls in _macros:
+            for cls in _get_macro_candidates(frozenset(kwds)):
                 try:
                     macro = cls(**kwds)
                     position = None
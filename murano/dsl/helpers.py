@@ -65,6 +65,31 @@ def evaluate(value, context):
         return value
 
 
+def _is_constant(value):
+    if isinstance(value, (dsl_types.YaqlExpression,
+                          yaql.language.expressions.Statement,
+                          dsl_types.MuranoObjectInterface)):
+        return False
+    elif isinstance(value, yaqlutils.MappingType):
+        return all(_is_constant(d_key) and _is_constant(d_value)
+                   for d_key, d_value in six.iteritems(value))
+    elif isinstance(value, (list, tuple, yaqlutils.SetType)):
+        return all(_is_constant(t) for t in value)
+    return not yaqlutils.is_iterable(value)
+
+
+def compile_evaluator(value):
+    """Returns function(context) equivalent to evaluate(value, context)"""
+
+    if isinstance(value, (dsl_types.YaqlExpression,
+                          yaql.language.expressions.Statement)):
+        return value
+    elif _is_constant(value):
+        result = evaluate(value, None)
+        return lambda context: result
+    return functools.partial(evaluate, value)
+
+
 def merge_lists(list1, list2):
     result = []
     for item in list1 + list2:
@@ -311,6 +336,36 @@ def traverse(seed, producer=None, track_visited=True):
 def cast(obj, murano_class, pov_or_version_spec=None):
     if isinstance(obj, dsl_types.MuranoObjectInterface):
         obj = obj.object
+    target, error = _get_cast_target(
+        obj.type, murano_class, pov_or_version_spec)
+    if error is not None:
+        raise error[0](error[1])
+    return obj.cast(target)
+
+
+def _get_cast_target(murano_type, murano_class, pov_or_version_spec):
+    cache = getattr(murano_type, 'cast_cache', None)
+    if not isinstance(cache, dict):
+        return find_cast_target(murano_type, murano_class, pov_or_version_spec)
+    key = (murano_class, pov_or_version_spec)
+    try:
+        result = cache.get(key)
+    except TypeError:
+        # unhashable version spec
+        return find_cast_target(murano_type, murano_class, pov_or_version_spec)
+    if result is None:
+        result = cache[key] = find_cast_target(
+            murano_type, murano_class, pov_or_version_spec)
+    return result
+
+
+def find_cast_target(murano_type, murano_class, pov_or_version_spec=None):
+    """Finds murano_type or its ancestor matching murano_class
+
+    :return: tuple (class, None) on success or (None, (exception_class,
+    class_name)) if cast is not possible
+    """
+
     if isinstance(pov_or_version_spec, dsl_types.MuranoType):
         pov_or_version_spec = pov_or_version_spec.package
     elif isinstance(pov_or_version_spec, six.string_types):
@@ -324,7 +379,7 @@ def cast(obj, murano_class, pov_or_version_spec=None):
         murano_class = murano_class.name
 
     candidates = []
-    for cls in itertools.chain((obj.type,), obj.type.ancestors()):
+    for cls in itertools.chain((murano_type,), murano_type.ancestors()):
         if cls.name != murano_class:
             continue
         elif isinstance(pov_or_version_spec, semantic_version.Version):
@@ -337,7 +392,7 @@ def cast(obj, murano_class, pov_or_version_spec=None):
             requirement = pov_or_version_spec.requirements.get(
                 cls.package.name)
             if requirement is None:
-                raise exceptions.NoClassFound(murano_class)
+                return None, (exceptions.NoClassFound, murano_class)
             if cls.version not in requirement:
                 continue
         elif pov_or_version_spec is not None:
@@ -345,18 +400,18 @@ def cast(obj, murano_class, pov_or_version_spec=None):
                              'type {0}'.format(type(pov_or_version_spec)))
         candidates.append(cls)
     if not candidates:
-        raise exceptions.NoClassFound(murano_class)
+        return None, (exceptions.NoClassFound, murano_class)
     elif len(candidates) > 1:
-        raise exceptions.AmbiguousClassName(murano_class)
-    return obj.cast(candidates[0])
+        return None, (exceptions.AmbiguousClassName, murano_class)
+    return candidates[0], None
 
 
 def is_instance_of(obj, class_name, pov_or_version_spec=None):
-    try:
-        cast(obj, class_name, pov_or_version_spec)
-        return True
-    except (exceptions.NoClassFound, exceptions.AmbiguousClassName):
-        return False
+    if isinstance(obj, dsl_types.MuranoObjectInterface):
+        obj = obj.object
+    target, error = _get_cast_target(
+        obj.type, class_name, pov_or_version_spec)
+    return error is None
 
 
 def memoize(func):
@@ -27,15 +27,19 @@ class CodeBlock(expressions.DslExpression):
     def __init__(self, body):
         body = helpers.list_value(body)
         self.code_block = list(map(expressions.parse_expression, body))
+        # statements are bound once so that execution does not need
+        # to look them up on every run
+        self._instructions = tuple(
+            (getattr(expr, 'virtual_instruction', None), expr.execute)
+            for expr in self.code_block)
 
     def execute(self, context):
-        for expr in self.code_block:
-            if hasattr(expr, 'virtual_instruction'):
-                instruction = expr.virtual_instruction
+        for instruction, execute in self._instructions:
+            if instruction is not None:
                 context[constants.CTX_CURRENT_INSTRUCTION] = instruction
 
             try:
-                expr.execute(context)
+                execute(context)
             except (dsl_exception.MuranoPlException,
                     exceptions.InternalFlowException):
                 raise
@@ -68,11 +72,10 @@ class MethodBlock(CodeBlock):
 
 class ReturnMacro(expressions.DslExpression):
     def __init__(self, Return):
-        self._value = Return
+        self._value = helpers.compile_evaluator(Return)
 
     def execute(self, context):
-        raise exceptions.ReturnException(
-            helpers.evaluate(self._value, context))
+        raise exceptions.ReturnException(self._value(context))
 
 
 class BreakMacro(expressions.DslExpression):
@@ -96,12 +99,13 @@ class ContinueMacro(expressions.DslExpression):
 class ParallelMacro(CodeBlock):
     def __init__(self, Parallel, Limit=None):
         super(ParallelMacro, self).__init__(Parallel)
-        self._limit = Limit or len(self.code_block)
+        self._limit = helpers.compile_evaluator(
+            Limit or len(self.code_block))
 
     def execute(self, context):
         if not self.code_block:
             return
-        limit = helpers.evaluate(self._limit, context)
+        limit = self._limit(context)
         helpers.parallel_select(
             self.code_block,
             lambda expr: expr.execute(context.create_child_context()),
@@ -112,10 +116,10 @@ class IfMacro(expressions.DslExpression):
     def __init__(self, If, Then, Else=None):
         self._code1 = CodeBlock(Then)
         self._code2 = None if Else is None else CodeBlock(Else)
-        self._condition = If
+        self._condition = helpers.compile_evaluator(If)
 
     def execute(self, context):
-        if helpers.evaluate(self._condition, context):
+        if self._condition(context):
             self._code1.execute(context)
         elif self._code2 is not None:
             self._code2.execute(context)
@@ -145,10 +149,10 @@ class ForMacro(expressions.DslExpression):
                 'For value must be of string type')
         self._code = CodeBlock(Do)
         self._var = For
-        self._collection = In
+        self._collection = helpers.compile_evaluator(In)
 
     def execute(self, context):
-        collection = helpers.evaluate(self._collection, context)
+        collection = self._collection(context)
         for t in collection:
             context[self._var] = t
             try:
@@ -164,11 +168,11 @@ class RepeatMacro(expressions.DslExpression):
         if not isinstance(Repeat, (int, yaql_expression.YaqlExpression)):
             raise exceptions.DslSyntaxError(
                 'Repeat value must be either int or expression')
-        self._count = Repeat
+        self._count = helpers.compile_evaluator(Repeat)
         self._code = CodeBlock(Do)
 
     def execute(self, context):
-        count = helpers.evaluate(self._count, context)
+        count = self._count(context)
         for _ in range(0, count):
             try:
                 self._code.execute(context)
@@ -183,15 +187,16 @@ class MatchMacro(expressions.DslExpression):
         if not isinstance(Match, dict):
             raise exceptions.DslSyntaxError(
                 'Match value must be of dictionary type')
-        self._switch = Match
-        self._value = Value
+        self._switch = [(key, CodeBlock(value))
+                        for key, value in six.iteritems(Match)]
+        self._value = helpers.compile_evaluator(Value)
         self._default = None if Default is None else CodeBlock(Default)
 
     def execute(self, context):
-        match_value = helpers.evaluate(self._value, context)
-        for key, value in six.iteritems(self._switch):
+        match_value = self._value(context)
+        for key, code in self._switch:
             if key == match_value:
-                CodeBlock(value).execute(context)
+                code.execute(context)
                 return
         if self._default is not None:
             self._default.execute(context)
@@ -202,15 +207,16 @@ class SwitchMacro(expressions.DslExpression):
         if not isinstance(Switch, dict):
             raise exceptions.DslSyntaxError(
                 'Switch value must be of dictionary type')
-        self._switch = Switch
+        self._switch = [(helpers.compile_evaluator(key), CodeBlock(value))
+                        for key, value in six.iteritems(Switch)]
         self._default = None if Default is None else CodeBlock(Default)
 
     def execute(self, context):
         matched = False
-        for key, value in six.iteritems(self._switch):
-            if helpers.evaluate(key, context):
+        for condition, code in self._switch:
+            if condition(context):
                 matched = True
-                CodeBlock(value).execute(context)
+                code.execute(context)
 
         if self._default is not None and not matched:
             self._default.execute(context)
@@ -0,0 +1,78 @@
+#    Copyright (c) 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import time
+
+import eventlet.event
+import six
+
+
+class MethodLockManager(object):
+    """Locks that serialize calls of a method on the same receiver
+
+    Locks are reentrant for the green thread that holds them. Uncontended
+    locks only record their owner, events to wait on are created when
+    another thread has to wait.
+    """
+
+    def __init__(self):
+        self._owners = {}
+        self._events = {}
+        self._waits = {}
+
+    def acquire(self, key, thread_id, name=None):
+        """Takes the lock and returns True if it must be released later
+
+        False is returned when the lock is already held by the thread.
+        Time spent waiting for the lock is accounted to name.
+        """
+        owner = self._owners.get(key)
+        if owner is None:
+            self._owners[key] = thread_id
+            return True
+        if owner == thread_id:
+            return False
+
+        start = time.time()
+        # all waiting threads are woken up on release and the first one
+        # to run takes the lock, others continue to wait
+        while owner is not None:
+            event = self._events.get(key)
+            if event is None:
+                event = self._events[key] = eventlet.event.Event()
+            event.wait()
+            owner = self._owners.get(key)
+        self._owners[key] = thread_id
+        stats = self._waits.get(name)
+        if stats is None:
+            stats = self._waits[name] = [0, 0.0]
+        stats[0] += 1
+        stats[1] += time.time() - start
+        return True
+
+    def release(self, key):
+        del self._owners[key]
+        event = self._events.pop(key, None)
+        if event is not None:
+            event.send()
+
+    def is_locked(self, key):
+        return key in self._owners
+
+    @property
+    def statistics(self):
+        """Number of waits and total wait time in seconds per method"""
+        return dict(
+            (name, {'waits': waits, 'wait_time': wait_time})
+            for name, (waits, wait_time) in six.iteritems(self._waits))
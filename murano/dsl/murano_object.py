@@ -24,38 +24,36 @@ from murano.dsl import helpers
 from murano.dsl import yaql_integration
 
 
+# marks property slots that were not assigned yet
+_NO_VALUE = object()
+
+
 class MuranoObject(dsl_types.MuranoObject):
+    # Parts of the object that represent its ancestor classes share the
+    # state of the object itself (real_this) and keep only values of the
+    # properties declared by their class.
+    __slots__ = (
+        '__weakref__', '__type', '__this', '__values', '__extra',
+        '__extension', '__initialized', '__pending_init', '__owner',
+        '__object_id', '__name', '__object_store', '__executor', '__parts')
+
     def __init__(self, murano_class, owner, object_store, executor,
-                 object_id=None, name=None, known_classes=None, this=None):
-        if known_classes is None:
-            known_classes = {}
-        self.__owner = owner.real_this if owner else None
-        self.__object_id = object_id or helpers.generate_id()
+                 object_id=None, name=None, this=None):
         self.__type = murano_class
-        self.__properties = {}
-        self.__parents = {}
         self.__this = this
-        self.__name = name
+        self.__values = None
+        self.__extra = None
         self.__extension = None
-        self.__object_store = \
-            None if object_store is None else weakref.ref(object_store)
-        self.__executor = weakref.ref(executor)
-        self.__config = murano_class.package.get_class_config(
-            murano_class.name)
-        if not isinstance(self.__config, dict):
-            self.__config = {}
-        known_classes[murano_class.name] = self
-        for parent_class in murano_class.parents(self.real_this.type):
-            name = parent_class.name
-            if name not in known_classes:
-                obj = parent_class.new(
-                    owner, object_store, executor, object_id=self.__object_id,
-                    known_classes=known_classes, this=self.real_this).object
-
-                self.__parents[name] = known_classes[name] = obj
-            else:
-                self.__parents[name] = known_classes[name]
         self.__initialized = False
+        self.__pending_init = None
+        if this is None:
+            self.__owner = owner.real_this if owner else None
+            self.__object_id = object_id or helpers.generate_id()
+            self.__name = name
+            self.__object_store = \
+                None if object_store is None else weakref.ref(object_store)
+            self.__executor = weakref.ref(executor)
+            self.__parts = None
 
     @property
     def extension(self):
@@ -71,34 +69,59 @@ class MuranoObject(dsl_types.MuranoObject):
 
     @property
     def object_store(self):
-        return None if self.__object_store is None else self.__object_store()
+        ref = self.real_this.__object_store
+        return None if ref is None else ref()
 
     @property
     def executor(self):
-        return self.__executor()
+        return self.real_this.__executor()
+
+    def __get_part(self, cls):
+        real = self.real_this
+        if cls is real.__type:
+            return real
+        parts = real.__parts
+        if parts is None:
+            parts = real.__parts = {}
+        part = parts.get(cls.name)
+        if part is None:
+            part = parts[cls.name] = MuranoObject(
+                cls, None, None, None, this=real)
+            if (cls.extension_class is not None and
+                    cls not in real.__type.initialized_types):
+                part.__extension = cls.extension_class()
+        return part
+
+    def __get_parents(self):
+        # parts without properties and initializers are created on cast
+        real_type = self.real_this.__type
+        required = real_type.initialized_types
+        return [self.__get_part(cls)
+                for cls in self.__type.parents(real_type)
+                if cls in required]
 
     def initialize(self, context, object_store, params):
-        if self.__initialized:
+        if self.__initialized or self.__pending_init is not None:
             return
         for property_name in self.__type.properties:
             spec = self.__type.properties[property_name]
             if spec.usage == dsl_types.PropertyUsages.Config:
-                if property_name in self.__config:
-                    property_value = self.__config[property_name]
+                if property_name in self.__type.config:
+                    property_value = self.__type.config[property_name]
                 else:
                     property_value = dsl.NO_VALUE
                 self.set_property(property_name, property_value)
 
         init = self.type.methods.get('.init')
-        used_names = set()
         names = set(self.__type.properties)
         if init:
             names.update(six.iterkeys(init.arguments_scheme))
-        last_errors = len(names)
         init_args = {}
-        while True:
-            errors = 0
-            for property_name in names:
+        pending = list(names)
+        while pending:
+            # properties that depend on uninitialized ones are retried
+            failed = []
+            for property_name in pending:
                 if init and property_name in init.arguments_scheme:
                     spec = init.arguments_scheme[property_name]
                     is_init_arg = True
@@ -106,15 +129,11 @@ class MuranoObject(dsl_types.MuranoObject):
                     spec = self.__type.properties[property_name]
                     is_init_arg = False
 
-                if property_name in used_names:
-                    continue
                 if spec.usage in (dsl_types.PropertyUsages.Config,
                                   dsl_types.PropertyUsages.Static):
-                    used_names.add(property_name)
                     continue
                 if spec.usage == dsl_types.PropertyUsages.Runtime:
                     if not spec.has_default:
-                        used_names.add(property_name)
                         continue
                     property_value = dsl.NO_VALUE
                 else:
@@ -125,21 +144,33 @@ class MuranoObject(dsl_types.MuranoObject):
                     else:
                         self.set_property(
                             property_name, property_value, context)
-                    used_names.add(property_name)
                 except exceptions.UninitializedPropertyAccessError:
-                    errors += 1
+                    failed.append(property_name)
                 except exceptions.ContractViolationException:
                     if spec.usage != dsl_types.PropertyUsages.Runtime:
                         raise
-            if not errors:
-                break
-            if errors >= last_errors:
+            if len(failed) == len(pending):
                 raise exceptions.CircularExpressionDependenciesError()
-            last_errors = errors
+            pending = failed
+
+        self.__pending_init = (context, params, init_args)
+        if object_store is not None and object_store.initializing:
+            for parent in self.__get_parents():
+                parent.initialize(context, object_store, params)
+            if self.__this is None:
+                object_store.schedule_initialization(self)
+        else:
+            self.complete_initialization(object_store)
+
+    def complete_initialization(self, object_store=None):
+        """Calls initializers postponed while object model was loading"""
+        if self.__pending_init is None:
+            return
+        context, params, init_args = self.__pending_init
+        self.__pending_init = None
 
         executor = helpers.get_executor(context)
-        if ((object_store is None or not object_store.initializing) and
-                self.__extension is None):
+        if self.__extension is None:
             method = self.type.methods.get('__init__')
             if method:
                 filtered_params = yaql_integration.filter_parameters(
@@ -149,17 +180,19 @@ class MuranoObject(dsl_types.MuranoObject):
                     executor, self, filtered_params[0],
                     filtered_params[1], context)
 
-        for parent in self.__parents.values():
+        for parent in self.__get_parents():
             parent.initialize(context, object_store, params)
+            parent.complete_initialization(object_store)
 
-        if (object_store is None or not object_store.initializing) and init:
+        init = self.type.methods.get('.init')
+        if init:
             context[constants.CTX_ARGUMENT_OWNER] = self.real_this
             init.invoke(executor, self.real_this, (), init_args, context)
-            self.__initialized = True
+        self.__initialized = True
 
     @property
     def object_id(self):
-        return self.__object_id
+        return self.real_this.__object_id
 
     @property
     def type(self):
@@ -167,7 +200,7 @@ class MuranoObject(dsl_types.MuranoObject):
 
     @property
     def owner(self):
-        return self.__owner
+        return self.real_this.__owner
 
     @property
     def real_this(self):
@@ -190,7 +223,8 @@ class MuranoObject(dsl_types.MuranoObject):
                 if spec.usage == dsl_types.PropertyUsages.Static:
                     return spec.declaring_type.get_property(name, context)
                 else:
-                    return self.cast(spec.declaring_type).__properties[name]
+                    return self.cast(
+                        spec.declaring_type)._get_property_value(name)
             except exceptions.NoPropertyFound:
                 if derived:
                     return self.cast(caller_class)._get_property_value(name)
@@ -198,24 +232,56 @@ class MuranoObject(dsl_types.MuranoObject):
                     raise exceptions.PropertyReadError(name, start_type)
 
     def _get_property_value(self, name):
-        try:
-            return self.__properties[name]
-        except KeyError:
+        index = self.__type.property_layout.get(name)
+        if index is None:
+            value = _NO_VALUE if self.__extra is None else self.__extra.get(
+                name, _NO_VALUE)
+        elif self.__values is not None and index < len(self.__values):
+            value = self.__values[index]
+        else:
+            value = _NO_VALUE
+        if value is _NO_VALUE:
             raise exceptions.UninitializedPropertyAccessError(
                 name, self.__type)
+        return value
+
+    def __set_property_value(self, name, value):
+        layout = self.__type.property_layout
+        index = layout.get(name)
+        if index is None:
+            # values written by derived classes into undeclared properties
+            if self.__extra is None:
+                self.__extra = {}
+            self.__extra[name] = value
+            return
+        values = self.__values
+        if values is None:
+            values = self.__values = [_NO_VALUE] * len(layout)
+        elif index >= len(values):
+            values.extend([_NO_VALUE] * (len(layout) - len(values)))
+        values[index] = value
+
+    def __iter_property_values(self):
+        if self.__values is not None:
+            for name, index in six.iteritems(self.__type.property_layout):
+                if index < len(self.__values):
+                    value = self.__values[index]
+                    if value is not _NO_VALUE:
+                        yield name, value
+        if self.__extra is not None:
+            for item in six.iteritems(self.__extra):
+                yield item
 
     def set_property(self, name, value, context=None):
         start_type, derived = self.__type, False
         caller_class = None if not context else helpers.get_type(context)
         if caller_class is not None and caller_class.is_compatible(self):
             start_type, derived = caller_class, True
-        declared_properties = start_type.find_properties(
-            lambda p: p.name == name)
+        declared_properties = start_type.find_properties_by_name(name)
         if context is None:
             context = self.executor.create_object_context(self)
         if len(declared_properties) > 0:
-            declared_properties = self.type.find_properties(
-                lambda p: p.name == name)
+            declared_properties = self.type.find_properties_by_name(name)
             values_to_assign = []
             classes_for_static_properties = []
             for spec in declared_properties:
@@ -228,7 +294,7 @@ class MuranoObject(dsl_types.MuranoObject):
                 if spec.usage == dsl_types.PropertyUsages.Static:
                     classes_for_static_properties.append(spec.declaring_type)
                 else:
-                    default = self.__config.get(name, spec.default)
+                    default = self.__type.config.get(name, spec.default)
                     # default = helpers.evaluate(default, context)
 
                     obj = self.cast(spec.declaring_type)
@@ -236,29 +302,52 @@ class MuranoObject(dsl_types.MuranoObject):
                         value, self.real_this,
                         self.real_this, context, default=default)))
             for obj, value in values_to_assign:
-                obj.__properties[name] = value
+                obj.__set_property_value(name, value)
             for cls in classes_for_static_properties:
                 cls.set_property(name, value, context)
         elif derived:
             obj = self.cast(caller_class)
-            obj.__properties[name] = value
+            obj.__set_property_value(name, value)
         else:
             raise exceptions.PropertyWriteError(name, start_type)
 
     def cast(self, cls):
-        for p in helpers.traverse(self, lambda t: t.__parents.values()):
-            if p.type is cls:
-                return p
+        real = self.real_this
+        if cls is self.__type:
+            return self
+        if cls is real.__type or cls in real.__type.ancestor_set:
+            part = self.__get_part(cls)
+            if part.__type is cls:
+                return part
         raise TypeError('Cannot cast {0} to {1}'.format(self.type, cls))
 
     def __repr__(self):
         return '<{0}/{1} {2} ({3})>'.format(
             self.type.name, self.type.version, self.object_id, id(self))
 
+    def __update_dictionary(self, cls, result, include_hidden):
+        # ancestors go first so that values of descendants take precedence
+        real = self.real_this
+        for parent in cls.parents(real.__type):
+            self.__update_dictionary(parent, result, include_hidden)
+        if cls is real.__type:
+            part = real
+        else:
+            part = (real.__parts or {}).get(cls.name)
+            if part is None or part.__type is not cls:
+                return
+        for name, value in part.__iter_property_values():
+            if include_hidden:
+                result[name] = value
+            else:
+                spec = cls.properties.get(name)
+                if (spec is not None and
+                        spec.usage != dsl_types.PropertyUsages.Runtime):
+                    result[name] = value
+
     def to_dictionary(self, include_hidden=False):
         result = {}
-        for parent in self.__parents.values():
-            result.update(parent.to_dictionary(include_hidden))
+        self.__update_dictionary(self.__type, result, include_hidden)
         result.update({'?': {
             'type': self.type.name,
             'id': self.object_id,
@@ -266,13 +355,4 @@ class MuranoObject(dsl_types.MuranoObject):
             'classVersion': str(self.type.version),
             'package': self.type.package.name
         }})
-        if include_hidden:
-            result.update(self.__properties)
-        else:
-            for property_name in self.type.properties:
-                if property_name in self.__properties:
-                    spec = self.type.properties[property_name]
-                    if spec.usage != dsl_types.PropertyUsages.Runtime:
-                        result[property_name] = self.__properties[
-                            property_name]
         return result
@@ -101,27 +101,31 @@ class MuranoPackage(dsl_types.MuranoPackage, dslmeta.MetaProvider):
         data = helpers.list_value(data)
         unnamed_class = None
         last_ns = {}
+        # NOTE: parsed class definitions are shared between deployments,
+        # so they must not be modified here
         for cls_data in data:
-            last_ns = cls_data.setdefault('Namespaces', last_ns.copy())
-            if len(cls_data) == 1:
+            last_ns = cls_data.get('Namespaces', last_ns)
+            if all(key == 'Namespaces' for key in cls_data):
                 continue
             cls_name = cls_data.get('Name')
+            ns_resolver = namespace_resolver.NamespaceResolver(last_ns)
             if not cls_name:
                 if unnamed_class:
                     raise exceptions.AmbiguousClassName(name)
-                unnamed_class = cls_data
+                unnamed_class = cls_data, ns_resolver
             else:
-                ns_resolver = namespace_resolver.NamespaceResolver(last_ns)
                 cls_name = ns_resolver.resolve_name(cls_name)
                 if cls_name == name:
                     type_obj = murano_type.create(
                         cls_data, self, cls_name, ns_resolver)
                     self._classes[name] = type_obj
-                else:
-                    self._load_queue.setdefault(cls_name, cls_data)
+                elif cls_name not in self._load_queue:
+                    self._load_queue[cls_name] = dict(
+                        cls_data, Namespaces=last_ns)
         if type_obj is None and unnamed_class:
-            unnamed_class['Name'] = name
-            return self._register_mpl_classes(unnamed_class, name)
+            cls_data, ns_resolver = unnamed_class
+            type_obj = murano_type.create(cls_data, self, name, ns_resolver)
+            self._classes[name] = type_obj
         return type_obj
 
     def _register_native_class(self, cls, name):
@@ -14,6 +14,7 @@
 
 import abc
 import collections
+import itertools
 import weakref
 
 import semantic_version
@@ -70,7 +71,8 @@ class MuranoClass(dsl_types.MuranoClass, MuranoType, dslmeta.MetaProvider):
         super(MuranoClass, self).__init__(ns_resolver, name, package)
         self._methods = {}
         self._properties = {}
-        self._config = {}
+        self._property_layout = {}
+        self._config = None
         self._extension_class = None
         if (self._name == constants.CORE_LIBRARY_OBJECT or
                 parents is utils.NO_VALUE):
@@ -90,6 +92,14 @@ class MuranoClass(dsl_types.MuranoClass, MuranoType, dslmeta.MetaProvider):
         self._meta = dslmeta.MetaData(meta, dsl_types.MetaTargets.Type, self)
         self._meta_values = None
         self._imports = list(self._resolve_imports(imports))
+        self._ancestors = None
+        self._ancestor_set = None
+        self._cast_cache = {}
+        # classes whose resolution tables include symbols of this class
+        self._descendants = weakref.WeakSet()
+        self._reset_tables()
+        for ancestor in self.ancestors():
+            ancestor._descendants.add(self)
 
     @property
     def usage(self):
@@ -105,10 +115,7 @@ class MuranoClass(dsl_types.MuranoClass, MuranoType, dslmeta.MetaProvider):
 
     @property
     def all_method_names(self):
-        names = set(self.methods.keys())
-        for c in self.ancestors():
-            names.update(c.methods.keys())
-        return tuple(names)
+        return tuple(set(method.name for method in self._get_all_methods()))
 
     @property
     def parent_mappings(self):
@@ -129,6 +136,7 @@ class MuranoClass(dsl_types.MuranoClass, MuranoType, dslmeta.MetaProvider):
         self._methods[name] = method
         self._context = None
         self._exported_context = None
+        self._invalidate_tables()
         return method
 
     @property
@@ -137,15 +145,43 @@ class MuranoClass(dsl_types.MuranoClass, MuranoType, dslmeta.MetaProvider):
 
     @property
     def all_property_names(self):
-        names = set(self.properties.keys())
-        for c in self.ancestors():
-            names.update(c.properties.keys())
-        return tuple(names)
+        self._get_all_properties()
+        return tuple(self._properties_by_name.keys())
 
     def add_property(self, property_typespec):
         if not isinstance(property_typespec, murano_property.MuranoProperty):
             raise TypeError('property_typespec')
         self._properties[property_typespec.name] = property_typespec
+        self._property_layout.setdefault(
+            property_typespec.name, len(self._property_layout))
+        self._invalidate_tables()
+
+    @property
+    def property_layout(self):
+        """Slot index of each declared property in object storage"""
+        return self._property_layout
+
+    @property
+    def config(self):
+        """Class configuration provided by the package"""
+        if self._config is None:
+            config = self.package.get_class_config(self.name)
+            self._config = config if isinstance(config, dict) else {}
+        return self._config
+
+    def _reset_tables(self):
+        self._resolved_methods = {}
+        self._resolved_properties = {}
+        self._resolved_static_properties = {}
+        self._all_methods = None
+        self._all_properties = None
+        self._properties_by_name = None
+        self._initialized_types = None
+
+    def _invalidate_tables(self):
+        self._reset_tables()
+        for cls in list(self._descendants):
+            cls._reset_tables()
 
     def _find_symbol_chains(self, func, origin):
         queue = collections.deque([(self, ())])
@@ -199,20 +235,70 @@ class MuranoClass(dsl_types.MuranoClass, MuranoType, dslmeta.MetaProvider):
                 result.append(chains[i][0])
         return result
 
+    def _resolve_method(self, name):
+        result = self._resolved_methods.get(name)
+        if result is None:
+            result = tuple(self._choose_symbol(
+                lambda cls: cls.methods.get(name)))
+            self._resolved_methods[name] = result
+        return result
+
+    def _resolve_property(self, name):
+        result = self._resolved_properties.get(name)
+        if result is None:
+            result = tuple(self._choose_symbol(
+                lambda cls: cls.properties.get(name)))
+            self._resolved_properties[name] = result
+        return result
+
+    def _resolve_static_property(self, name):
+        result = self._resolved_static_properties.get(name)
+        if result is None:
+            def prop_func(cls):
+                prop = cls.properties.get(name)
+                if prop is not None and prop.usage == 'Static':
+                    return prop
+
+            result = tuple(self._choose_symbol(prop_func))
+            self._resolved_static_properties[name] = result
+        return result
+
+    def _get_all_methods(self):
+        if self._all_methods is None:
+            result = list(self.methods.values())
+            seen = set(result)
+            for c in self.ancestors():
+                for method in six.itervalues(c.methods):
+                    if method not in seen:
+                        seen.add(method)
+                        result.append(method)
+            self._all_methods = tuple(result)
+        return self._all_methods
+
+    def _get_all_properties(self):
+        if self._all_properties is None:
+            result = []
+            seen = set()
+            by_name = {}
+            for c in itertools.chain((self,), self.ancestors()):
+                for prop in six.itervalues(c.properties):
+                    if prop not in seen:
+                        seen.add(prop)
+                        result.append(prop)
+                        by_name.setdefault(prop.name, []).append(prop)
+            self._all_properties = tuple(result)
+            self._properties_by_name = dict(
+                (name, tuple(props)) for name, props in six.iteritems(by_name))
+        return self._all_properties
+
     def find_method(self, name):
-        return self._choose_symbol(lambda cls: cls.methods.get(name))
+        return list(self._resolve_method(name))
 
     def find_property(self, name):
-        return self._choose_symbol(
-            lambda cls: cls.properties.get(name))
+        return list(self._resolve_property(name))
 
     def find_static_property(self, name):
-        def prop_func(cls):
-            prop = cls.properties.get(name)
-            if prop is not None and prop.usage == 'Static':
-                return prop
-
-        result = self._choose_symbol(prop_func)
+        result = self._resolve_static_property(name)
         if len(result) < 1:
             raise exceptions.NoPropertyFound(name)
         elif len(result) > 1:
@@ -220,7 +306,7 @@ class MuranoClass(dsl_types.MuranoClass, MuranoType, dslmeta.MetaProvider):
         return result[0]
 
     def find_single_method(self, name):
-        result = self.find_method(name)
+        result = self._resolve_method(name)
         if len(result) < 1:
             raise exceptions.NoMethodFound(name)
         elif len(result) > 1:
@@ -228,32 +314,26 @@ class MuranoClass(dsl_types.MuranoClass, MuranoType, dslmeta.MetaProvider):
         return result[0]
 
     def find_methods(self, predicate):
-        result = list(filter(predicate, self.methods.values()))
-        for c in self.ancestors():
-            for method in six.itervalues(c.methods):
-                if predicate(method) and method not in result:
-                    result.append(method)
-        return result
+        return list(filter(predicate, self._get_all_methods()))
 
     def find_properties(self, predicate):
-        result = list(filter(predicate, self.properties.values()))
-        for c in self.ancestors():
-            for prop in c.properties.values():
-                if predicate(prop) and prop not in result:
-                    result.append(prop)
-        return result
+        return list(filter(predicate, self._get_all_properties()))
+
+    def find_properties_by_name(self, name):
+        self._get_all_properties()
+        return self._properties_by_name.get(name, ())
 
     def _iterate_unique_methods(self):
         for name in self.all_method_names:
-            try:
-                yield self.find_single_method(name)
-            except exceptions.AmbiguousMethodName as e:
-                def func(*args, **kwargs):
-                    raise e
-                yield murano_method.MuranoMethod(self, name, func)
+            methods = self._resolve_method(name)
+            if len(methods) == 1:
+                yield methods[0]
+            else:
+                yield murano_method.MuranoMethod(
+                    self, name, _ambiguous_method_payload(name))
 
     def find_single_property(self, name):
-        result = self.find_property(name)
+        result = self._resolve_property(name)
         if len(result) < 1:
             raise exceptions.NoPropertyFound(name)
         elif len(result) > 1:
@@ -271,7 +351,7 @@ class MuranoClass(dsl_types.MuranoClass, MuranoType, dslmeta.MetaProvider):
             obj = obj.type
         if obj is self:
             return True
-        return any(cls is self for cls in obj.ancestors())
+        return self in obj.ancestor_set
 
     def new(self, owner, object_store, executor, **kwargs):
         obj = murano_object.MuranoObject(
@@ -374,9 +454,54 @@ class MuranoClass(dsl_types.MuranoClass, MuranoType, dslmeta.MetaProvider):
                 yield parent
 
     def ancestors(self):
-        for c in helpers.traverse(self, lambda t: t.parents(self)):
-            if c is not self:
-                yield c
+        if self._ancestors is None:
+            self._ancestors = tuple(
+                c for c in helpers.traverse(self, lambda t: t.parents(self))
+                if c is not self)
+        return self._ancestors
+
+    @property
+    def ancestor_set(self):
+        if self._ancestor_set is None:
+            self._ancestor_set = frozenset(self.ancestors())
+        return self._ancestor_set
+
+    def _has_initializers(self):
+        if self.properties or '.init' in self.methods:
+            return True
+        if '__init__' not in self.methods:
+            return False
+        # extensions without constructor are created along with the part
+        return (self.extension_class is None or
+                '__init__' in self.extension_class.__dict__)
+
+    @property
+    def initialized_types(self):
+        """Types whose object parts have something to initialize
+
+        A part needs initialization if its class or any of its ancestors
+        (as seen from this class) declares properties or initializers.
+        """
+        if self._initialized_types is None:
+            result = {}
+
+            def visit(cls):
+                if cls not in result:
+                    result[cls] = cls._has_initializers()
+                    for p in cls.parents(self):
+                        if visit(p):
+                            result[cls] = True
+                return result[cls]
+
+            visit(self)
+            self._initialized_types = frozenset(
+                cls for cls, required in six.iteritems(result) if required)
+        return self._initialized_types
+
+    @property
+    def cast_cache(self):
+        """Results of helpers.cast lookups made for this type"""
+        return self._cast_cache
 
     @property
     def context(self):
@@ -434,6 +559,12 @@ class MuranoClass(dsl_types.MuranoClass, MuranoType, dslmeta.MetaProvider):
         return self._meta_values
 
 
+def _ambiguous_method_payload(name):
+    def func(*args, **kwargs):
+        raise exceptions.AmbiguousMethodName(name)
+    return func
+
+
 class MuranoMetaClass(dsl_types.MuranoMetaClass, MuranoClass):
     _allowed_usages = {dsl_types.ClassUsages.Meta, dsl_types.ClassUsages.Class}
 
@@ -12,11 +12,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import weakref
 
 import six
 
 from murano.dsl import dsl_types
+from murano.dsl import exceptions
 from murano.dsl import helpers
 
 
@@ -27,6 +29,10 @@ class ObjectStore(object):
         self._designer_attributes_store = {}
         self._executor = weakref.ref(executor)
         self._initializing = False
+        self._pending = []
+        self._pending_checks = []
+        self._graph = None
+        self._references = {}
 
     @property
     def initializing(self):
@@ -37,8 +43,11 @@ class ObjectStore(object):
         return self._executor()
 
     def get(self, object_id):
-        if object_id in self._store:
-            result = self._store[object_id]
+        result = self._store.get(object_id)
+        if result is None and self._graph and object_id in self._graph:
+            # forward reference to the object that is not loaded yet
+            result = self._create(object_id)
+        if result is not None:
             if not isinstance(result, dsl_types.MuranoObject):
                 result = result.object
             return result
@@ -52,13 +61,74 @@ class ObjectStore(object):
     def put(self, murano_object):
         self._store[murano_object.object_id] = murano_object
 
+    def is_loading(self, object_id):
+        """Tells if properties of the object may not be set yet"""
+        if not self._initializing:
+            return False
+        value = self._store.get(object_id)
+        return value is not None and not isinstance(
+            value, dsl_types.MuranoObject)
+
+    def schedule_initialization(self, murano_object):
+        self._pending.append(murano_object)
+
+    def schedule_check(self, check):
+        """Postpones contract check until the whole model is loaded"""
+        self._pending_checks.append(check)
+
     def load(self, value, owner, context=None):
         if value is None:
             return None
+        if owner is not None or self._initializing:
+            return self._load(value, owner, context)
+
+        # Object model is loaded in two steps. Objects are created and
+        # their properties are set in a single pass over the model with
+        # initializers (.init) postponed. Predicates of contracts on
+        # objects which are not loaded yet are checked after that pass.
+        # Then initializers are called so that owned and referenced
+        # objects are initialized first.
+        self._graph = {}
+        self._references = {}
+        self._build_graph(value, None)
+        self._initializing = True
+        try:
+            result = self._load(value, owner, context)
+            for object_id, factory in six.iteritems(self._store):
+                if not isinstance(factory, dsl_types.MuranoObject):
+                    raise exceptions.NoObjectFoundError(object_id)
+            for check in self._pending_checks:
+                check()
+            pending = self._get_initialization_order()
+        finally:
+            self._initializing = False
+            self._pending = []
+            self._pending_checks = []
+            self._graph = None
+
+        for obj in pending:
+            obj.complete_initialization()
+        return result
+
+    def _load(self, value, owner, context):
         if '?' not in value or 'type' not in value['?']:
             raise ValueError()
-        system_key = value['?']
-        object_id = system_key['id']
+        object_id = value['?']['id']
+
+        if object_id in self._store:
+            factory = self._store[object_id]
+            if isinstance(factory, dsl_types.MuranoObject):
+                return factory
+        else:
+            factory = self._new(value['?'], owner)
+
+        init_context = self.executor.create_object_context(
+            factory.object, context)
+        obj = factory(init_context, **value)
+        self._store[object_id] = obj
+        return obj
+
+    def get_class(self, system_key):
         obj_type = system_key['type']
         version_spec = helpers.parse_version_spec(
             system_key.get('classVersion'))
@@ -69,38 +139,109 @@ class ObjectStore(object):
         else:
             package = self.executor.package_loader.load_package(
                 system_key['package'], version_spec)
-        class_obj = package.find_class(obj_type, False)
+        return package.find_class(obj_type, False)
 
-        try:
-            if owner is None:
-                self._initializing = True
-
-            if object_id in self._store:
-                factory = self._store[object_id]
-                if isinstance(factory, dsl_types.MuranoObject):
-                    return factory
-            else:
-                factory = class_obj.new(
-                    owner, self, self.executor,
-                    name=system_key.get('name'),
-                    object_id=object_id)
-                self._store[object_id] = factory
-                system_value = ObjectStore._get_designer_attributes(system_key)
-                self._designer_attributes_store[object_id] = system_value
-
-            init_context = self.executor.create_object_context(
-                factory.object, context)
-            obj = factory(init_context, **value)
-            if not self._initializing:
-                self._store[object_id] = obj
-            if owner is None:
-                self._initializing = False
-                self._store[object_id] = factory(init_context, **value)
-        finally:
-            if owner is None:
-                self._initializing = False
-
-        return factory.object
+    def _new(self, system_key, owner):
+        object_id = system_key['id']
+        class_obj = self.get_class(system_key)
+
+        factory = class_obj.new(
+            owner, self, self.executor,
+            name=system_key.get('name'),
+            object_id=object_id)
+        self._store[object_id] = factory
+        self._designer_attributes_store[object_id] = \
+            ObjectStore._get_designer_attributes(system_key)
+        return factory
+
+    def _create(self, object_id):
+        data, owner_id = self._graph[object_id]
+        owner = None if owner_id is None else self.get(owner_id)
+        return self._new(data['?'], owner)
+
+    def _build_graph(self, value, owner_id):
+        """Collects objects of the model and references between them"""
+
+        stack = [(value, owner_id)]
+        strings = {}
+        while stack:
+            value, owner_id = stack.pop()
+            if isinstance(value, dict):
+                system_key = value.get('?')
+                if (isinstance(system_key, dict) and 'id' in system_key and
+                        'type' in system_key):
+                    object_id = system_key['id']
+                    self._graph[object_id] = (value, owner_id)
+                    owner_id = object_id
+                for key, item in six.iteritems(value):
+                    if key != '?':
+                        stack.append((item, owner_id))
+            elif isinstance(value, (list, tuple)):
+                stack.extend((item, owner_id) for item in value)
+            elif isinstance(value, six.string_types) and owner_id:
+                strings.setdefault(owner_id, set()).add(value)
+
+        for object_id, values in six.iteritems(strings):
+            references = [t for t in values
+                          if t in self._graph and t != object_id]
+            if references:
+                self._references[object_id] = references
+
+    def _get_initialization_order(self):
+        """Orders objects with postponed initialization
+
+        Owned objects always come before their owner. Objects referenced
+        by id come before objects that reference them unless this creates
+        a cycle, in which case the order in which objects were loaded is
+        kept.
+        """
+
+        children = {}
+        objects = {}
+        for obj in self._pending:
+            objects[obj.object_id] = obj
+            if obj.owner is not None:
+                children.setdefault(obj.owner.object_id, []).append(obj)
+
+        def ancestors(obj):
+            while obj is not None:
+                yield obj.object_id
+                obj = obj.owner
+
+        result = []
+        visited = set()
+        # number of objects in progress within subtree of each object
+        in_progress = collections.Counter()
+        for root in self._pending:
+            if root.object_id in visited:
+                continue
+            visited.add(root.object_id)
+            in_progress.update(ancestors(root))
+            stack = [(root, self._get_dependencies(root, children, objects))]
+            while stack:
+                obj, dependencies = stack[-1]
+                for dependency in dependencies:
+                    object_id = dependency.object_id
+                    if object_id not in visited and not in_progress[
+                            object_id]:
+                        visited.add(object_id)
+                        in_progress.update(ancestors(dependency))
+                        stack.append((dependency, self._get_dependencies(
+                            dependency, children, objects)))
+                        break
+                else:
+                    stack.pop()
+                    in_progress.subtract(ancestors(obj))
+                    result.append(obj)
+        return result
+
+    def _get_dependencies(self, obj, children, objects):
+        for child in children.get(obj.object_id, ()):
+            yield child
+        for object_id in self._references.get(obj.object_id, ()):
+            dependency = objects.get(object_id)
+            if dependency is not None:
+                yield dependency
 
     @staticmethod
     def _get_designer_attributes(header):
@@ -14,6 +14,7 @@
 
 from yaql import specs
 
+from murano.dsl import constants
 from murano.dsl import dsl
 from murano.dsl import helpers
 
@@ -21,6 +22,7 @@ from murano.dsl import helpers
 @dsl.name('io.murano.Object')
 class SysObject(object):
     @specs.parameter('owner', dsl.MuranoTypeParameter(nullable=True))
+    @specs.meta(constants.META_NO_LOCK, True)
     def set_attr(self, this, context, name, value, owner=None):
         if owner is None:
             owner = helpers.get_type(helpers.get_caller_context(context))
@@ -29,6 +31,7 @@ class SysObject(object):
         attribute_store.set(this.object, owner, name, value)
 
     @specs.parameter('owner', dsl.MuranoTypeParameter(nullable=True))
+    @specs.meta(constants.META_NO_LOCK, True)
     def get_attr(self, this, context, name, default=None, owner=None):
         if owner is None:
             owner = helpers.get_type(helpers.get_caller_context(context))
@@ -12,6 +12,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 
 import six
 from yaql import utils
@@ -26,24 +27,90 @@ class ObjRef(object):
 
 
 def serialize(obj):
-    return serialize_model(obj, None, True)['Objects']
+    return _serialize_object(obj, None, False)[0]
 
 
-def _serialize_object(root_object, designer_attributes, allow_refs):
+def _serialize_object(root_object, designer_attributes, with_copy=True):
+    """Serializes object graph in a single walk
+
+    Returns serialized tree, its copy without designer attributes (if
+    requested) and set of serialized object IDs. Objects are serialized
+    inline under their owner. Other references to objects are collected
+    during the walk and resolved once the walk is complete.
+    """
+
     serialized_objects = set()
+    references = collections.deque()
+
+    def serialize_object(obj):
+        serialized_objects.add(obj.object_id)
+        result, result_copy = serialize_value(obj.to_dictionary(), obj)
+        if designer_attributes is not None:
+            header = result['?']
+            header.update(serialize_value(
+                designer_attributes(obj.object_id), obj)[0])
+            # deserialize and merge list of actions
+            header['_actions'] = _serialize_available_action(
+                obj, header.get('_actions', {}))
+        return result, result_copy
+
+    def serialize_value(value, parent):
+        if isinstance(value, dsl.MuranoObjectInterface):
+            value = value.object
+        if isinstance(value, (six.string_types,
+                              int, float, bool)) or value is None:
+            return value, value
+        if isinstance(value, dsl_types.MuranoObject):
+            if (value.owner is not parent or
+                    value.object_id in serialized_objects):
+                ref = ObjRef(value)
+                return ref, ref
+            return serialize_object(value)
+        elif isinstance(value, utils.MappingType):
+            result = {}
+            result_copy = {} if with_copy else None
+            for d_key, d_value in six.iteritems(value):
+                result_key = str(d_key)
+                v, c = serialize_value(d_value, parent)
+                result[result_key] = v
+                if with_copy:
+                    result_copy[result_key] = c
+                if isinstance(v, ObjRef):
+                    references.append((v, result, result_copy, result_key))
+            return result, result_copy
+        elif utils.is_sequence(value) or isinstance(value, utils.SetType):
+            result = []
+            result_copy = [] if with_copy else None
+            for t in value:
+                v, c = serialize_value(t, parent)
+                if isinstance(v, ObjRef):
+                    references.append((v, result, result_copy, len(result)))
+                result.append(v)
+                if with_copy:
+                    result_copy.append(c)
+            return result, result_copy
+        else:
+            raise ValueError()
 
-    obj = root_object
-    while True:
-        obj, need_another_pass = _pass12_serialize(
-            obj, None, serialized_objects, designer_attributes)
-        if not need_another_pass:
-            break
-    tree = [obj]
-    _pass3_serialize(tree, serialized_objects, allow_refs)
-    return tree[0], serialized_objects
+    tree, tree_copy = serialize_value([root_object], None)
+
+    # objects that were not serialized under their owner are serialized
+    # in place of the first reference to them, other references become IDs
+    while references:
+        ref, container, container_copy, key = references.popleft()
+        obj = ref.ref_obj
+        if obj.object_id not in serialized_objects:
+            container[key], value = serialize_object(obj)
+        else:
+            container[key] = value = obj.object_id
+        if container_copy is not None:
+            container_copy[key] = value
 
+    return (tree[0], tree_copy[0] if with_copy else None,
+            serialized_objects)
 
-def serialize_model(root_object, executor, allow_refs=False):
+
+def serialize_model(root_object, executor):
     if executor is not None:
         designer_attributes = executor.object_store.designer_attributes
     else:
@@ -54,9 +121,8 @@ def serialize_model(root_object, executor, allow_refs=False):
         tree_copy = None
         attributes = []
     else:
-        tree, serialized_objects = _serialize_object(
-            root_object, designer_attributes, allow_refs)
-        tree_copy, _ = _serialize_object(root_object, None, allow_refs)
+        tree, tree_copy, serialized_objects = _serialize_object(
+            root_object, designer_attributes)
         if executor is not None:
             attributes = executor.attribute_store.serialize(serialized_objects)
         else:
@@ -81,86 +147,6 @@ def _serialize_available_action(obj, current_actions):
     return result
 
 
-def _pass12_serialize(value, parent, serialized_objects,
-                      designer_attributes_getter):
-    if isinstance(value, dsl.MuranoObjectInterface):
-        value = value.object
-    if isinstance(value, (six.string_types,
-                          int, float, bool)) or value is None:
-        return value, False
-    if isinstance(value, dsl_types.MuranoObject):
-        if value.owner is not parent or value.object_id in serialized_objects:
-            return ObjRef(value), True
-    elif isinstance(value, ObjRef):
-        if (value.ref_obj.object_id not in serialized_objects and
-                is_nested_in(value.ref_obj.owner, parent)):
-            value = value.ref_obj
-        else:
-            return value, False
-    if isinstance(value, dsl_types.MuranoObject):
-        result = value.to_dictionary()
-        if designer_attributes_getter is not None:
-            result['?'].update(designer_attributes_getter(value.object_id))
-            # deserialize and merge list of actions
-            result['?']['_actions'] = _serialize_available_action(
-                value, result['?'].get('_actions', {}))
-        serialized_objects.add(value.object_id)
-        return _pass12_serialize(
-            result, value, serialized_objects, designer_attributes_getter)
-    elif isinstance(value, utils.MappingType):
-        result = {}
-        need_another_pass = False
-
-        for d_key, d_value in six.iteritems(value):
-            result_key = str(d_key)
-            result_value = _pass12_serialize(
-                d_value, parent, serialized_objects,
-                designer_attributes_getter)
-            result[result_key] = result_value[0]
-            if result_value[1]:
-                need_another_pass = True
-        return result, need_another_pass
-    elif utils.is_sequence(value) or isinstance(value, utils.SetType):
-        need_another_pass = False
-        result = []
-        for t in value:
-            v, nmp = _pass12_serialize(
-                t, parent, serialized_objects, designer_attributes_getter)
-            if nmp:
-                need_another_pass = True
-            result.append(v)
-        return result, need_another_pass
-    else:
-        raise ValueError()
-
-
-def _pass3_serialize(value, serialized_objects, allow_refs=False):
-    if isinstance(value, dict):
-        for d_key, d_value in value.items():
-            if isinstance(d_value, ObjRef):
-                if (d_value.ref_obj.object_id in serialized_objects or
-                        allow_refs):
-                    value[d_key] = d_value.ref_obj.object_id
-                else:
-                    del value[d_key]
-            else:
-                _pass3_serialize(d_value, serialized_objects, allow_refs)
-    elif isinstance(value, list):
-        index = 0
-        while index < len(value):
-            item = value[index]
-            if isinstance(item, ObjRef):
-                if item.ref_obj.object_id in serialized_objects or allow_refs:
-                    value[index] = item.ref_obj.object_id
-                else:
-                    value.pop(index)
-                    index -= 1
-            else:
-                _pass3_serialize(item, serialized_objects, allow_refs)
-            index += 1
-    return value
-
-
 def is_nested_in(obj, ancestor):
     while True:
         if obj is ancestor:
@@ -13,6 +13,8 @@
 #    under the License.
 
 import six
+from yaql.language import exceptions as yaql_exceptions
+from yaql.language import expressions as yaql_expressions
 from yaql.language import specs
 from yaql.language import utils
 from yaql.language import yaqltypes
@@ -24,12 +26,9 @@ from murano.dsl import helpers
 
 
 class TypeScheme(object):
-    class ObjRef(object):
-        def __init__(self, object_id):
-            self.object_id = object_id
-
     def __init__(self, spec):
         self._spec = spec
+        self._mapper = None
 
     @staticmethod
     def prepare_transform_context(root_context, this, owner, default,
@@ -74,9 +73,6 @@ class TypeScheme(object):
         @specs.parameter('value', nullable=True)
         @specs.method
         def not_null(value):
-            if isinstance(value, TypeScheme.ObjRef):
-                return value
-
             if value is None:
                 raise exceptions.ContractViolationException(
                     'null value violates notNull() contract')
@@ -92,8 +88,16 @@ class TypeScheme(object):
         @specs.parameter('msg', yaqltypes.String(nullable=True))
         @specs.method
         def check(value, predicate, msg=None):
-            if isinstance(value, TypeScheme.ObjRef) or predicate(
-                    root_context.create_child_context(), value):
+            object_store = None if this is None else this.object_store
+            if (object_store is not None and
+                    isinstance(value, dsl_types.MuranoObject) and
+                    object_store.is_loading(value.object_id)):
+                # forward reference: properties of the object are not set
+                # yet, so predicate is evaluated once the model is loaded
+                object_store.schedule_check(
+                    lambda: check(value, predicate, msg))
+                return value
+            if predicate(root_context.create_child_context(), value):
                 return value
             else:
                 if not msg:
@@ -101,18 +105,11 @@ class TypeScheme(object):
                         format_scalar(value))
                 raise exceptions.ContractViolationException(msg)
 
-        @specs.parameter('obj', TypeScheme.ObjRef, nullable=True)
-        @specs.name('owned')
+        @specs.parameter('obj', dsl_types.MuranoObject, nullable=True)
         @specs.method
-        def owned_ref(obj):
+        def owned(obj):
             if obj is None:
                 return None
-            if isinstance(obj, TypeScheme.ObjRef):
-                return obj
-
-        @specs.parameter('obj', dsl_types.MuranoObject)
-        @specs.method
-        def owned(obj):
             p = obj.owner
             while p is not None:
                 if p is this:
@@ -122,19 +119,11 @@ class TypeScheme(object):
             raise exceptions.ContractViolationException(
                 'Object {0} violates owned() contract'.format(obj))
 
-        @specs.parameter('obj', TypeScheme.ObjRef, nullable=True)
-        @specs.name('not_owned')
+        @specs.parameter('obj', dsl_types.MuranoObject, nullable=True)
         @specs.method
-        def not_owned_ref(obj):
-            if isinstance(obj, TypeScheme.ObjRef):
-                return obj
-
+        def not_owned(obj):
             if obj is None:
                 return None
-
-        @specs.parameter('obj', dsl_types.MuranoObject)
-        @specs.method
-        def not_owned(obj):
             try:
                 owned(obj)
             except exceptions.ContractViolationException:
@@ -168,10 +157,7 @@ class TypeScheme(object):
             elif isinstance(value, six.string_types) and object_store:
                 obj = object_store.get(value)
                 if obj is None:
-                    if not object_store.initializing:
-                        raise exceptions.NoObjectFoundError(value)
-                    else:
-                        return TypeScheme.ObjRef(value)
+                    raise exceptions.NoObjectFoundError(value)
             else:
                 raise exceptions.ContractViolationException(
                     'Value {0} cannot be represented as class {1}'.format(
@@ -192,9 +178,7 @@ class TypeScheme(object):
         context.register_function(not_null)
         context.register_function(error)
         context.register_function(class_)
-        context.register_function(owned_ref)
         context.register_function(owned)
-        context.register_function(not_owned_ref)
         context.register_function(not_owned)
         return context
 
@@ -258,7 +242,119 @@ class TypeScheme(object):
         context.register_function(class_)
         return context
 
-    def _map_dict(self, data, spec, context, path):
+    def _get_mapper(self):
+        if self._mapper is None:
+            self._mapper = _compile(self._spec)
+        return self._mapper
+
+    def transform(self, data, context, this, owner, default, calling_type):
+        # TODO(ativelkov, slagun): temporary fix, need a better way of handling
+        # composite defaults
+        # A bug (#1313694) has been filed
+
+        if data is dsl.NO_VALUE:
+            data = helpers.evaluate(default, context)
+
+        state = _MappingState(context, this, owner, default, calling_type)
+        return self._get_mapper()(data, state, None)
+
+    def validate(self, data, context, default):
+        if data is dsl.NO_VALUE:
+            data = helpers.evaluate(default, context)
+
+        state = _MappingState(context, validate=True)
+        try:
+            self._get_mapper()(data, state, None)
+            return True
+        except exceptions.ContractViolationException:
+            return False
+
+
+class _MappingState(object):
+    """Parameters of a single contract evaluation"""
+
+    def __init__(self, root_context, this=None, owner=None, default=None,
+                 calling_type=None, validate=False):
+        self.root_context = root_context
+        self.this = this
+        self.owner = owner
+        self.default = default
+        self.calling_type = calling_type
+        self.validate = validate
+        self._context = None
+
+    @property
+    def context(self):
+        # yaql context with contract functions is only needed for
+        # contracts that cannot be evaluated directly
+        if self._context is None:
+            if self.validate:
+                self._context = TypeScheme.prepare_validate_context(
+                    self.root_context)
+            else:
+                self._context = TypeScheme.prepare_transform_context(
+                    self.root_context, self.this, self.owner, self.default,
+                    self.calling_type)
+        return self._context
+
+
+def _format_path(path):
+    segments = []
+    while path is not None:
+        path, key = path
+        segments.append(u'[{0}]'.format(format_scalar(key)))
+    return u''.join(reversed(segments))
+
+
+def _compile(spec):
+    """Turns contract spec into function(data, state, path)"""
+
+    if isinstance(spec, dsl_types.YaqlExpression):
+        return _compile_expression(spec)
+    elif isinstance(spec, utils.MappingType):
+        return _compile_dict(spec)
+    elif utils.is_sequence(spec):
+        return _compile_list(spec)
+    else:
+        return _compile_scalar(spec)
+
+
+def _compile_expression(spec):
+    functions = _compile_functions(spec)
+
+    def mapper(data, state, path):
+        try:
+            if functions is not None and not state.validate:
+                for func in functions:
+                    data = func(data, state)
+                return helpers.evaluate(data, state.root_context)
+            child_context = state.context.create_child_context()
+            child_context[''] = data
+            return spec(context=child_context)
+        except exceptions.ContractViolationException as e:
+            e.path = _format_path(path)
+            raise
+    return mapper
+
+
+def _compile_dict(spec):
+    error = None
+    yaql_key = None
+    mappers = []
+    for key, value in six.iteritems(spec):
+        if isinstance(key, dsl_types.YaqlExpression):
+            if yaql_key is not None:
+                error = ('Dictionary contract '
+                         'cannot have more than one expression key')
+            else:
+                yaql_key = key
+        else:
+            mappers.append((key, _compile(value)))
+    if yaql_key is not None:
+        key_mapper = _compile(yaql_key)
+        value_mapper = _compile(spec[yaql_key])
+
+    def mapper(data, state, path):
         if data is None or data is dsl.NO_VALUE:
             data = {}
         if not isinstance(data, utils.MappingType):
@@ -267,51 +363,45 @@ class TypeScheme(object):
                     format_scalar(data)))
         if not spec:
             return data
+        if error:
+            raise exceptions.DslContractSyntaxError(error)
         result = {}
-        yaql_key = None
-        for key, value in six.iteritems(spec):
-            if isinstance(key, dsl_types.YaqlExpression):
-                if yaql_key is not None:
-                    raise exceptions.DslContractSyntaxError(
-                        'Dictionary contract '
-                        'cannot have more than one expression key')
-                else:
-                    yaql_key = key
-            else:
-                result[key] = self._map(
-                    data.get(key), value, context, '{0}[{1}]'.format(
-                        path, format_scalar(key)))
+        for key, key_value_mapper in mappers:
+            result[key] = key_value_mapper(
+                data.get(key), state, (path, key))
 
         if yaql_key is not None:
-            yaql_value = spec[yaql_key]
             for key, value in six.iteritems(data):
                 if key in result:
                     continue
-                key = self._map(key, yaql_key, context, path)
-                result[key] = self._map(
-                    value, yaql_value, context, '{0}[{1}]'.format(
-                        path, format_scalar(key)))
+                key = key_mapper(key, state, path)
+                result[key] = value_mapper(value, state, (path, key))
 
         return utils.FrozenDict(result)
-
-    def _map_list(self, data, spec, context, path):
+    return mapper
+
+
+def _compile_list(spec):
+    shift = 0
+    max_length = -1
+    min_length = 0
+    if spec and isinstance(spec[-1], int):
+        min_length = spec[-1]
+        shift += 1
+    if len(spec) >= 2 and isinstance(spec[-2], int):
+        max_length = min_length
+        min_length = spec[-2]
+        shift += 1
+    mappers = [_compile(t) for t in spec[:len(spec) - shift]]
+
+    def mapper(data, state, path):
         if not utils.is_sequence(data):
             if data is None or data is dsl.NO_VALUE:
                 data = []
             else:
                 data = [data]
-        if len(spec) < 1:
+        if not spec:
             return data
-        shift = 0
-        max_length = -1
-        min_length = 0
-        if isinstance(spec[-1], int):
-            min_length = spec[-1]
-            shift += 1
-        if len(spec) >= 2 and isinstance(spec[-2], int):
-            max_length = min_length
-            min_length = spec[-2]
-            shift += 1
 
         if max_length >= 0 and not min_length <= len(data) <= max_length:
             raise exceptions.ContractViolationException(
@@ -322,65 +412,229 @@ class TypeScheme(object):
                 'Array length {0} must not be less than {1}'.format(
                     len(data), min_length))
 
-        def map_func():
-            for index, item in enumerate(data):
-                spec_item = (
-                    spec[-1 - shift]
-                    if index >= len(spec) - shift
-                    else spec[index]
-                )
-                yield self._map(
-                    item, spec_item, context, '{0}[{1}]'.format(path, index))
+        last = len(mappers) - 1
+        return tuple(
+            mappers[min(index, last)](item, state, (path, index))
+            for index, item in enumerate(data))
+    return mapper
 
-        return tuple(map_func())
 
-    def _map_scalar(self, data, spec):
+def _compile_scalar(spec):
+    def mapper(data, state, path):
         if data != spec:
             raise exceptions.ContractViolationException(
                 'Value {0} is not equal to {1}'.format(
                     format_scalar(data), spec))
         else:
             return data
-
-    def _map(self, data, spec, context, path):
-        child_context = context.create_child_context()
-        if isinstance(spec, dsl_types.YaqlExpression):
-            child_context[''] = data
-            try:
-                result = spec(context=child_context)
-                return result
-            except exceptions.ContractViolationException as e:
-                e.path = path
-                raise
-        elif isinstance(spec, utils.MappingType):
-            return self._map_dict(data, spec, child_context, path)
-        elif utils.is_sequence(spec):
-            return self._map_list(data, spec, child_context, path)
-        else:
-            return self._map_scalar(data, spec)
-
-    def transform(self, data, context, this, owner, default, calling_type):
-        # TODO(ativelkov, slagun): temporary fix, need a better way of handling
-        # composite defaults
-        # A bug (#1313694) has been filed
-
-        if data is dsl.NO_VALUE:
-            data = helpers.evaluate(default, context)
-
-        context = self.prepare_transform_context(
-            context, this, owner, default, calling_type)
-        return self._map(data, self._spec, context, '')
-
-    def validate(self, data, context, default):
-        if data is dsl.NO_VALUE:
-            data = helpers.evaluate(default, context)
-
-        context = self.prepare_validate_context(context)
-        try:
-            self._map(data, self._spec, context, '')
+    return mapper
+
+
+def _compile_functions(spec):
+    """Returns direct implementations of the contract methods chain
+
+    Expressions like $.string().notNull() or $.class(Name).owned() are
+    evaluated without yaql. None is returned for other expressions.
+    """
+
+    expression = spec.parsed_expression.expression
+    chain = []
+    while (isinstance(expression, yaql_expressions.BinaryOperator) and
+           expression.name == '#operator_.' and
+           type(expression.args[1]) is yaql_expressions.Function):
+        chain.append(expression.args[1])
+        expression = expression.args[0]
+    if not (isinstance(expression, yaql_expressions.GetContextValue) and
+            expression.path.value == '$'):
+        return None
+
+    functions = []
+    for call in reversed(chain):
+        factory = _CONTRACT_FUNCTIONS.get(call.name)
+        if factory is None:
+            return None
+        func = factory(*call.args)
+        if func is None:
+            return None
+        functions.append(func)
+    return functions
+
+
+def _no_args(func):
+    def factory(*args):
+        return None if args else func
+    return factory
+
+
+def _int(value, state):
+    if value is dsl.NO_VALUE:
+        value = state.default
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except Exception:
+        raise exceptions.ContractViolationException(
+            'Value {0} violates int() contract'.format(
+                format_scalar(value)))
+
+
+def _string(value, state):
+    if value is dsl.NO_VALUE:
+        value = state.default
+    if value is None:
+        return None
+    try:
+        return six.text_type(value)
+    except Exception:
+        raise exceptions.ContractViolationException(
+            'Value {0} violates string() contract'.format(
+                format_scalar(value)))
+
+
+def _bool(value, state):
+    if value is dsl.NO_VALUE:
+        value = state.default
+    if value is None:
+        return None
+    return True if value else False
+
+
+def _not_null(value, state):
+    if value is None:
+        raise exceptions.ContractViolationException(
+            'null value violates notNull() contract')
+    return value
+
+
+def _error(value, state):
+    raise exceptions.ContractViolationException('error() contract')
+
+
+def _is_owned(obj, state):
+    p = obj.owner
+    while p is not None:
+        if p is state.this:
             return True
-        except exceptions.ContractViolationException:
-            return False
+        p = p.owner
+    return False
+
+
+def _owned(value, state):
+    if value is None:
+        return value
+    if not isinstance(value, dsl_types.MuranoObject):
+        raise yaql_exceptions.NoMatchingMethodException('owned', value)
+    if _is_owned(value, state):
+        return value
+    raise exceptions.ContractViolationException(
+        'Object {0} violates owned() contract'.format(value))
+
+
+def _not_owned(value, state):
+    if value is None:
+        return value
+    if not isinstance(value, dsl_types.MuranoObject):
+        raise yaql_exceptions.NoMatchingMethodException('notOwned', value)
+    if not _is_owned(value, state):
+        return value
+    raise exceptions.ContractViolationException(
+        'Object {0} violates notOwned() contract'.format(value))
+
+
+def _get_type_name(expression):
+    if isinstance(expression, yaql_expressions.Constant):
+        if isinstance(expression.value, six.string_types):
+            return expression.value
+    elif (isinstance(expression, yaql_expressions.BinaryOperator) and
+            expression.name == '#operator_:'):
+        prefix, name = expression.args
+        if (isinstance(prefix, yaql_expressions.KeywordConstant) and
+                isinstance(name, yaql_expressions.KeywordConstant)):
+            return prefix.value + ':' + name.value
+    elif (isinstance(expression, yaql_expressions.UnaryOperator) and
+            expression.name == '#unary_operator_:'):
+        name = expression.args[0]
+        if isinstance(name, yaql_expressions.KeywordConstant):
+            return ':' + name.value
+    return None
+
+
+def _class(name_expr, default_name_expr=None, version_spec_expr=None):
+    name = _get_type_name(name_expr)
+    if name is None:
+        return None
+    default_name = None
+    if default_name_expr is not None and not (
+            type(default_name_expr) is yaql_expressions.Constant and
+            default_name_expr.value is None):
+        default_name = _get_type_name(default_name_expr)
+        if default_name is None:
+            return None
+    version_spec = None
+    if version_spec_expr is not None:
+        if not (type(version_spec_expr) is yaql_expressions.Constant and (
+                version_spec_expr.value is None or isinstance(
+                    version_spec_expr.value, six.string_types))):
+            return None
+        version_spec = version_spec_expr.value
+
+    # names are resolved relative to the type that declares the contract
+    resolved = {}
+
+    def resolve(context):
+        names_scope = helpers.get_names_scope(context)
+        result = resolved.get(names_scope)
+        if result is None:
+            result = resolved[names_scope] = tuple(
+                None if t is None
+                else helpers.get_class(t, context).get_reference()
+                for t in (name, default_name or name))
+        return result
+
+    def class_(value, state):
+        root_context = state.root_context
+        type_ref, default_type_ref = resolve(root_context)
+        this = state.this
+        object_store = None if this is None else this.object_store
+        if value is None:
+            return None
+        if isinstance(value, dsl_types.MuranoObject):
+            obj = value
+        elif isinstance(value, dsl_types.MuranoObjectInterface):
+            obj = value.object
+        elif isinstance(value, utils.MappingType):
+            obj = helpers.instantiate(
+                value, state.owner, object_store, root_context,
+                state.calling_type, default_type_ref, state.default)
+        elif isinstance(value, six.string_types) and object_store:
+            obj = object_store.get(value)
+            if obj is None:
+                raise exceptions.NoObjectFoundError(value)
+        else:
+            raise exceptions.ContractViolationException(
+                'Value {0} cannot be represented as class {1}'.format(
+                    format_scalar(value), type_ref))
+        if not helpers.is_instance_of(
+                obj, type_ref.type.name,
+                version_spec or helpers.get_type(root_context)):
+            raise exceptions.ContractViolationException(
+                'Object of type {0} is not compatible with '
+                'requested type {1}'.format(obj.type.name, type_ref))
+        return obj
+    return class_
+
+
+_CONTRACT_FUNCTIONS = {
+    'int': _no_args(_int),
+    'string': _no_args(_string),
+    'bool': _no_args(_bool),
+    'notNull': _no_args(_not_null),
+    'error': _no_args(_error),
+    'owned': _no_args(_owned),
+    'notOwned': _no_args(_not_owned),
+    'class': _class
+}
 
 
 def format_scalar(value):
@@ -49,6 +49,10 @@ class YaqlExpression(dsl_types.YaqlExpression):
     def expression(self):
         return self._expression
 
+    @property
+    def parsed_expression(self):
+        return self._parsed_expression
+
     @property
     def version(self):
         return self._version
@@ -18,12 +18,14 @@ import six
 import yaql
 from yaql.language import contexts
 from yaql.language import conventions
+from yaql.language import exceptions as yaql_exceptions
 from yaql.language import factory
 from yaql.language import specs
 from yaql.language import utils
 from yaql.language import yaqltypes
 from yaql import legacy
 
+from murano.common import utils as common_utils
 from murano.dsl import constants
 from murano.dsl import dsl
 from murano.dsl import dsl_types
@@ -77,6 +79,8 @@ ROOT_CONTEXT_10 = legacy.create_context(
     convention=CONVENTION, finalizer=_finalize)
 ROOT_CONTEXT_12 = yaql.create_context(
     convention=CONVENTION, finalizer=_finalize)
+# parsed statements (or parsing errors) keyed by expression text and engine
+PARSE_CACHE = common_utils.LruCache(constants.PARSE_CACHE_SIZE)
 
 
 class ContractedValue(yaqltypes.GenericType):
@@ -123,8 +127,45 @@ def choose_yaql_engine(runtime_version):
             else ENGINE_12)
 
 
+class _ParsingError(object):
+    """Parsing failure kept in the parse cache
+
+    A new exception is raised on every cache hit, because raising the same
+    instance again would keep extending its traceback.
+    """
+
+    __slots__ = ('exception_type', 'value', 'position', 'message')
+
+    def __init__(self, exception):
+        self.exception_type = type(exception)
+        self.value = exception.value
+        self.position = exception.position
+        self.message = exception.message
+
+    def create_exception(self):
+        # subclasses have different constructor signatures
+        exception = self.exception_type.__new__(self.exception_type)
+        yaql_exceptions.YaqlParsingException.__init__(
+            exception, self.value, self.position, self.message)
+        return exception
+
+
 def parse(expression, runtime_version):
-    return choose_yaql_engine(runtime_version)(expression)
+    engine = choose_yaql_engine(runtime_version)
+    # NOTE: runtime versions sharing the same engine produce identical
+    # statements so the engine rather than the version is used in the key
+    key = (expression, engine is ENGINE_10)
+    result = PARSE_CACHE.get(key)
+    if result is None:
+        try:
+            result = engine(expression)
+        except yaql_exceptions.YaqlParsingException as e:
+            PARSE_CACHE.put(key, _ParsingError(e))
+            raise
+        PARSE_CACHE.put(key, result)
+    if isinstance(result, _ParsingError):
+        raise result.create_exception()
+    return result
 
 
 def call_func(__context, __name, *args, **kwargs):
@@ -0,0 +1,172 @@
+# Copyright (c) 2016 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Storage of parsed MuranoPL classes on disk.
+
+Artifacts are kept in a directory owned by the engine, one subdirectory
+per package id, and never in the unpacked package itself. Each file is
+signed with HMAC using a secret generated for that directory and is
+unpickled only if the signature is valid. The pickled data starts with a
+header describing what the artifact was produced from, and the artifact
+is used only if the header matches the expected one, so artifacts produced
+by another version of murano or yaql or from different class source are
+ignored.
+"""
+
+import hashlib
+import hmac
+import io
+import os
+import sys
+import tempfile
+
+from oslo_log import log as logging
+import six
+from six.moves import cPickle as pickle
+import yaql
+
+from murano.common.i18n import _LW
+from murano.dsl import yaql_integration
+from murano import utils as m_utils
+from murano import version
+
+LOG = logging.getLogger(__name__)
+
+FORMAT_VERSION = 2
+# NOTE: package names cannot start with a dot, so the directory does not
+# clash with packages stored in the same cache directory
+ARTIFACTS_DIRECTORY = '.compiled'
+SECRET_FILE = 'secret'
+SECRET_SIZE = 32
+
+_secrets = {}
+
+_ENGINES = {
+    'yaql-1.0': yaql_integration.ENGINE_10,
+    'yaql-1.2': yaql_integration.ENGINE_12
+}
+
+
+def get_header(file_id, name, runtime_version, digest):
+    return {
+        'format': FORMAT_VERSION,
+        'murano': version.version_string,
+        'yaql': yaql.__version__,
+        'python': tuple(sys.version_info[:2]),
+        'file': file_id,
+        'class': name,
+        'runtime_version': str(runtime_version),
+        'digest': digest
+    }
+
+
+def get_path(root, package_id, name):
+    # class names come from package manifests and are not used in paths
+    file_name = hashlib.sha1(name.encode('utf-8')).hexdigest()
+    return os.path.join(root, package_id, file_name + '.pickle')
+
+
+def get_secret(root):
+    """Returns key of artifacts signatures generating it if necessary"""
+
+    secret = _secrets.get(root)
+    if secret is not None:
+        return secret
+    path = os.path.join(root, SECRET_FILE)
+    m_utils.ensure_tree(root)
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except OSError:
+        # created by another process, possibly not yet written
+        pass
+    else:
+        with os.fdopen(fd, 'wb') as stream:
+            stream.write(os.urandom(SECRET_SIZE))
+    with open(path, 'rb') as stream:
+        secret = stream.read()
+    if len(secret) != SECRET_SIZE:
+        raise ValueError('Incomplete secret of compiled classes')
+    _secrets[root] = secret
+    return secret
+
+
+def _sign(secret, payload):
+    return hmac.new(secret, payload, hashlib.sha256).digest()
+
+
+def _persistent_id(obj):
+    # engines are shared by all the statements and cannot be pickled
+    for key, engine in six.iteritems(_ENGINES):
+        if obj is engine:
+            return key
+    return None
+
+
+def load(root, path, header):
+    """Returns stored class data or None if there is no valid artifact"""
+
+    try:
+        with open(path, 'rb') as stream:
+            contents = stream.read()
+        signature_size = hashlib.sha256().digest_size
+        signature = contents[:signature_size]
+        payload = contents[signature_size:]
+        if not hmac.compare_digest(
+                signature, _sign(get_secret(root), payload)):
+            LOG.warning(_LW('Compiled class {path} has invalid signature, '
+                            'ignoring').format(path=path))
+            return None
+        unpickler = pickle.Unpickler(io.BytesIO(payload))
+        unpickler.persistent_load = _ENGINES.__getitem__
+        if unpickler.load() != header:
+            LOG.debug('Compiled class {path} is stale'.format(path=path))
+            return None
+        return unpickler.load()
+    except (IOError, OSError):
+        return None
+    except Exception as e:
+        LOG.warning(_LW('Unable to load compiled class {path}: {err}').format(
+            path=path, err=e))
+        return None
+
+
+def save(root, path, header, data):
+    directory = os.path.dirname(path)
+    tmp_path = None
+    try:
+        buf = io.BytesIO()
+        pickler = pickle.Pickler(buf, pickle.HIGHEST_PROTOCOL)
+        pickler.persistent_id = _persistent_id
+        pickler.dump(header)
+        pickler.dump(data)
+        payload = buf.getvalue()
+        signature = _sign(get_secret(root), payload)
+
+        m_utils.ensure_tree(directory)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as stream:
+            stream.write(signature)
+            stream.write(payload)
+        # NOTE: rename is atomic, so concurrent readers in other processes
+        # either see complete artifact or no artifact at all
+        os.rename(tmp_path, path)
+    except Exception as e:
+        LOG.warning(_LW('Unable to save compiled class {path}: {err}').format(
+            path=path, err=e))
+        if tmp_path:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
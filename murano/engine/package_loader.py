@@ -13,18 +13,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import base64
 import collections
+import hashlib
 import itertools
 import os
 import os.path
 import shutil
 import sys
 import tempfile
+import threading
+import time
 import uuid
 
 import eventlet
 from muranoclient.common import exceptions as muranoclient_exc
 from muranoclient.glance import client as glare_client
+from muranoclient.v1 import artifact_packages
 import muranoclient.v1.client as muranoclient
 from oslo_config import cfg
 from oslo_log import log as logging
@@ -32,11 +37,13 @@ from oslo_log import versionutils
 import six
 
 from murano.common import auth_utils
+from murano.common import utils
 from murano.common.i18n import _LE, _LI, _LW
 from murano.dsl import constants
 from murano.dsl import exceptions
 from murano.dsl import helpers
 from murano.dsl import package_loader
+from murano.engine import compiled_classes
 from murano.engine import murano_package
 from murano.engine.system import system_objects
 from murano.engine import yaql_yaml_loader
@@ -49,6 +56,16 @@ LOG = logging.getLogger(__name__)
 
 download_mem_locks = collections.defaultdict(m_utils.ReaderWriterLock)
 usage_mem_locks = collections.defaultdict(m_utils.ReaderWriterLock)
+# parsed class definitions shared by all the loaders of the process
+class_cache = utils.LruCache(0)
+# package definitions found in catalog keyed by tenant and query
+definitions_cache = utils.LruCache(0)
+DEFINITIONS_CACHE_SIZE = 1000
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# file with SHA256 digest of the archive a cached package was unpacked from
+ARCHIVE_DIGEST_FILE = '.archive-sha256'
+# indexes of load_packages_from directories keyed by directory path
+directory_indexes = {}
 
 
 class ApiPackageLoader(package_loader.MuranoPackageLoader):
@@ -124,9 +141,7 @@ class ApiPackageLoader(package_loader.MuranoPackageLoader):
             if version:
                 return packages[version]
 
-        filter_opts = {'class_name': class_name,
-                       'version': helpers.breakdown_spec_to_query(
-                           version_spec)}
+        filter_opts = self._get_class_filter(class_name, version_spec)
         try:
             package_definition = self._get_definition(filter_opts)
             self._lock_usage(package_definition)
@@ -135,8 +150,7 @@ class ApiPackageLoader(package_loader.MuranoPackageLoader):
             six.reraise(exceptions.NoPackageForClassFound,
                         exceptions.NoPackageForClassFound(class_name),
                         exc_info[2])
-        return self._to_dsl_package(
-            self._get_package_by_definition(package_definition))
+        return self._load_by_definition(package_definition, filter_opts)
 
     def load_package(self, package_name, version_spec):
         packages = self._package_cache.get(package_name)
@@ -156,8 +170,64 @@ class ApiPackageLoader(package_loader.MuranoPackageLoader):
             six.reraise(exceptions.NoPackageFound(package_name),
                         None, exc_info[2])
         else:
+            return self._load_by_definition(package_definition, filter_opts)
+
+    def _load_by_definition(self, package_definition, filter_opts):
+        try:
             return self._to_dsl_package(
                 self._get_package_by_definition(package_definition))
+        except pkg_exc.PackageLoadError:
+            # the package might have been deleted since it was cached
+            definitions_cache.pop(self._get_definition_key(filter_opts))
+            raise
+
+    def resolve_class_definitions(self, class_specs):
+        """Finds package definitions for a number of classes at once
+
+        :param class_specs: dict of class names to version specs
+        :return: dict of class names to package definitions of the classes
+        that were found
+        """
+        _configure_definitions_cache()
+        result = {}
+        missing = {}
+        for class_name, version_spec in six.iteritems(class_specs):
+            filter_opts = self._get_class_filter(class_name, version_spec)
+            key = self._get_definition_key(filter_opts)
+            definition = definitions_cache.get(key)
+            if definition is None:
+                missing[class_name] = filter_opts
+            else:
+                result[class_name] = definition
+
+        # NOTE: murano API ignores version filter, so a single query for
+        # all the classes returns the same candidates as per-class queries
+        if (len(missing) > 1 and
+                CONF.packages_opts.packages_service == 'murano'):
+            try:
+                packages = list(self.client.packages.filter(
+                    class_name=sorted(missing), catalog=True))
+            except muranoclient_exc.HTTPException:
+                LOG.debug('Failed to get package definitions from '
+                          'repository')
+                packages = []
+            candidates = collections.defaultdict(list)
+            for package in packages:
+                for class_name in getattr(package, 'class_definitions', []):
+                    if class_name in missing:
+                        candidates[class_name].append(package)
+            for class_name, packages in six.iteritems(candidates):
+                definition = self._get_best_package_match(packages)
+                definitions_cache.put(self._get_definition_key(
+                    missing.pop(class_name)), definition)
+                result[class_name] = definition
+
+        for class_name, filter_opts in six.iteritems(missing):
+            try:
+                result[class_name] = self._get_definition(filter_opts)
+            except LookupError:
+                continue
+        return result
 
     def register_package(self, package):
         for name in package.classes:
@@ -185,38 +255,135 @@ class ApiPackageLoader(package_loader.MuranoPackageLoader):
             dir=directory))
         return directory
 
+    def prefetch(self, class_specs, package_specs):
+        """Resolves and downloads packages before they are needed
+
+        Packages are downloaded concurrently and registered in the loader,
+        so that later requests for them are served without delay.
+        Errors are ignored here, they are reported when the package is
+        actually requested.
+
+        :param class_specs: dict of class names to version specs
+        :param package_specs: dict of package names to version specs
+        """
+        pool_size = CONF.packages_opts.prefetch_pool_size
+        if pool_size <= 0:
+            return
+
+        def is_loaded(cache, name, version_spec):
+            packages = cache.get(name)
+            return bool(packages and version_spec.select(
+                six.iterkeys(packages)))
+
+        definitions = {}
+        class_specs = dict(
+            (name, version_spec)
+            for name, version_spec in six.iteritems(class_specs)
+            if not is_loaded(self._class_cache, name, version_spec))
+        for definition in six.itervalues(
+                self.resolve_class_definitions(class_specs)):
+            definitions[definition.id] = definition
+        for name, version_spec in six.iteritems(package_specs):
+            if is_loaded(self._package_cache, name, version_spec):
+                continue
+            try:
+                definition = self._get_definition({
+                    'fqn': name,
+                    'version': helpers.breakdown_spec_to_query(version_spec)
+                })
+            except LookupError:
+                continue
+            definitions[definition.id] = definition
+        if not definitions:
+            return
+
+        for definition in six.itervalues(definitions):
+            self._lock_usage(definition)
+
+        def download(definition):
+            try:
+                return self._get_package_by_definition(definition)
+            except pkg_exc.PackageLoadError:
+                LOG.debug('Unable to prefetch package {name} {id}'.format(
+                    name=definition.fully_qualified_name, id=definition.id))
+                return None
+
+        pool = eventlet.GreenPool(pool_size)
+        for app_package in pool.imap(download, six.itervalues(definitions)):
+            if app_package is not None:
+                self._to_dsl_package(app_package)
+
+    @staticmethod
+    def _get_class_filter(class_name, version_spec):
+        return {'class_name': class_name,
+                'version': helpers.breakdown_spec_to_query(version_spec),
+                'catalog': True}
+
+    def _get_definition_key(self, filter_opts):
+        # choice between several matching packages depends on the tenant
+        project_id = getattr(self._execution_session, 'project_id', None)
+        query = tuple(sorted(
+            (key, tuple(value) if isinstance(value, list) else value)
+            for key, value in six.iteritems(filter_opts)))
+        return project_id, CONF.packages_opts.packages_service, query
+
     def _get_definition(self, filter_opts):
         filter_opts['catalog'] = True
+        _configure_definitions_cache()
+        key = self._get_definition_key(filter_opts)
+        package = definitions_cache.get(key)
+        if package is not None:
+            return package
         try:
             packages = list(self.client.packages.filter(
                 **filter_opts))
-            if len(packages) > 1:
-                LOG.debug('Ambiguous package resolution: more then 1 package '
-                          'found for query "{opts}", will resolve based on the'
-                          ' ownership'.format(opts=filter_opts))
-                return self._get_best_package_match(packages)
-            elif len(packages) == 1:
-                return packages[0]
-            else:
-                LOG.debug('There are no packages matching filter '
-                          '{filter}'.format(optst=filter_opts))
-                raise LookupError()
         except muranoclient_exc.HTTPException:
             LOG.debug('Failed to get package definition from repository')
             raise LookupError()
+        if len(packages) > 1:
+            LOG.debug('Ambiguous package resolution: more then 1 package '
+                      'found for query "{opts}", will resolve based on the'
+                      ' ownership'.format(opts=filter_opts))
+            package = self._get_best_package_match(packages)
+        elif len(packages) == 1:
+            package = packages[0]
+        else:
+            LOG.debug('There are no packages matching filter '
+                      '{filter}'.format(filter=filter_opts))
+            raise LookupError()
+        definitions_cache.put(key, package)
+        return package
 
     def _to_dsl_package(self, app_package):
         dsl_package = murano_package.MuranoPackage(
             self._root_loader, app_package)
+        # compiled classes are stored in the packages cache so that they
+        # are reused by other engine processes and after restarts
+        artifacts_directory = package_id = None
+        if CONF.packages_opts.enable_packages_cache:
+            package_id = self._get_cached_package_id(app_package)
+        if package_id:
+            artifacts_directory = os.path.join(
+                self._cache_directory, compiled_classes.ARTIFACTS_DIRECTORY)
         for name in app_package.classes:
             dsl_package.register_class(
-                (lambda cls: lambda: get_class(app_package, cls))(name),
+                (lambda cls: lambda: get_class(
+                    app_package, cls, artifacts_directory, package_id))(name),
                 name)
         if app_package.full_name == constants.CORE_LIBRARY:
             system_objects.register(dsl_package)
         self.register_package(dsl_package)
         return dsl_package
 
+    def _get_cached_package_id(self, app_package):
+        # packages are unpacked to <cache>/<name>/<version>/<package id>
+        source_directory = os.path.abspath(app_package.source_directory)
+        versions_directory = os.path.dirname(source_directory)
+        if (os.path.dirname(os.path.dirname(versions_directory)) !=
+                self._cache_directory):
+            return None
+        return os.path.basename(source_directory)
+
     def _get_package_by_definition(self, package_def):
         package_id = package_def.id
         package_directory = os.path.join(
@@ -253,36 +420,35 @@ class ApiPackageLoader(package_loader.MuranoPackageLoader):
                     shutil.rmtree(package_directory, ignore_errors=True)
 
             # attempt the download itself
-            try:
-                LOG.debug("Attempting to download package {} {}".format(
-                    package_def.fully_qualified_name, package_id))
-                package_data = self.client.packages.download(package_id)
-            except muranoclient_exc.HTTPException as e:
-                msg = 'Error loading package id {0}: {1}'.format(
-                    package_id, str(e)
-                )
-                exc_info = sys.exc_info()
-                six.reraise(pkg_exc.PackageLoadError,
-                            pkg_exc.PackageLoadError(msg),
-                            exc_info[2])
             package_file = None
             try:
-                with tempfile.NamedTemporaryFile(delete=False) as package_file:
-                    package_file.write(package_data)
-
-                with load_utils.load_from_file(
-                        package_file.name,
-                        target_dir=package_directory,
-                        drop_dir=False) as app_package:
-                    LOG.info(_LI(
-                        "Successfully downloaded and unpacked package {} {}")
-                        .format(package_def.fully_qualified_name, package_id))
-                    self._downloaded.append(app_package)
-
-                    self.try_cleanup_cache(
-                        os.path.split(package_directory)[0],
-                        current_id=package_id)
-                    return app_package
+                try:
+                    LOG.debug("Attempting to download package {} {}".format(
+                        package_def.fully_qualified_name, package_id))
+                    with tempfile.NamedTemporaryFile(
+                            delete=False) as package_file:
+                        digest = self._download_package(
+                            package_id, package_file)
+                except muranoclient_exc.HTTPException as e:
+                    msg = 'Error loading package id {0}: {1}'.format(
+                        package_id, str(e)
+                    )
+                    exc_info = sys.exc_info()
+                    six.reraise(pkg_exc.PackageLoadError,
+                                pkg_exc.PackageLoadError(msg),
+                                exc_info[2])
+
+                app_package = self._unpack_package(
+                    package_file.name, package_directory, digest)
+                LOG.info(_LI(
+                    "Successfully downloaded and unpacked package {} {}")
+                    .format(package_def.fully_qualified_name, package_id))
+                self._downloaded.append(app_package)
+
+                self.try_cleanup_cache(
+                    os.path.split(package_directory)[0],
+                    current_id=package_id)
+                return app_package
             except IOError:
                 msg = 'Unable to extract package data for %s' % package_id
                 exc_info = sys.exc_info()
@@ -296,6 +462,96 @@ class ApiPackageLoader(package_loader.MuranoPackageLoader):
                 except OSError:
                     pass
 
+    def _download_package(self, package_id, target):
+        """Streams package archive into the target file
+
+        :return: SHA256 hex digest of the archive
+        """
+        expected_md5 = None
+        packages = self.client.packages
+        if isinstance(packages, artifact_packages.PackageManagerAdapter):
+            chunks = packages.glare.download(package_id)
+        else:
+            response = self.client.http_client.request(
+                '/v1/catalog/packages/{0}/download'.format(package_id),
+                'GET', log=False, stream=True)
+            if response.status_code != 200:
+                raise muranoclient_exc.from_response(response)
+            expected_md5 = response.headers.get('Content-MD5')
+            chunks = response.iter_content(DOWNLOAD_CHUNK_SIZE)
+
+        sha256 = hashlib.sha256()
+        md5 = hashlib.md5()
+        for chunk in chunks:
+            target.write(chunk)
+            sha256.update(chunk)
+            md5.update(chunk)
+        if expected_md5 and expected_md5 != base64.b64encode(
+                md5.digest()).decode('ascii'):
+            raise pkg_exc.PackageLoadError(
+                'Checksum mismatch for package id {0}'.format(package_id))
+        return sha256.hexdigest()
+
+    def _unpack_package(self, archive_path, package_directory, digest):
+        if self._link_unpacked_archive(package_directory, digest):
+            return load_utils.load_from_dir(package_directory)
+
+        with load_utils.load_from_file(
+                archive_path, target_dir=package_directory,
+                drop_dir=False) as app_package:
+            # compiled classes are never taken from package archives
+            shutil.rmtree(os.path.join(
+                package_directory, compiled_classes.ARTIFACTS_DIRECTORY),
+                ignore_errors=True)
+            # NOTE: the digest is written last, so that only completely
+            # unpacked archives are shared with other package ids
+            with open(os.path.join(package_directory, ARCHIVE_DIGEST_FILE),
+                      'w') as digest_file:
+                digest_file.write(digest)
+            return app_package
+
+    def _link_unpacked_archive(self, package_directory, digest):
+        """Reuses identical archive unpacked for another package id
+
+        Files are hard linked, so the copies share disk space while each
+        package id directory can still be cleaned up independently.
+
+        :return: True if package_directory was populated
+        """
+        versions_directory, package_id = os.path.split(package_directory)
+        try:
+            candidates = os.listdir(versions_directory)
+        except OSError:
+            return False
+
+        for candidate_id in candidates:
+            source = os.path.join(versions_directory, candidate_id)
+            digest_path = os.path.join(source, ARCHIVE_DIGEST_FILE)
+            if candidate_id == package_id or not os.path.isfile(digest_path):
+                continue
+
+            # keep the source from being cleaned up while it is linked
+            ipc_lock = m_utils.SharedInterProcessLock(
+                path=os.path.join(self._cache_directory,
+                                  '{}_usage.lock'.format(candidate_id)),
+                sleep_func=eventlet.sleep)
+            with usage_mem_locks[candidate_id].read_lock():
+                if not ipc_lock.acquire(blocking=False):
+                    continue
+                try:
+                    with open(digest_path) as digest_file:
+                        if digest_file.read().strip() != digest:
+                            continue
+                    _link_tree(source, package_directory)
+                    LOG.debug('Reused archive unpacked for package {id}'
+                              .format(id=candidate_id))
+                    return True
+                except (IOError, OSError):
+                    shutil.rmtree(package_directory, ignore_errors=True)
+                finally:
+                    ipc_lock.release()
+        return False
+
     def try_cleanup_cache(self, package_directory=None, current_id=None):
         """Attempts to cleanup cache in a given directory.
 
@@ -344,6 +600,10 @@ class ApiPackageLoader(package_loader.MuranoPackageLoader):
 
                     shutil.rmtree(stale_directory,
                                   ignore_errors=True)
+                    shutil.rmtree(os.path.join(
+                        self._cache_directory,
+                        compiled_classes.ARTIFACTS_DIRECTORY, pkg_id),
+                        ignore_errors=True)
                     ipc_lock.release()
 
                     for lock_type in ('usage', 'download'):
@@ -425,50 +685,58 @@ class ApiPackageLoader(package_loader.MuranoPackageLoader):
 class DirectoryPackageLoader(package_loader.MuranoPackageLoader):
     def __init__(self, base_path, root_loader=None):
         self._base_path = base_path
+        # snapshot of the shared index which is not affected by refreshes
+        # made by loaders of other tasks
+        index = get_directory_index(base_path)
+        self._indexed_by_class = index.packages_by_class
+        self._indexed_by_name = index.packages_by_name
         self._packages_by_class = {}
         self._packages_by_name = {}
         self._loaded_packages = set()
         self._root_loader = root_loader or self
-        self._build_index()
 
-    def _build_index(self):
-        for folder in self.search_package_folders(self._base_path):
-            try:
-                package = load_utils.load_from_dir(folder)
-                dsl_package = murano_package.MuranoPackage(
-                    self._root_loader, package)
-                for class_name in package.classes:
-                    dsl_package.register_class(
-                        (lambda pkg, cls:
-                            lambda: get_class(pkg, cls))(package, class_name),
-                        class_name
-                    )
-                if dsl_package.name == constants.CORE_LIBRARY:
-                    system_objects.register(dsl_package)
-                self.register_package(dsl_package)
-            except pkg_exc.PackageLoadError:
-                LOG.info(_LI('Unable to load package from path: {0}').format(
-                    folder))
-                continue
-            LOG.info(_LI('Loaded package from path {0}').format(folder))
+    def _to_dsl_package(self, package):
+        dsl_package = murano_package.MuranoPackage(
+            self._root_loader, package)
+        for class_name in package.classes:
+            dsl_package.register_class(
+                (lambda pkg, cls:
+                    lambda: get_class(pkg, cls))(package, class_name),
+                class_name
+            )
+        if dsl_package.name == constants.CORE_LIBRARY:
+            system_objects.register(dsl_package)
+        self.register_package(dsl_package)
+        return dsl_package
 
-    def load_class_package(self, class_name, version_spec):
-        packages = self._packages_by_class.get(class_name)
-        if not packages:
-            raise exceptions.NoPackageForClassFound(class_name)
+    def _select_package(self, indexed, registered, version_spec):
+        # packages of the index are turned into DSL packages on first use
+        # and stay registered in this loader afterwards
+        packages = dict(indexed or {})
+        packages.update(registered or {})
         version = version_spec.select(six.iterkeys(packages))
         if not version:
+            return None
+        package = packages[version]
+        if not isinstance(package, murano_package.MuranoPackage):
+            package = self._to_dsl_package(package)
+        return package
+
+    def load_class_package(self, class_name, version_spec):
+        package = self._select_package(
+            self._indexed_by_class.get(class_name),
+            self._packages_by_class.get(class_name), version_spec)
+        if package is None:
             raise exceptions.NoPackageForClassFound(class_name)
-        return packages[version]
+        return package
 
     def load_package(self, package_name, version_spec):
-        packages = self._packages_by_name.get(package_name)
-        if not packages:
-            raise exceptions.NoPackageFound(package_name)
-        version = version_spec.select(six.iterkeys(packages))
-        if not version:
+        package = self._select_package(
+            self._indexed_by_name.get(package_name),
+            self._packages_by_name.get(package_name), version_spec)
+        if package is None:
             raise exceptions.NoPackageFound(package_name)
-        return packages[version]
+        return package
 
     def register_package(self, package):
         for c in package.classes:
@@ -479,9 +747,11 @@ class DirectoryPackageLoader(package_loader.MuranoPackageLoader):
 
     @property
     def packages(self):
-        for package_versions in six.itervalues(self._packages_by_name):
-            for package in six.itervalues(package_versions):
-                yield package
+        for package_versions in six.itervalues(self._indexed_by_name):
+            for version, package in six.iteritems(package_versions):
+                registered = self._packages_by_name.get(
+                    package.full_name, {}).get(version)
+                yield registered or self._to_dsl_package(package)
 
     @staticmethod
     def split_path(path):
@@ -510,6 +780,97 @@ class DirectoryPackageLoader(package_loader.MuranoPackageLoader):
         pass
 
 
+class PackageDirectoryIndex(object):
+    """Index of packages located in a local directory
+
+    The index is shared by all the DirectoryPackageLoader instances of the
+    process. Each refresh walks the directory, but only package folders
+    that were added or modified since the previous scan are loaded.
+    """
+
+    def __init__(self, base_path):
+        self._base_path = base_path
+        self._folders = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._last_refresh = None
+        self.packages_by_class = {}
+        self.packages_by_name = {}
+
+    @staticmethod
+    def _get_stamp(folder):
+        # files edited in place do not change mtime of their directories,
+        # so every file of the package is stamped
+        stamp = []
+        for path, dirs, files in os.walk(folder):
+            dirs.sort()
+            for name in sorted(files):
+                file_path = os.path.join(path, name)
+                stat = os.stat(file_path)
+                stamp.append((os.path.relpath(file_path, folder),
+                              stat.st_mtime, stat.st_size))
+        return stamp
+
+    @staticmethod
+    def _load(folder):
+        try:
+            package = load_utils.load_from_dir(folder)
+        except pkg_exc.PackageLoadError:
+            LOG.info(_LI('Unable to load package from path: {0}').format(
+                folder))
+            return None
+        LOG.info(_LI('Loaded package from path {0}').format(folder))
+        return package
+
+    def refresh(self, interval=0):
+        with self._lock:
+            now = time.time()
+            if (self._last_refresh is not None and
+                    now - self._last_refresh < interval):
+                return
+            changed = False
+            folders = collections.OrderedDict()
+            for folder in DirectoryPackageLoader.search_package_folders(
+                    self._base_path):
+                try:
+                    stamp = self._get_stamp(folder)
+                except OSError:
+                    continue
+                entry = self._folders.get(folder)
+                if entry is None or entry[0] != stamp:
+                    entry = (stamp, self._load(folder))
+                    changed = True
+                folders[folder] = entry
+            if changed or len(folders) != len(self._folders):
+                self._rebuild(folders)
+            self._folders = folders
+            self._last_refresh = now
+
+    def _rebuild(self, folders):
+        # NOTE: new dictionaries are built so that loaders that already
+        # fetched them are not affected by concurrent refreshes
+        packages_by_class = {}
+        packages_by_name = {}
+        for _, package in six.itervalues(folders):
+            if package is None:
+                continue
+            for c in package.classes:
+                packages_by_class.setdefault(c, {})[
+                    package.version] = package
+            packages_by_name.setdefault(package.full_name, {})[
+                package.version] = package
+        self.packages_by_class = packages_by_class
+        self.packages_by_name = packages_by_name
+
+
+def get_directory_index(base_path):
+    index = directory_indexes.get(base_path)
+    if index is None:
+        index = directory_indexes.setdefault(
+            base_path, PackageDirectoryIndex(base_path))
+    index.refresh(CONF.packages_opts.load_packages_from_refresh_interval)
+    return index
+
+
 class CombinedPackageLoader(package_loader.MuranoPackageLoader):
     def __init__(self, execution_session, root_loader=None):
         root_loader = root_loader or self
@@ -542,6 +903,34 @@ class CombinedPackageLoader(package_loader.MuranoPackageLoader):
     def register_package(self, package):
         self.api_loader.register_package(package)
 
+    def prefetch(self, class_specs, package_specs):
+        """Downloads packages that are not available locally in advance
+
+        :param class_specs: dict of class names to version specs
+        :param package_specs: dict of package names to version specs
+        """
+        def is_local(method, error, name, version_spec):
+            for loader in self.directory_loaders:
+                try:
+                    getattr(loader, method)(name, version_spec)
+                    return True
+                except error:
+                    continue
+            return False
+
+        class_specs = dict(
+            (name, version_spec)
+            for name, version_spec in six.iteritems(class_specs)
+            if not is_local('load_class_package',
+                            exceptions.NoPackageForClassFound,
+                            name, version_spec))
+        package_specs = dict(
+            (name, version_spec)
+            for name, version_spec in six.iteritems(package_specs)
+            if not is_local('load_package', exceptions.NoPackageFound,
+                            name, version_spec))
+        self.api_loader.prefetch(class_specs, package_specs)
+
     def __enter__(self):
         return self
 
@@ -556,11 +945,55 @@ class CombinedPackageLoader(package_loader.MuranoPackageLoader):
             d_loader.cleanup()
 
 
-def get_class(package, name):
+def _link_tree(source, target):
+    """Recreates directory tree with hard links to the source files"""
+    for directory, directories, files in os.walk(source):
+        # compiled classes shipped in archives are never used
+        directories[:] = [d for d in directories
+                          if d != compiled_classes.ARTIFACTS_DIRECTORY]
+        target_directory = os.path.normpath(
+            os.path.join(target, os.path.relpath(directory, source)))
+        m_utils.ensure_tree(target_directory)
+        for name in files:
+            os.link(os.path.join(directory, name),
+                    os.path.join(target_directory, name))
+
+
+def _configure_definitions_cache():
+    ttl = CONF.packages_opts.package_definitions_ttl
+    definitions_cache.ttl = ttl
+    definitions_cache.capacity = DEFINITIONS_CACHE_SIZE if ttl > 0 else 0
+
+
+def get_class(package, name, artifacts_directory=None, package_id=None):
     version = package.runtime_version
-    loader = yaql_yaml_loader.get_loader(version)
     contents, file_id = package.get_class(name)
-    return loader(contents, file_id)
+    # NOTE: file contents are part of the key, so that a cached class is
+    # never used after the package directory was replaced or modified.
+    # Stale entries are pushed out by the LRU policy.
+    if isinstance(contents, six.text_type):
+        digest = hashlib.sha1(contents.encode('utf-8')).hexdigest()
+    else:
+        digest = hashlib.sha1(contents).hexdigest()
+    key = (file_id, name, str(version), digest)
+    if class_cache.capacity != CONF.packages_opts.class_cache_size:
+        class_cache.capacity = CONF.packages_opts.class_cache_size
+    result = class_cache.get(key)
+    if result is not None:
+        return result
+
+    use_artifacts = artifacts_directory and package_id
+    if use_artifacts:
+        header = compiled_classes.get_header(*key)
+        path = compiled_classes.get_path(artifacts_directory, package_id, name)
+        result = compiled_classes.load(artifacts_directory, path, header)
+    if result is None:
+        loader = yaql_yaml_loader.get_loader(version)
+        result = loader(contents, file_id)
+        if use_artifacts:
+            compiled_classes.save(artifacts_directory, path, header, result)
+    class_cache.put(key, result)
+    return result
 
 
 def _with_to_generator(context_obj):
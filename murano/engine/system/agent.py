@@ -16,22 +16,32 @@
 import copy
 import datetime
 import os
+import time
 import uuid
+import weakref
 
 import eventlet.event
 from oslo_config import cfg
 from oslo_log import log as logging
+from oslo_serialization import jsonutils
 import six
 from yaql import specs
 
 import murano.common.exceptions as exceptions
 from murano.common.messaging import message
+from murano.common import utils
 from murano.dsl import dsl
 import murano.engine.system.common as common
 
 LOG = logging.getLogger(__name__)
 CONF = cfg.CONF
 
+# Encoded file bodies and assembled Scripts and Files sections of execution
+# plans, per package. They depend only on package resources, so the plans
+# for the same template are assembled once for all the hosts.
+PLAN_CACHE_SIZE = 100
+_plan_caches = weakref.WeakKeyDictionary()
+
 
 class AgentException(Exception):
     pass
@@ -62,7 +72,7 @@ class Agent(object):
                       'by the server configuration')
             return
 
-        with common.create_rmq_client() as client:
+        with common.get_rmq_client() as client:
             client.declare(self._queue, enable_ha=True, ttl=86400000)
 
     def queue_name(self):
@@ -84,44 +94,96 @@ class Agent(object):
         """Send a message over the MQ interface."""
         msg_id = template.get('ID', uuid.uuid4().hex)
         if wait_results:
-            event = eventlet.event.Event()
-            listener = self._environment['agentListener']
-            listener().subscribe(msg_id, event)
+            event = self._subscribe(msg_id)
 
         msg = self._prepare_message(template, msg_id)
-        with common.create_rmq_client() as client:
+        with common.get_rmq_client() as client:
             client.send(message=msg, key=self._queue)
 
         if wait_results:
-            try:
-                with eventlet.Timeout(timeout):
-                    result = event.wait()
+            return self._wait_result(msg_id, event, timeout)
+        else:
+            return None
 
-            except eventlet.Timeout:
-                listener().unsubscribe(msg_id)
-                raise exceptions.TimeoutException(
-                    'The murano-agent did not respond '
-                    'within {0} seconds'.format(timeout))
+    def _subscribe(self, msg_id):
+        event = eventlet.event.Event()
+        listener = self._environment['agentListener']
+        listener().subscribe(msg_id, event)
+        return event
 
-            if not result:
-                return None
+    def _unsubscribe(self, msg_id):
+        listener = self._environment['agentListener']
+        listener().unsubscribe(msg_id)
 
-            if result.get('FormatVersion', '1.0.0').startswith('1.'):
-                return self._process_v1_result(result)
+    def _wait_result(self, msg_id, event, timeout):
+        try:
+            with eventlet.Timeout(timeout):
+                result = event.wait()
 
-            else:
-                return self._process_v2_result(result)
+        except eventlet.Timeout:
+            self._unsubscribe(msg_id)
+            raise exceptions.TimeoutException(
+                'The murano-agent did not respond '
+                'within {0} seconds'.format(timeout))
 
-        else:
+        if not result:
             return None
 
+        if result.get('FormatVersion', '1.0.0').startswith('1.'):
+            return self._process_v1_result(result)
+
+        else:
+            return self._process_v2_result(result)
+
+    @staticmethod
+    def _send_many(calls, timeout):
+        """Sends plans to several agents and waits for all the results
+
+        Plans are published over one connection before waiting, and all
+        results are awaited until the same deadline. Returns list of
+        dicts with either result or error of each call.
+        """
+        pending = []
+        try:
+            for agent, _ in calls:
+                msg_id = uuid.uuid4().hex
+                pending.append((agent, msg_id, agent._subscribe(msg_id)))
+            with common.get_rmq_client() as client:
+                for (agent, plan), (_, msg_id, _) in zip(calls, pending):
+                    # every agent gets its own copy of the plan so that
+                    # results are not mixed up when the template has an ID
+                    plan = dict(plan, ID=msg_id)
+                    client.send(message=agent._prepare_message(plan, msg_id),
+                                key=agent._queue)
+        except Exception:
+            for agent, msg_id, _ in pending:
+                agent._unsubscribe(msg_id)
+            raise
+
+        deadline = time.time() + timeout
+        results = []
+        for agent, msg_id, event in pending:
+            try:
+                result = agent._wait_result(
+                    msg_id, event, max(0, deadline - time.time()))
+            except AgentException as e:
+                results.append({'result': None, 'error': e.args[0]})
+            except exceptions.TimeoutException:
+                results.append({'result': None, 'error': {
+                    'message': 'The murano-agent did not respond '
+                               'within {0} seconds'.format(timeout),
+                    'timeout': True}})
+            else:
+                results.append({'result': result, 'error': None})
+        return results
+
     @specs.parameter(
         'resources', dsl.MuranoObjectParameter('io.murano.system.Resources'))
     def call(self, template, resources, timeout=None):
         if timeout is None:
             timeout = CONF.engine.agent_timeout
         self._check_enabled()
-        plan = self.build_execution_plan(template, resources())
+        plan = self._build_plan(template, resources)
         return self._send(plan, True, timeout)
 
     @specs.parameter(
@@ -130,16 +192,34 @@ class Agent(object):
         if timeout is None:
             timeout = CONF.engine.agent_timeout
         self._check_enabled()
-        plan = self.build_execution_plan(template, resources())
+        plan = self._build_plan(template, resources)
         return plan
 
     @specs.parameter(
         'resources', dsl.MuranoObjectParameter('io.murano.system.Resources'))
     def send(self, template, resources):
         self._check_enabled()
-        plan = self.build_execution_plan(template, resources())
+        plan = self._build_plan(template, resources)
         return self._send(plan, False, 0)
 
+    @staticmethod
+    @specs.parameter(
+        'agents', dsl.MuranoObjectSequenceParameter(
+            'io.murano.system.Agent', decorate=False))
+    @specs.parameter(
+        'resources', dsl.MuranoObjectParameter('io.murano.system.Resources'))
+    def call_many(agents, template, resources, timeout=None):
+        """Executes template on several agents in parallel"""
+        if timeout is None:
+            timeout = CONF.engine.agent_timeout
+        agents = [agent.extension for agent in agents]
+        calls = []
+        for agent in agents:
+            agent._check_enabled()
+            calls.append(
+                (agent, agent._build_plan(template, resources)))
+        return Agent._send_many(calls, timeout)
+
     def call_raw(self, plan, timeout=None):
         if timeout is None:
             timeout = CONF.engine.agent_timeout
@@ -209,29 +289,53 @@ class Agent(object):
             'timestamp': datetime.datetime.now().isoformat()
         }
 
-    def build_execution_plan(self, template, resources):
+    def _build_plan(self, template, resources):
+        return self.build_execution_plan(
+            template, resources(), resources.extension.package)
+
+    def build_execution_plan(self, template, resources, package=None):
         template = copy.deepcopy(template)
         if not isinstance(template, dict):
             raise ValueError('Incorrect execution plan ')
+        cache = self._get_plan_cache(package)
         format_version = template.get('FormatVersion')
         if not format_version or format_version.startswith('1.'):
-            return self._build_v1_execution_plan(template, resources)
+            return self._build_v1_execution_plan(template, resources, cache)
         else:
-            return self._build_v2_execution_plan(template, resources)
+            return self._build_v2_execution_plan(template, resources, cache)
 
-    def _build_v1_execution_plan(self, template, resources):
+    @staticmethod
+    def _get_plan_cache(package):
+        if package is None:
+            return None
+        cache = _plan_caches.get(package)
+        if cache is None:
+            cache = _plan_caches[package] = utils.LruCache(PLAN_CACHE_SIZE)
+        return cache
+
+    @staticmethod
+    def _get_cached(cache, key, func):
+        if cache is None:
+            return func()
+        result = cache.get(key)
+        if result is None:
+            result = func()
+            cache.put(key, result)
+        return result
+
+    def _build_v1_execution_plan(self, template, resources, cache=None):
         scripts_folder = 'scripts'
         script_files = template.get('Scripts', [])
         scripts = []
         for script in script_files:
             script_path = os.path.join(scripts_folder, script)
-            scripts.append(resources.string(
-                script_path).encode('base64'))
+            scripts.append(self._get_cached(
+                cache, ('script', script_path),
+                lambda: resources.string(script_path).encode('base64')))
         template['Scripts'] = scripts
         return template
 
-    def _build_v2_execution_plan(self, template, resources):
-        scripts_folder = 'scripts'
+    def _build_v2_execution_plan(self, template, resources, cache=None):
         plan_id = uuid.uuid4().hex
         template['ID'] = plan_id
         if 'Action' not in template:
@@ -239,6 +343,32 @@ class Agent(object):
         if 'Files' not in template:
             template['Files'] = {}
 
+        key = None
+        if cache is not None:
+            try:
+                key = ('plan', jsonutils.dumps(
+                    [template.get('Scripts'), template['Files']],
+                    sort_keys=True))
+            except (TypeError, ValueError):
+                pass
+        if key is None:
+            return self._assemble_v2_files(template, resources, cache)
+
+        # plans share file descriptions but only strings are shared
+        # between their copies
+        sections = cache.get(key)
+        if sections is None:
+            self._assemble_v2_files(template, resources, cache)
+            cache.put(key, copy.deepcopy(
+                (template.get('Scripts'), template['Files'])))
+        else:
+            scripts, template['Files'] = copy.deepcopy(sections)
+            if scripts is not None:
+                template['Scripts'] = scripts
+        return template
+
+    def _assemble_v2_files(self, template, resources, cache):
+        scripts_folder = 'scripts'
         files = {}
         for file_id, file_descr in template['Files'].items():
             files[file_descr['Name']] = file_id
@@ -248,15 +378,15 @@ class Agent(object):
                 raise ValueError('No entry point in script ' + name)
 
             if 'Application' in script['Type']:
-                script['EntryPoint'] = self._place_file(scripts_folder,
-                                                        script['EntryPoint'],
-                                                        template, resources,
-                                                        files)
+                script['EntryPoint'] = self._place_file(
+                    scripts_folder, script['EntryPoint'], template,
+                    resources, files, cache)
             if 'Files' in script:
                 for i, file in enumerate(script['Files']):
                     if self._get_name(file) not in files:
                         script['Files'][i] = self._place_file(
-                            scripts_folder, file, template, resources, files)
+                            scripts_folder, file, template, resources,
+                            files, cache)
                     else:
                         script['Files'][i] = files[file]
         return template
@@ -292,14 +422,19 @@ class Agent(object):
             file = list(file.values())[0]
         return file
 
-    def _get_body(self, file, resources, folder):
+    def _get_body(self, file, resources, folder, cache=None):
         use_base64 = self._is_base64(file)
         if use_base64 and file.startswith('<') and file.endswith('>'):
             file = file[1: -1]
-        body = resources.string(os.path.join(folder, file))
-        if use_base64:
-            body = body.encode('base64')
-        return body
+        path = os.path.join(folder, file)
+
+        def read():
+            body = resources.string(path)
+            if use_base64:
+                body = body.encode('base64')
+            return body
+
+        return self._get_cached(cache, ('file', path, use_base64), read)
 
     def _is_base64(self, file):
         return file.startswith('<') and file.endswith('>')
@@ -307,7 +442,8 @@ class Agent(object):
     def _get_body_type(self, file):
         return 'Base64' if self._is_base64(file) else 'Text'
 
-    def _place_file(self, folder, file, template, resources, files):
+    def _place_file(self, folder, file, template, resources, files,
+                    cache=None):
         file_value = self._get_file_value(file)
         name = self._get_name(file)
         file_id = uuid.uuid4().hex
@@ -318,7 +454,7 @@ class Agent(object):
 
         else:
             template['Files'][file_id] = self._get_file_description(
-                file, resources, folder)
+                file, resources, folder, cache)
             files[name] = file_id
         return file_id
 
@@ -331,12 +467,12 @@ class Agent(object):
             'Type': 'Downloadable'
         }
 
-    def _get_file_description(self, file, resources, folder):
+    def _get_file_description(self, file, resources, folder, cache=None):
         name = self._get_name(file)
         file_value = self._get_file_value(file)
 
         body_type = self._get_body_type(file_value)
-        body = self._get_body(file_value, resources, folder)
+        body = self._get_body(file_value, resources, folder, cache)
         return {
             'Name': name,
             'BodyType': body_type,
@@ -13,13 +13,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import functools
+
 import eventlet
-import greenlet
 from oslo_config import cfg
 from oslo_log import log as logging
 
 from murano.common import exceptions
-from murano.common.i18n import _LE
+from murano.common.i18n import _LE, _LW
 from murano.dsl import dsl
 from murano.dsl import helpers
 from murano.engine.system import common
@@ -32,6 +33,84 @@ class AgentListenerException(Exception):
     pass
 
 
+class ResultsDispatcher(object):
+    """Receives results for all agent listeners of the engine process
+
+    Results queues of the active listeners are consumed on a single
+    connection, and each result is routed to the event subscribed for its
+    message ID. Consuming thread runs while there are active queues.
+    """
+
+    # seconds to wait for messages before pending acks are sent and the
+    # set of consumed queues is updated
+    poll_interval = 1
+
+    def __init__(self):
+        self._queues = {}
+        self._generation = 0
+        self._thread = None
+
+    def add_queue(self, queue, subscriptions):
+        self._queues[queue] = subscriptions
+        self._generation += 1
+        if self._thread is None:
+            self._thread = eventlet.spawn(self._run)
+
+    def remove_queue(self, queue):
+        if self._queues.pop(queue, None) is not None:
+            self._generation += 1
+
+    def _run(self):
+        try:
+            while self._queues:
+                try:
+                    self._consume()
+                except Exception:
+                    LOG.exception(_LE('Error while receiving agent results'))
+                    eventlet.sleep(self.poll_interval)
+        finally:
+            self._thread = None
+
+    def _consume(self):
+        rabbitmq = CONF.rabbitmq
+        with common.create_rmq_client() as client:
+            subscription = client.open_multiplexed(
+                rabbitmq.results_prefetch_count,
+                rabbitmq.results_ack_batch_size)
+            generation = None
+            while self._queues:
+                if generation != self._generation:
+                    generation = self._generation
+                    for queue in list(subscription.queues):
+                        if queue not in self._queues:
+                            subscription.remove_queue(queue)
+                    for queue in list(self._queues):
+                        if queue not in subscription.queues:
+                            client.declare(
+                                queue, enable_ha=True, ttl=86400000)
+                            subscription.add_queue(queue, functools.partial(
+                                self._dispatch, queue))
+                subscription.drain(timeout=self.poll_interval)
+            subscription.flush()
+
+    def _dispatch(self, queue, msg):
+        body = msg.body or {}
+        if not isinstance(body, dict):
+            LOG.warning(_LW("Ignoring execution result with unexpected "
+                            "body '{body}'").format(body=body))
+            return
+        msg_id = body.get('SourceID', msg.id)
+        LOG.debug("Got execution result: id '{msg_id}'"
+                  " body '{body}'".format(msg_id=msg_id, body=msg.body))
+        subscriptions = self._queues.get(queue)
+        if subscriptions is not None and msg_id in subscriptions:
+            event = subscriptions.pop(msg_id)
+            event.send(msg.body)
+
+
+_dispatcher = ResultsDispatcher()
+
+
 @dsl.name('io.murano.system.AgentListener')
 class AgentListener(object):
     def __init__(self, name):
@@ -41,7 +120,7 @@ class AgentListener(object):
         self._enabled = True
         self._results_queue = str('-execution-results-%s' % name.lower())
         self._subscriptions = {}
-        self._receive_thread = None
+        self._started = False
 
     def _check_enabled(self):
         if CONF.engine.disable_murano_agent:
@@ -65,10 +144,11 @@ class AgentListener(object):
             LOG.debug("murano-agent is disabled by the server")
             return
 
-        if self._receive_thread is None:
+        if not self._started:
             helpers.get_execution_session().on_session_finish(
                 lambda: self.stop())
-            self._receive_thread = eventlet.spawn(self._receive)
+            _dispatcher.add_queue(self._results_queue, self._subscriptions)
+            self._started = True
 
     def stop(self):
         if CONF.engine.disable_murano_agent:
@@ -76,14 +156,9 @@ class AgentListener(object):
             LOG.debug("murano-agent is disabled by the server")
             return
 
-        if self._receive_thread is not None:
-            self._receive_thread.kill()
-            try:
-                self._receive_thread.wait()
-            except greenlet.GreenletExit:
-                pass
-            finally:
-                self._receive_thread = None
+        if self._started:
+            _dispatcher.remove_queue(self._results_queue)
+            self._started = False
 
     def subscribe(self, message_id, event):
         self._check_enabled()
@@ -93,20 +168,3 @@ class AgentListener(object):
     def unsubscribe(self, message_id):
         self._check_enabled()
         self._subscriptions.pop(message_id)
-
-    def _receive(self):
-        with common.create_rmq_client() as client:
-            client.declare(self._results_queue, enable_ha=True, ttl=86400000)
-            with client.open(self._results_queue) as subscription:
-                while True:
-                    msg = subscription.get_message()
-                    if not msg:
-                        continue
-                    msg.ack()
-                    msg_id = msg.body.get('SourceID', msg.id)
-                    LOG.debug("Got execution result: id '{msg_id}'"
-                              " body '{body}'".format(msg_id=msg_id,
-                                                      body=msg.body))
-                    if msg_id in self._subscriptions:
-                        event = self._subscriptions.pop(msg_id)
-                        event.send(msg.body)
@@ -16,11 +16,14 @@
 from oslo_config import cfg
 
 from murano.common.messaging import mqclient
+from murano.common.messaging import pool
 
 CONF = cfg.CONF
 
+_rmq_pool = None
 
-def create_rmq_client():
+
+def create_rmq_client(**kwargs):
     rabbitmq = CONF.rabbitmq
     connection_params = {
         'login': rabbitmq.login,
@@ -31,4 +34,14 @@ def create_rmq_client():
         'ssl': rabbitmq.ssl,
         'ca_certs': rabbitmq.ca_certs.strip() or None
     }
+    connection_params.update(kwargs)
     return mqclient.MqClient(**connection_params)
+
+
+def get_rmq_client():
+    """Returns context manager that provides connected pooled client"""
+    global _rmq_pool
+    if _rmq_pool is None:
+        _rmq_pool = pool.ConnectionPool(
+            create_rmq_client, CONF.rabbitmq.connection_pool_size)
+    return _rmq_pool.acquire()
@@ -17,6 +17,7 @@ from oslo_log import log as logging
 from yaql.language import specs
 from yaql.language import yaqltypes
 
+from murano.dsl import constants
 from murano.dsl import dsl
 
 NAME_TEMPLATE = u'applications.{0}'
@@ -38,36 +39,42 @@ class Logger(object):
             NAME_TEMPLATE.format(logger_name))
 
     @specs.parameter('_Logger__message', yaqltypes.String())
+    @specs.meta(constants.META_NO_LOCK, True)
     @inject_format
     def trace(__self, __yaql_format_function, __message, *args, **kwargs):
         __self._log(__self._underlying_logger.trace,
                     __yaql_format_function, __message, args, kwargs)
 
     @specs.parameter('_Logger__message', yaqltypes.String())
+    @specs.meta(constants.META_NO_LOCK, True)
     @inject_format
     def debug(__self, __yaql_format_function, __message, *args, **kwargs):
         __self._log(__self._underlying_logger.debug,
                     __yaql_format_function, __message, args, kwargs)
 
     @specs.parameter('_Logger__message', yaqltypes.String())
+    @specs.meta(constants.META_NO_LOCK, True)
     @inject_format
     def info(__self, __yaql_format_function, __message, *args, **kwargs):
         __self._log(__self._underlying_logger.info,
                     __yaql_format_function, __message, args, kwargs)
 
     @specs.parameter('_Logger__message', yaqltypes.String())
+    @specs.meta(constants.META_NO_LOCK, True)
     @inject_format
     def warning(__self, __yaql_format_function, __message, *args, **kwargs):
         __self._log(__self._underlying_logger.warning,
                     __yaql_format_function, __message, args, kwargs)
 
     @specs.parameter('_Logger__message', yaqltypes.String())
+    @specs.meta(constants.META_NO_LOCK, True)
     @inject_format
     def error(__self, __yaql_format_function, __message, *args, **kwargs):
         __self._log(__self._underlying_logger.error,
                     __yaql_format_function, __message, args, kwargs)
 
     @specs.parameter('_Logger__message', yaqltypes.String())
+    @specs.meta(constants.META_NO_LOCK, True)
     @inject_format
     def critical(__self, __yaql_format_function,
                  __message, *args, **kwargs):
@@ -75,6 +82,7 @@ class Logger(object):
                     __yaql_format_function, __message, args, kwargs)
 
     @specs.parameter('_Logger__message', yaqltypes.String())
+    @specs.meta(constants.META_NO_LOCK, True)
     @inject_format
     def exception(__self, __yaql_format_function,
                   __exc, __message, *args, **kwargs):
@@ -13,12 +13,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
 import json as jsonlib
+import os
 
+from oslo_config import cfg
 import yaml as yamllib
 from yaql.language import specs
 from yaql.language import yaqltypes
 
+from murano.common import utils
 from murano.dsl import dsl
 from murano.dsl import dsl_types
 from murano.dsl import helpers
@@ -28,6 +32,12 @@ if hasattr(yamllib, 'CSafeLoader'):
 else:
     yaml_loader = yamllib.SafeLoader
 
+CONF = cfg.CONF
+
+# contents of resource files and results of their YAML parsing keyed by
+# path and modification time of the file
+resource_cache = utils.LruCache(0)
+
 
 def _construct_yaml_str(self, node):
     # Override the default string handling function
@@ -49,26 +59,53 @@ class ResourceManager(object):
         murano_class = helpers.get_type(helpers.get_caller_context(context))
         self._package = murano_class.package
 
+    @property
+    def package(self):
+        return self._package
+
     @staticmethod
     @specs.parameter('owner', dsl.MuranoTypeParameter(nullable=True))
     @specs.inject('receiver', yaqltypes.Receiver())
     def string(receiver, name, owner=None):
-        path = ResourceManager._get_package(owner, receiver).get_resource(name)
-        with open(path) as file:
-            return file.read()
+        return ResourceManager._load(receiver, name, owner, 'string')
 
     @classmethod
     @specs.parameter('owner', dsl.MuranoTypeParameter(nullable=True))
     @specs.inject('receiver', yaqltypes.Receiver())
     def json(cls, receiver, name, owner=None):
-        return jsonlib.loads(cls.string(receiver, name, owner))
+        # parsing JSON is cheaper than copying the parsed value
+        return jsonlib.loads(cls._load(receiver, name, owner, 'string'))
 
     @classmethod
     @specs.parameter('owner', dsl.MuranoTypeParameter(nullable=True))
     @specs.inject('receiver', yaqltypes.Receiver())
     def yaml(cls, receiver, name, owner=None):
-        return yamllib.load(
-            cls.string(receiver, name, owner), Loader=yaml_loader)
+        # parsed values are copied so that callers cannot modify the cache
+        return copy.deepcopy(cls._load(
+            receiver, name, owner, 'yaml',
+            lambda text: yamllib.load(text, Loader=yaml_loader)))
+
+    @staticmethod
+    def _load(receiver, name, owner, kind, parser=None):
+        path = ResourceManager._get_package(owner, receiver).get_resource(name)
+        if resource_cache.capacity != CONF.packages_opts.resource_cache_size:
+            resource_cache.capacity = CONF.packages_opts.resource_cache_size
+        stat = os.stat(path)
+        key = (path, stat.st_mtime, stat.st_size)
+
+        text = resource_cache.get(key + ('string',))
+        if text is None:
+            with open(path) as file:
+                text = file.read()
+            resource_cache.put(key + ('string',), text)
+        if parser is None:
+            return text
+
+        result = resource_cache.get(key + (kind,))
+        if result is None:
+            result = parser(text)
+            resource_cache.put(key + (kind,), result)
+        return result
 
     @staticmethod
     def _get_package(owner, receiver):
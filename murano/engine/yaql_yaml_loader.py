@@ -22,59 +22,73 @@ from murano.dsl import helpers
 from murano.dsl import yaql_expression
 
 
+if hasattr(yaml, 'CLoader'):
+    base_loader = yaml.CLoader
+else:
+    base_loader = yaml.Loader
+
+
+class MuranoPlDict(dict):
+    pass
+
+
 @helpers.memoize
-def get_loader(version):
+def get_loader(version, base=base_loader):
     version = helpers.parse_version(version)
 
-    class MuranoPlDict(dict):
-        pass
-
     class YaqlExpression(yaql_expression.YaqlExpression):
         @staticmethod
         def match(expr):
             return yaql_expression.YaqlExpression.is_expression(expr, version)
 
-    def load(contents, file_id):
-        def build_position(node):
+    class YaqlYamlLoader(base):
+        def __init__(self, stream, file_id):
+            super(YaqlYamlLoader, self).__init__(stream)
+            self.file_id = file_id
+
+        def build_position(self, node):
             return dsl_types.ExpressionFilePosition(
-                file_id,
+                self.file_id,
                 node.start_mark.line + 1,
                 node.start_mark.column + 1,
                 node.end_mark.line + 1,
                 node.end_mark.column + 1)
 
-        class MuranoPlYamlConstructor(yaml.constructor.Constructor):
-            def construct_yaml_map(self, node):
-                data = MuranoPlDict()
-                data.source_file_position = build_position(node)
-                yield data
-                value = self.construct_mapping(node)
-                data.update(value)
-
-        class YaqlYamlLoader(yaml.Loader, MuranoPlYamlConstructor):
-            pass
-
-        YaqlYamlLoader.add_constructor(
-            u'tag:yaml.org,2002:map',
-            MuranoPlYamlConstructor.construct_yaml_map)
-
-        # workaround for PyYAML bug: http://pyyaml.org/ticket/221
-        resolvers = {}
-        for k, v in yaml.Loader.yaml_implicit_resolvers.items():
-            resolvers[k] = v[:]
-        YaqlYamlLoader.yaml_implicit_resolvers = resolvers
-
-        def yaql_constructor(loader, node):
-            value = loader.construct_scalar(node)
-            result = yaql_expression.YaqlExpression(value, version)
-            result.source_file_position = build_position(node)
-            return result
+        def construct_yaml_map(self, node):
+            data = MuranoPlDict()
+            data.source_file_position = self.build_position(node)
+            yield data
+            value = self.construct_mapping(node)
+            data.update(value)
+
+    YaqlYamlLoader.add_constructor(
+        u'tag:yaml.org,2002:map', YaqlYamlLoader.construct_yaml_map)
+
+    # workaround for PyYAML bug: http://pyyaml.org/ticket/221
+    resolvers = {}
+    for k, v in base.yaml_implicit_resolvers.items():
+        resolvers[k] = v[:]
+    YaqlYamlLoader.yaml_implicit_resolvers = resolvers
+
+    def yaql_constructor(loader, node):
+        value = loader.construct_scalar(node)
+        result = yaql_expression.YaqlExpression(value, version)
+        result.source_file_position = loader.build_position(node)
+        return result
 
-        YaqlYamlLoader.add_constructor(u'!yaql', yaql_constructor)
-        YaqlYamlLoader.add_implicit_resolver(u'!yaql', YaqlExpression, None)
-        return list(filter(
-            lambda t: t,
-            yaml.load_all(contents, Loader=YaqlYamlLoader))
-        )
+    YaqlYamlLoader.add_constructor(u'!yaql', yaql_constructor)
+    YaqlYamlLoader.add_implicit_resolver(u'!yaql', YaqlExpression, None)
+
+    def load(contents, file_id):
+        loader = YaqlYamlLoader(contents, file_id)
+        try:
+            result = []
+            while loader.check_data():
+                data = loader.get_data()
+                if data:
+                    result.append(data)
+            return result
+        finally:
+            loader.dispose()
 
     return load
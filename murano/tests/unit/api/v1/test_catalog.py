@@ -13,7 +13,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import base64
 import cgi
+import hashlib
 import imghdr
 import json
 import os
@@ -401,6 +403,9 @@ class TestCatalogApi(test_base.ControllerTest, test_base.MuranoApiTestCase):
         result = req.get_response(self.api)
 
         self.assertEqual(200, result.status_code)
+        self.assertEqual(
+            base64.b64encode(hashlib.md5(result.body).digest()).decode(),
+            result.headers['Content-MD5'])
 
     def test_download_package_negative(self):
 
@@ -0,0 +1,110 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import socket
+
+import mock
+
+from murano.common.messaging import mqclient
+from murano.common.messaging import pool
+from murano.tests.unit import base
+
+
+class TestConnectionPool(base.MuranoTestCase):
+    def setUp(self):
+        super(TestConnectionPool, self).setUp()
+        self.factory = mock.Mock(side_effect=self._create_client)
+        self.pool = pool.ConnectionPool(self.factory, max_size=1)
+
+    @staticmethod
+    def _create_client(declared_queues):
+        client = mock.Mock(connection_errors=(socket.error,))
+        client.connected = True
+        return client
+
+    def test_connection_reused(self):
+        with self.pool.acquire() as client1:
+            pass
+        with self.pool.acquire() as client2:
+            pass
+        self.assertIs(client1, client2)
+        self.assertEqual(1, self.factory.call_count)
+        client1.connect.assert_called_once_with()
+        self.assertFalse(client1.close.called)
+
+    def test_declarations_shared(self):
+        with self.pool.acquire():
+            with self.pool.acquire():
+                pass
+        declared_queues = [c[1]['declared_queues']
+                           for c in self.factory.call_args_list]
+        self.assertEqual(2, len(declared_queues))
+        self.assertIs(declared_queues[0], declared_queues[1])
+
+    def test_max_size(self):
+        with self.pool.acquire() as client1:
+            with self.pool.acquire() as client2:
+                self.assertIsNot(client1, client2)
+        # only one idle connection is kept
+        self.assertTrue(client1.close.called)
+        self.assertFalse(client2.close.called)
+        self.assertEqual(2, self.pool.connections_created)
+
+    def test_failed_connection_dropped(self):
+        def fail():
+            with self.pool.acquire():
+                raise socket.error()
+
+        self.assertRaises(socket.error, fail)
+        with self.pool.acquire() as client:
+            pass
+        self.assertEqual(2, self.factory.call_count)
+        self.assertFalse(client.close.called)
+
+    def test_disconnected_client_skipped(self):
+        with self.pool.acquire() as client1:
+            pass
+        client1.connected = False
+        with self.pool.acquire() as client2:
+            self.assertIsNot(client1, client2)
+
+
+class TestMqClient(base.MuranoTestCase):
+    def setUp(self):
+        super(TestMqClient, self).setUp()
+        self.kombu = mock.patch.object(mqclient, 'kombu').start()
+        self.addCleanup(mock.patch.stopall)
+        self.declared_queues = {}
+        self.client = mqclient.MqClient(
+            'guest', 'guest', 'localhost', 5672, '/',
+            declared_queues=self.declared_queues)
+        self.client.connect()
+        self.connection = self.kombu.Connection.return_value
+
+    @mock.patch('time.time')
+    def test_declaration_cached(self, time_mock):
+        time_mock.return_value = 1000.0
+        self.client.declare('queue', ttl=10000)
+        self.client.declare('queue', ttl=10000)
+        self.assertEqual(1, self.connection.ensure.call_count)
+        self.assertIn(('queue', ''), self.declared_queues)
+        # re-declared when queue might be close to expiration
+        time_mock.return_value = 1006.0
+        self.client.declare('queue', ttl=10000)
+        self.assertEqual(2, self.connection.ensure.call_count)
+
+    def test_producer_reused(self):
+        msg = mock.Mock(body={}, id='id')
+        self.client.send(msg, 'key')
+        self.client.send(msg, 'key')
+        self.assertEqual(1, self.kombu.Producer.call_count)
+        self.assertEqual(2, self.connection.ensure.return_value.call_count)
@@ -0,0 +1,55 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+import semantic_version
+
+from murano.common import engine
+from murano.tests.unit import base
+
+
+class TestTaskExecutor(base.MuranoTestCase):
+    def test_prefetch_packages(self):
+        model = {
+            'Objects': {
+                '?': {'id': '1', 'type': 'io.murano.Environment'},
+                'applications': [{
+                    '?': {'id': '2', 'type': 'foo.Foo',
+                          'classVersion': '1.2'},
+                    'server': {'?': {'id': '3', 'type': 'bar.Bar',
+                                     'package': 'bar'}}
+                }]
+            },
+            'ObjectsCopy': {
+                '?': {'id': '1', 'type': 'io.murano.Environment'},
+                'applications': [{
+                    '?': {'id': '4', 'type': 'baz.Baz'}
+                }]
+            },
+            'Attributes': []
+        }
+        task = {'id': 'task', 'model': model, 'token': 'token',
+                'tenant_id': 'tenant'}
+        executor = engine.TaskExecutor(task, mock.MagicMock())
+        pkg_loader = mock.MagicMock()
+        executor._prefetch_packages(pkg_loader)
+
+        class_specs, package_specs = pkg_loader.prefetch.call_args[0]
+        self.assertEqual(
+            ['baz.Baz', 'foo.Foo', 'io.murano.Environment'],
+            sorted(class_specs))
+        self.assertEqual(['bar'], list(package_specs))
+        self.assertTrue(class_specs['foo.Foo'].match(
+            semantic_version.Version('1.2.5')))
+        self.assertFalse(class_specs['foo.Foo'].match(
+            semantic_version.Version('1.3.0')))
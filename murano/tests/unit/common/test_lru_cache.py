@@ -0,0 +1,63 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from murano.common import utils
+from murano.tests.unit import base
+
+
+class LruCacheTests(base.MuranoTestCase):
+    def test_get_put(self):
+        cache = utils.LruCache(2)
+        cache.put('a', 1)
+        self.assertEqual(1, cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(1, cache.misses)
+
+    def test_evicts_least_recently_used(self):
+        cache = utils.LruCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+        self.assertEqual(2, len(cache))
+
+    def test_shrink_on_capacity_change(self):
+        cache = utils.LruCache(3)
+        for i in range(3):
+            cache.put(i, i)
+        cache.capacity = 1
+        self.assertEqual(1, len(cache))
+        self.assertIn(2, cache)
+
+    def test_zero_capacity_disables_cache(self):
+        cache = utils.LruCache(0)
+        cache.put('a', 1)
+        self.assertEqual(0, len(cache))
+        self.assertIsNone(cache.get('a'))
+
+    @mock.patch('murano.common.utils.time')
+    def test_ttl(self, time_mock):
+        time_mock.time.return_value = 100
+        cache = utils.LruCache(2, ttl=10)
+        cache.put('a', 1)
+        time_mock.time.return_value = 105
+        self.assertEqual(1, cache.get('a'))
+        time_mock.time.return_value = 110
+        self.assertNotIn('a', cache)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(1, cache.misses)
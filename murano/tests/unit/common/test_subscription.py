@@ -0,0 +1,79 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import socket
+
+import mock
+
+from murano.common.messaging import subscription
+from murano.tests.unit import base
+
+
+class TestMultiplexedSubscription(base.MuranoTestCase):
+    def setUp(self):
+        super(TestMultiplexedSubscription, self).setUp()
+        self.kombu = mock.patch.object(subscription, 'kombu').start()
+        self.addCleanup(mock.patch.stopall)
+        self.connection = mock.Mock()
+        self.channel = self.connection.channel.return_value
+        self.subscription = subscription.MultiplexedSubscription(
+            self.connection, prefetch_count=3, ack_batch_size=2)
+        self.received = []
+
+    def _deliver(self, queue, delivery_tag):
+        consumer = self.kombu.Consumer.return_value
+        receive = consumer.register_callback.call_args[0][0]
+        handle = mock.Mock(body='{"id": %d}' % delivery_tag,
+                           delivery_tag=delivery_tag)
+        handle.properties = {'message_id': str(delivery_tag)}
+        receive(None, handle)
+
+    def test_batched_acks(self):
+        self.subscription.add_queue(
+            'q1', lambda msg: self.received.append(msg.body['id']))
+        self.assertEqual({'q1'}, set(self.subscription.queues))
+        for tag in range(1, 4):
+            self._deliver('q1', tag)
+        self.assertEqual([1, 2, 3], self.received)
+        self.channel.basic_ack.assert_called_once_with(2, multiple=True)
+
+        # remaining acks are sent when there are no more messages
+        self.connection.drain_events.side_effect = socket.timeout()
+        self.assertFalse(self.subscription.drain(timeout=1))
+        self.channel.basic_ack.assert_called_with(3, multiple=True)
+        self.assertEqual(2, self.channel.basic_ack.call_count)
+
+    def test_failed_message_acknowledged(self):
+        def callback(msg):
+            if msg.body['id'] == 1:
+                raise ValueError()
+            self.received.append(msg.body['id'])
+
+        self.subscription.add_queue('q1', callback)
+        self._deliver('q1', 1)
+        self._deliver('q1', 2)
+        self.assertEqual([2], self.received)
+        self.channel.basic_ack.assert_called_once_with(2, multiple=True)
+
+    def test_ack_batch_limited_by_prefetch(self):
+        sub = subscription.MultiplexedSubscription(
+            self.connection, prefetch_count=1, ack_batch_size=10)
+        sub.add_queue('q1', self.received.append)
+        self._deliver('q1', 1)
+        self.channel.basic_ack.assert_called_once_with(1, multiple=True)
+
+    def test_remove_queue(self):
+        self.subscription.add_queue('q1', self.received.append)
+        self.subscription.remove_queue('q1')
+        self.subscription.remove_queue('q1')
+        self.kombu.Consumer.return_value.cancel.assert_called_once_with()
+        self.assertEqual(set(), set(self.subscription.queues))
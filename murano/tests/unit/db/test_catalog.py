@@ -251,6 +251,26 @@ class CatalogDBTestCase(base.MuranoWithDBTestCase):
             {'tag': ['tag3']}, self.context)
         self.assertEqual(0, len(res))
 
+    def test_package_search_class_name(self):
+        api.package_upload(
+            self._stub_package(
+                class_definitions=('foo', 'bar'),
+                fully_qualified_name=str(uuid.uuid4())), self.tenant_id)
+        api.package_upload(
+            self._stub_package(
+                class_definitions=('baz',),
+                fully_qualified_name=str(uuid.uuid4())), self.tenant_id)
+
+        res = api.package_search(
+            {'class_name': 'foo'}, self.context)
+        self.assertEqual(1, len(res))
+        res = api.package_search(
+            {'class_name': ['bar', 'baz']}, self.context)
+        self.assertEqual(2, len(res))
+        res = api.package_search(
+            {'class_name': ['qux']}, self.context)
+        self.assertEqual(0, len(res))
+
     def test_package_search_type(self):
         api.package_upload(
             self._stub_package(
@@ -14,6 +14,7 @@
 # limitations under the License.
 
 import mock
+from yaql.language import exceptions as yaql_exceptions
 
 from murano.common import exceptions as exc
 from murano.dsl import constants
@@ -22,6 +23,9 @@ from murano.dsl import yaql_integration
 from murano.engine import execution_session
 from murano.engine.system import agent
 from murano.engine.system import agent_listener
+from murano.engine.system import common
+from murano.engine.system import resource_manager
+from murano.tests.unit import base
 from murano.tests.unit.dsl.foundation import object_model as om
 from murano.tests.unit.dsl.foundation import test_case
 
@@ -59,6 +63,68 @@ class TestAgentListener(test_case.DslTestCase):
                           al.subscribe, 'msgid', 'event')
 
 
+class TestResultsDispatcher(base.MuranoTestCase):
+    def setUp(self):
+        super(TestResultsDispatcher, self).setUp()
+        self.spawn = mock.patch('eventlet.spawn').start()
+        self.addCleanup(mock.patch.stopall)
+        self.dispatcher = agent_listener.ResultsDispatcher()
+        self.event = mock.Mock()
+        self.subscriptions = {'msg1': self.event}
+        self.dispatcher.add_queue('queue1', self.subscriptions)
+        self.dispatcher.add_queue('queue2', {})
+
+    def _message(self, body):
+        return mock.Mock(body=body, id='id')
+
+    def test_single_thread(self):
+        self.spawn.assert_called_once_with(self.dispatcher._run)
+
+    def test_dispatch(self):
+        self.dispatcher._dispatch('queue2', self._message({
+            'SourceID': 'msg1'}))
+        self.assertFalse(self.event.send.called)
+        self.dispatcher._dispatch('queue1', self._message({
+            'SourceID': 'msg1'}))
+        self.event.send.assert_called_once_with({'SourceID': 'msg1'})
+        self.assertEqual({}, self.subscriptions)
+        self.dispatcher._dispatch('queue1', self._message(None))
+
+    def test_dispatch_unexpected_body(self):
+        for body in ('msg1', ['msg1'], 1):
+            self.dispatcher._dispatch('queue1', self._message(body))
+        self.assertFalse(self.event.send.called)
+        self.assertEqual({'msg1': self.event}, self.subscriptions)
+
+    @mock.patch.object(common, 'create_rmq_client')
+    def test_consume(self, create_client):
+        client = create_client.return_value.__enter__.return_value
+        subscription = client.open_multiplexed.return_value
+        subscription.queues = set()
+        subscription.add_queue.side_effect = \
+            lambda queue, callback: subscription.queues.add(queue)
+
+        def drain(timeout):
+            if len(subscription.queues) == 2:
+                self.dispatcher.remove_queue('queue2')
+                # queue that is removed on the next iteration
+                subscription.remove_queue.side_effect = \
+                    subscription.queues.discard
+            else:
+                self.dispatcher.remove_queue('queue1')
+
+        subscription.drain.side_effect = drain
+        self.dispatcher._consume()
+
+        create_client.assert_called_once_with()
+        self.assertEqual(
+            ['queue1', 'queue2'],
+            sorted(c[0][0] for c in client.declare.call_args_list))
+        subscription.remove_queue.assert_called_once_with('queue2')
+        self.assertEqual(2, subscription.drain.call_count)
+        subscription.flush.assert_called_once_with()
+
+
 class TestAgent(test_case.DslTestCase):
     def setUp(self):
         super(TestAgent, self).setUp()
@@ -95,3 +161,100 @@ class TestAgent(test_case.DslTestCase):
         self.assertRaises(exc.PolicyViolationException, a.send, {}, None)
         self.assertRaises(exc.PolicyViolationException, a.call_raw, {})
         self.assertRaises(exc.PolicyViolationException, a.send_raw, {})
+
+    @mock.patch.object(common, 'get_rmq_client')
+    def test_call_many_agents_contract(self, _):
+        self.override_config('disable_murano_agent', False, 'engine')
+        self.package_loader.load_package('io.murano', None).register_class(
+            resource_manager.ResourceManager)
+        with mock.patch('murano.dsl.dsl.MuranoObjectInterface.find_owner'):
+            a = self.runner.testAgent()
+        with mock.patch.object(agent.Agent, '_send_many') as send_many:
+            send_many.return_value = []
+            self.runner.testCallMany([a])
+            calls = send_many.call_args[0][0]
+            self.assertEqual([a.extension], [c[0] for c in calls])
+            self.assertRaises(
+                yaql_exceptions.ArgumentException,
+                self.runner.testCallMany, [a, self.runner.root])
+
+
+class TestAgentBatch(base.MuranoTestCase):
+    def setUp(self):
+        super(TestAgentBatch, self).setUp()
+        self.override_config('disable_murano_agent', False, 'engine')
+        get_client = mock.patch.object(common, 'get_rmq_client').start()
+        self.client = get_client.return_value.__enter__.return_value
+        self.addCleanup(mock.patch.stopall)
+        self.listener = mock.Mock()
+        environment = mock.MagicMock()
+        environment.__getitem__.return_value = lambda: self.listener
+        self.agents = []
+        for host_id in ('h1', 'h2', 'h3'):
+            host = mock.Mock(id=host_id)
+            host.find_owner.return_value = environment
+            self.agents.append(agent.Agent(host))
+
+    def _subscriptions(self):
+        return [c[0][0] for c in self.listener.subscribe.call_args_list]
+
+    def test_call_many(self):
+        events = {}
+        self.listener.subscribe.side_effect = \
+            lambda msg_id, event: events.setdefault(msg_id, event)
+
+        def send(message, key):
+            # agents answer only after all plans were sent
+            if len(self.client.send.call_args_list) < 3:
+                return
+            msg_ids = self._subscriptions()
+            events[msg_ids[0]].send({'FormatVersion': '2.0.0', 'Body': 1})
+            events[msg_ids[2]].send({
+                'FormatVersion': '2.0.0', 'ErrorCode': 1,
+                'Body': {'Message': 'failed'}})
+
+        self.client.send.side_effect = send
+        plans = [{'ID': 'p1'}, {'ID': 'p2'}, {'ID': 'p3'}]
+        calls = list(zip(self.agents, plans))
+        results = agent.Agent._send_many(calls, 0.01)
+
+        self.assertEqual(
+            [a._queue for a in self.agents],
+            [c[1]['key'] for c in self.client.send.call_args_list])
+        self.assertEqual({'result': 1, 'error': None}, results[0])
+        self.assertTrue(results[1]['error']['timeout'])
+        self.assertEqual('failed', results[2]['error']['message'])
+        self.listener.unsubscribe.assert_called_once_with(
+            self._subscriptions()[1])
+
+    def test_send_many_same_plan_id(self):
+        plan = {'ID': 'p1', 'Body': 'return 1'}
+        calls = [(a, plan) for a in self.agents]
+        agent.Agent._send_many(calls, 0)
+
+        msg_ids = self._subscriptions()
+        self.assertEqual(3, len(set(msg_ids)))
+        messages = [c[1]['message']
+                    for c in self.client.send.call_args_list]
+        self.assertEqual(msg_ids, [m.id for m in messages])
+        self.assertEqual(msg_ids, [m.body['ID'] for m in messages])
+        self.assertEqual({'ID': 'p1', 'Body': 'return 1'}, plan)
+
+    def test_send_failure(self):
+        self.client.send.side_effect = ValueError()
+        calls = list(zip(self.agents, [{'ID': 'p1'}, {'ID': 'p2'}]))
+        self.assertRaises(ValueError, agent.Agent._send_many, calls, 1)
+        self.assertEqual(
+            [mock.call(msg_id) for msg_id in self._subscriptions()],
+            self.listener.unsubscribe.call_args_list)
+
+    def test_plans_built_per_agent(self):
+        template = {'FormatVersion': '2.0.0', 'Scripts': {}}
+        agents = [mock.Mock(extension=a) for a in self.agents[:2]]
+        with mock.patch.object(agent.Agent, '_send_many') as send_many:
+            agent.Agent.call_many(agents, template, mock.Mock())
+        calls, timeout = send_many.call_args[0]
+        self.assertEqual(self.agents[:2], [a for a, _ in calls])
+        plan_ids = set(plan['ID'] for _, plan in calls)
+        self.assertEqual(2, len(plan_ids))
+        self.assertEqual(3600, timeout)
@@ -12,6 +12,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import mock
+
 from murano.tests.unit.dsl.foundation import object_model as om
 from murano.tests.unit.dsl.foundation import test_case
 
@@ -55,3 +57,14 @@ class TestConfigProperties(test_case.DslTestCase):
             [123, 'qq'],
             self.traces
         )
+
+    def test_config_read_once_per_class(self):
+        obj = om.Object('ConfigProperties')
+        self.package_loader.set_config_value(obj, 'cfgProperty', '987')
+        runner = self.new_runner(obj)
+        cls = runner.root.type
+        executor = runner.executor
+        with mock.patch.object(cls.package, 'get_class_config') as config:
+            new_obj = cls.new(None, executor.object_store, executor)(None)
+        self.assertFalse(config.called)
+        self.assertEqual(987, new_obj.get_property('cfgProperty'))
@@ -14,12 +14,21 @@
 
 import six
 
+from murano.dsl import constants
 from murano.dsl import dsl
 from murano.dsl import exceptions
+from murano.dsl import type_scheme
+from murano.dsl import yaql_expression
+from murano.tests.unit import base
 from murano.tests.unit.dsl.foundation import object_model as om
 from murano.tests.unit.dsl.foundation import test_case
 
 
+def _expr(expression):
+    return yaql_expression.YaqlExpression(
+        expression, constants.RUNTIME_VERSION_1_3)
+
+
 class TestContracts(test_case.DslTestCase):
     def setUp(self):
         super(TestContracts, self).setUp()
@@ -295,3 +304,30 @@ class TestContracts(test_case.DslTestCase):
     def test_default_expression(self):
         self.assertEqual('PROPERTY', self._runner.testDefaultExpression())
         self.assertEqual('value', self._runner.testDefaultExpression('value'))
+
+    def test_violation_path(self):
+        e = self.assertRaises(
+            exceptions.ContractViolationException,
+            self._runner.testListContract, [1, 'two'])
+        self.assertIn('(arg[1])', six.text_type(e))
+        e = self.assertRaises(
+            exceptions.ContractViolationException,
+            self._runner.testDictContract, {'A': 'a', 'B': 'b'})
+        self.assertIn("(arg['B'])", six.text_type(e))
+
+
+class TestCompiledContracts(base.MuranoTestCase):
+    def test_fast_path(self):
+        for expression in ('$.int()', '$.string().notNull()',
+                           '$.class(Foo)', '$.class(ns:Foo).owned()',
+                           '$.class(:Foo, Bar, null)', '$.bool()'):
+            self.assertIsNotNone(
+                type_scheme._compile_functions(_expr(expression)),
+                expression)
+
+    def test_yaql_fallback(self):
+        for expression in ('$.string().check($ in list(a, b))',
+                           '$.class($foo)', '$.int() + 1', '$x.int()'):
+            self.assertIsNone(
+                type_scheme._compile_functions(_expr(expression)),
+                expression)
@@ -0,0 +1,108 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import copy
+
+import mock
+
+from murano.dsl import executor
+from murano.dsl import object_store
+from murano.tests.unit.dsl.foundation import object_model as om
+from murano.tests.unit.dsl.foundation import test_case
+
+
+class TestGarbageCollection(test_case.DslTestCase):
+    def _node(self, name, **kwargs):
+        return om.Object('ModelLoading', name=name, **kwargs)
+
+    def _cleanup(self, objects, objects_copy):
+        objects = om.build_model(objects)
+        objects_copy = om.build_model(objects_copy)
+        runner = self.new_runner(objects)
+        del self.traces
+        runner.executor.cleanup({
+            'Objects': objects, 'ObjectsCopy': objects_copy})
+        return self.traces
+
+    def test_nothing_removed(self):
+        root = self._node('root', children=[self._node('a')])
+        self.assertEqual([], self._cleanup(root, copy.deepcopy(root)))
+
+    def test_removed_objects(self):
+        c = self._node('c')
+        b = self._node('b', ref=om.Ref(c))
+        a = self._node('a', children=[self._node('a1')])
+        d = self._node('d')
+        root = self._node('root', children=[a, b, c, d])
+        root_copy = copy.deepcopy(root)
+        root.data['children'] = [c, d]
+        traces = self._cleanup(root, root_copy)
+        # initializers and destructors see the complete model copy
+        self.assertEqual(['a1', 'a', 'c', 'b', 'd', 'root'], traces[:6])
+        self.assertEqual(
+            [('destroy', 'a'), ('destroy', 'a1'), ('destroy', 'b')],
+            traces[6:])
+
+    def test_removed_objects_without_destructor(self):
+        root = om.Object('GarbageCollection', items=[
+            om.Object('GarbageCollectionItem', name='x')])
+        root_copy = copy.deepcopy(om.build_model(root))
+        root.data['items'] = []
+        with mock.patch.object(object_store.ObjectStore, 'load',
+                               autospec=True,
+                               side_effect=object_store.ObjectStore.load
+                               ) as load:
+            self._cleanup(root, root_copy)
+        # only the current model is loaded
+        self.assertEqual(
+            1, len([args for args, kwargs in load.call_args_list
+                    if args[2] is None]))
+
+
+class TestMethodTracing(test_case.DslTestCase):
+    def setUp(self):
+        super(TestMethodTracing, self).setUp()
+        self._runner = self.new_runner(om.Object(
+            'SampleClass1', stringProperty='string',
+            classProperty=om.Object(
+                'SampleClass2', class2Property='string')))
+        self._method = self._runner.root.type.find_single_method(
+            'testTrace')
+        patcher = mock.patch.object(
+            executor.LOG, 'isEnabledFor', return_value=True)
+        self._is_enabled = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _new_executor(self, **kwargs):
+        return executor.MuranoDslExecutor(
+            self.package_loader, None, **kwargs)
+
+    def test_trace_disabled(self):
+        self._is_enabled.return_value = False
+        with mock.patch.object(executor.MuranoDslExecutor,
+                               '_log_method') as log_method:
+            self._runner.testTrace(123)
+        self.assertFalse(log_method.called)
+        self.assertEqual([123, 'string', 'string'], self.traces)
+
+    def test_sampling(self):
+        dsl_executor = self._new_executor(trace_sampling=3)
+        self.assertEqual(
+            [True, False, False, True, False],
+            [dsl_executor._is_traced(self._method) for _ in range(5)])
+
+    def test_method_patterns(self):
+        dsl_executor = self._new_executor(traced_methods=['*::testT*'])
+        self.assertTrue(dsl_executor._is_traced(self._method))
+        dsl_executor = self._new_executor(
+            traced_methods=['SampleClass2::*'])
+        self.assertFalse(dsl_executor._is_traced(self._method))
@@ -0,0 +1,108 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from yaql.language import utils
+
+from murano.dsl import constants
+from murano.dsl import expressions
+from murano.dsl import helpers
+from murano.dsl import lhs_expression
+from murano.dsl import macros
+from murano.dsl import murano_method  # noqa
+from murano.dsl import virtual_exceptions
+from murano.dsl import yaql_expression
+from murano.dsl import yaql_integration
+from murano.tests.unit import base
+
+
+def _expr(expression):
+    return yaql_expression.YaqlExpression(
+        expression, constants.RUNTIME_VERSION_1_3)
+
+
+class TestMacroDispatch(base.MuranoTestCase):
+    def test_candidates(self):
+        self.assertEqual(
+            (macros.IfMacro,),
+            expressions._get_macro_candidates(frozenset(['If', 'Then'])))
+        self.assertEqual(
+            (macros.WhileDoMacro,),
+            expressions._get_macro_candidates(frozenset(['While', 'Do'])))
+        self.assertEqual(
+            (virtual_exceptions.TryBlockMacro,),
+            expressions._get_macro_candidates(
+                frozenset(['Try', 'Catch', 'Finally'])))
+        self.assertEqual(
+            (), expressions._get_macro_candidates(frozenset(['Then'])))
+
+    def test_signature(self):
+        class Macro(object):
+            def __init__(self, Foo, Bar=None):
+                pass
+
+        class AnyMacro(object):
+            def __init__(self, Foo, **kwargs):
+                pass
+
+        self.assertEqual(
+            (frozenset(['Foo']), frozenset(['Foo', 'Bar'])),
+            expressions._get_macro_signature(Macro))
+        self.assertIsNone(expressions._get_macro_signature(AnyMacro))
+
+    def test_parse_expression(self):
+        self.assertIsInstance(
+            expressions.parse_expression({'If': _expr('$'), 'Then': []}),
+            macros.IfMacro)
+        self.assertIsInstance(
+            expressions.parse_expression({'Do': []}), macros.DoMacro)
+        self.assertRaises(
+            SyntaxError, expressions.parse_expression,
+            {'If': _expr('$'), 'Do': []})
+
+    def test_macro_constructor_checks(self):
+        # macros that reject their arguments are skipped
+        self.assertRaises(
+            SyntaxError, expressions.parse_expression,
+            {'While': True, 'Do': []})
+
+
+class TestCompileEvaluator(base.MuranoTestCase):
+    def test_constant(self):
+        evaluator = helpers.compile_evaluator({'a': [1, 2]})
+        result = evaluator(None)
+        self.assertEqual(utils.FrozenDict({'a': (1, 2)}), result)
+        self.assertIs(result, evaluator(None))
+
+    def test_expression(self):
+        expression = _expr('$')
+        self.assertIs(expression, helpers.compile_evaluator(expression))
+
+    def test_nested_expression(self):
+        evaluator = helpers.compile_evaluator([1, _expr('$')])
+        context = yaql_integration.create_context(
+            constants.RUNTIME_VERSION_1_3)
+        context['$'] = 2
+        self.assertEqual((1, 2), evaluator(context))
+        context['$'] = 3
+        self.assertEqual((1, 3), evaluator(context))
+
+
+class TestLhsExpression(base.MuranoTestCase):
+    def test_variable_target(self):
+        self.assertEqual(
+            '$foo', lhs_expression.LhsExpression(_expr('$foo'))._variable)
+        self.assertIsNone(
+            lhs_expression.LhsExpression(_expr('$foo.bar'))._variable)
+        self.assertIsNone(
+            lhs_expression.LhsExpression(_expr('$foo[0]'))._variable)
+        self.assertIsNone(
+            lhs_expression.LhsExpression(_expr('$'))._variable)
@@ -0,0 +1,86 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import eventlet
+import mock
+
+from murano.dsl import method_locks
+from murano.tests.unit import base
+from murano.tests.unit.dsl.foundation import object_model as om
+from murano.tests.unit.dsl.foundation import test_case
+
+
+class TestMethodLockManager(base.MuranoTestCase):
+    def setUp(self):
+        super(TestMethodLockManager, self).setUp()
+        self._locks = method_locks.MethodLockManager()
+
+    def test_reentrant(self):
+        self.assertTrue(self._locks.acquire('key', 'T1'))
+        self.assertFalse(self._locks.acquire('key', 'T1'))
+        self._locks.release('key')
+        self.assertFalse(self._locks.is_locked('key'))
+        self.assertEqual({}, self._locks.statistics)
+
+    def test_contention(self):
+        events = []
+
+        def worker(thread_id):
+            self._locks.acquire('key', thread_id, 'method')
+            events.append(('enter', thread_id))
+            eventlet.sleep(0.01)
+            events.append(('leave', thread_id))
+            self._locks.release('key')
+
+        pool = eventlet.GreenPool()
+        for thread_id in ('T1', 'T2', 'T3'):
+            pool.spawn(worker, thread_id)
+        pool.waitall()
+
+        for i in range(0, len(events), 2):
+            self.assertEqual('enter', events[i][0])
+            self.assertEqual(('leave', events[i][1]), events[i + 1])
+        stats = self._locks.statistics['method']
+        self.assertEqual(2, stats['waits'])
+        self.assertGreater(stats['wait_time'], 0)
+        self.assertFalse(self._locks.is_locked('key'))
+
+
+class TestExecutorLocks(test_case.DslTestCase):
+    def setUp(self):
+        super(TestExecutorLocks, self).setUp()
+        self._runner = self.new_runner(om.Object(
+            'SampleClass1', stringProperty='string',
+            classProperty=om.Object(
+                'SampleClass2', class2Property='string')))
+
+    def test_lock_free_methods(self):
+        locks = self._runner.executor.method_locks
+        with mock.patch.object(locks, 'acquire',
+                               wraps=locks.acquire) as acquire:
+            self.assertEqual('John Doe', self._runner.testAttributes('John'))
+        # setAttr and getAttr do not take locks
+        self.assertEqual(1, acquire.call_count)
+        self.assertEqual({}, self._runner.executor.lock_statistics)
+
+    def test_statistics_per_class_version(self):
+        locks = self._runner.executor.method_locks
+        for version in ('1.0.0', '2.0.0'):
+            method = mock.Mock()
+            method.name = 'deploy'
+            method.declaring_type.name = 'SampleClass1'
+            method.declaring_type.version = version
+            locks._waits[method] = [1, 0.5]
+        self.assertEqual(
+            {'SampleClass1/1.0.0::deploy': {'waits': 1, 'wait_time': 0.5},
+             'SampleClass1/2.0.0::deploy': {'waits': 1, 'wait_time': 0.5}},
+            self._runner.executor.lock_statistics)
@@ -12,6 +12,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import mock
+
+from murano.dsl import exceptions
+from murano.dsl import helpers
 from murano.tests.unit.dsl.foundation import object_model as om
 from murano.tests.unit.dsl.foundation import test_case
 
@@ -67,3 +71,93 @@ class TestMultipleInheritance(test_case.DslTestCase):
             ['CommonParent::virtualMethod', 'ParentClass2::virtualMethod',
              'CommonParent::virtualMethod', 'ParentClass2::virtualMethod'],
             self.traces)
+
+
+class TestMethodResolution(test_case.DslTestCase):
+    def setUp(self):
+        super(TestMethodResolution, self).setUp()
+        self._class = self._find_class('DerivedFrom2Classes')
+
+    def _find_class(self, name):
+        return self.package_loader.load_class_package(
+            name, None).find_class(name, False)
+
+    def test_resolution_is_cached(self):
+        with mock.patch.object(
+                self._class, '_choose_symbol',
+                wraps=self._class._choose_symbol) as choose_symbol:
+            method = self._class.find_single_method('virtualMethod')
+            self.assertIs(
+                method, self._class.find_single_method('virtualMethod'))
+            self.assertEqual('ParentClass2', method.declaring_type.name)
+            self.assertEqual(1, choose_symbol.call_count)
+
+    def test_ambiguous_method(self):
+        for name in ('ParentClass1', 'ParentClass2'):
+            self._find_class(name).add_method('ambiguousMethod', {})
+        for _ in range(2):
+            self.assertRaises(exceptions.AmbiguousMethodName,
+                              self._class.find_single_method,
+                              'ambiguousMethod')
+        self.assertEqual(2, len(self._class.find_method('ambiguousMethod')))
+
+    def test_tables_invalidated(self):
+        self.assertRaises(exceptions.NoMethodFound,
+                          self._class.find_single_method, 'newMethod')
+        parent = self._find_class('CommonParent')
+        method = parent.add_method('newMethod', {})
+        self.assertIs(method, self._class.find_single_method('newMethod'))
+        self.assertIn(method, self._class.find_methods(
+            lambda m: m.name == 'newMethod'))
+
+    def test_unrelated_changes_keep_tables(self):
+        method = self._class.find_single_method('virtualMethod')
+        self._find_class('SampleClass1').add_method('newMethod', {})
+        with mock.patch.object(
+                self._class, '_choose_symbol') as choose_symbol:
+            self.assertIs(
+                method, self._class.find_single_method('virtualMethod'))
+            self.assertFalse(choose_symbol.called)
+
+    def test_find_properties_by_name(self):
+        properties = self._class.find_properties_by_name('ambiguousProperty2')
+        self.assertEqual(
+            ['DerivedFrom2Classes', 'ParentClass1', 'ParentClass2'],
+            sorted(p.declaring_type.name for p in properties))
+        self.assertEqual((), self._class.find_properties_by_name('missing'))
+
+
+class TestCast(test_case.DslTestCase):
+    def setUp(self):
+        super(TestCast, self).setUp()
+        runner = self.new_runner(om.Object('DerivedFrom2Classes'))
+        self._obj = runner.root
+
+    def test_ancestors(self):
+        ancestors = self._obj.type.ancestors()
+        self.assertIs(ancestors, self._obj.type.ancestors())
+        self.assertEqual(
+            {'ParentClass1', 'ParentClass2', 'CommonParent',
+             'io.murano.Object'},
+            set(cls.name for cls in ancestors))
+        self.assertEqual(frozenset(ancestors), self._obj.type.ancestor_set)
+
+    def test_cast(self):
+        parent = helpers.cast(self._obj, 'CommonParent')
+        self.assertEqual('CommonParent', parent.type.name)
+        self.assertIs(parent, helpers.cast(self._obj, 'CommonParent'))
+        self.assertIn(('CommonParent', None), self._obj.type.cast_cache)
+        self.assertRaises(exceptions.NoClassFound,
+                          helpers.cast, self._obj, 'SampleClass1')
+
+    def test_is_instance_of(self):
+        with mock.patch.object(helpers, 'find_cast_target',
+                               wraps=helpers.find_cast_target) as find:
+            for _ in range(2):
+                self.assertTrue(
+                    helpers.is_instance_of(self._obj, 'ParentClass1'))
+                self.assertFalse(
+                    helpers.is_instance_of(self._obj, 'SampleClass1'))
+                self.assertFalse(
+                    helpers.is_instance_of(self._obj, 'ParentClass1', '>1'))
+            self.assertEqual(3, find.call_count)
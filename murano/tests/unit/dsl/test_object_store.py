@@ -0,0 +1,83 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from murano.dsl import exceptions
+from murano.tests.unit.dsl.foundation import object_model as om
+from murano.tests.unit.dsl.foundation import test_case
+
+
+def _node(name, **kwargs):
+    return om.Object('ModelLoading', name=name, **kwargs)
+
+
+class TestObjectStore(test_case.DslTestCase):
+    def test_children_initialized_first(self):
+        self.new_runner(_node('root', children=[
+            _node('a', children=[_node('b')]), _node('c')]))
+        self.assertEqual(['b', 'a', 'c', 'root'], self.traces)
+
+    def test_forward_reference(self):
+        b = _node('b')
+        runner = self.new_runner(_node('root', children=[
+            _node('a', ref=om.Ref(b)), b]))
+        self.assertEqual(['b', 'a', 'root'], self.traces)
+        a = runner.root.get_property('children')[0]
+        self.assertIs(runner.root.get_property('children')[1],
+                      a.get_property('ref'))
+        self.assertEqual('b', runner.on(a).testGetRefName())
+
+    def test_reference_cycle(self):
+        a = _node('a')
+        b = _node('b', ref=om.Ref(a))
+        a.data['ref'] = om.Ref(b)
+        self.new_runner(_node('root', children=[a, b]))
+        self.assertEqual(['b', 'a', 'root'], self.traces)
+
+    def test_reference_to_owner(self):
+        root = _node('root')
+        root.data['children'] = [_node('a', ref=om.Ref(root))]
+        runner = self.new_runner(root)
+        self.assertEqual(['a', 'root'], self.traces)
+        self.assertEqual('root', runner.on(
+            runner.root.get_property('children')[0]).testGetRefName())
+
+    def test_forward_reference_check(self):
+        b = _node('b')
+        self.new_runner(_node('root', children=[
+            _node('a', checked=om.Ref(b)), b]))
+        self.assertEqual(['b', 'a', 'root'], self.traces)
+
+    def test_forward_reference_check_nested(self):
+        b = _node('b')
+        self.new_runner(_node('root', children=[
+            _node('a', checked=om.Ref(b)), _node('c', children=[b])]))
+        self.assertEqual(['b', 'a', 'c', 'root'], self.traces)
+
+    def test_forward_reference_check_cycle(self):
+        a = _node('a')
+        b = _node('b', checked=om.Ref(a))
+        a.data['checked'] = om.Ref(b)
+        self.new_runner(_node('root', children=[a, b]))
+        self.assertEqual(['b', 'a', 'root'], self.traces)
+
+    def test_forward_reference_check_violated(self):
+        invalid = _node('invalid')
+        model = _node('root', children=[
+            _node('a', checked=om.Ref(invalid)), invalid])
+        self.assertRaises(exceptions.ContractViolationException,
+                          self.new_runner, model)
+        self.assertEqual([], self.traces)
+
+    def test_missing_reference(self):
+        model = _node('root', ref='missing')
+        self.assertRaises(exceptions.NoObjectFoundError,
+                          self.new_runner, model)
@@ -141,3 +141,21 @@ class TestResultsSerializer(test_case.DslTestCase):
                 'key6': [{'w': 'q'}]
             },
             serializer.serialize(result))
+
+    def test_references(self):
+        """Test that objects are serialized once and referenced by id"""
+
+        b = om.Object('ModelLoading', name='b')
+        a = om.Object('ModelLoading', name='a', ref=om.Ref(b))
+        runner = self.new_runner(
+            om.Object('ModelLoading', name='root', children=[a, b]))
+        serialized = runner.serialized_model
+        for name in ('Objects', 'ObjectsCopy'):
+            children = serialized[name]['children']
+            self.assertEqual(b.id, children[0]['ref'])
+            self.assertEqual(b.id, children[1]['?']['id'])
+            self.assertEqual('b', children[1]['name'])
+        self.assertIn('_actions', serialized['Objects']['?'])
+        self.assertNotIn('_actions', serialized['ObjectsCopy']['?'])
+        self.assertIsNot(serialized['Objects']['children'],
+                         serialized['ObjectsCopy']['children'])
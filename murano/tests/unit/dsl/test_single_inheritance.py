@@ -12,6 +12,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from murano.dsl import helpers
 from murano.tests.unit.dsl.foundation import object_model as om
 from murano.tests.unit.dsl.foundation import test_case
 
@@ -32,3 +33,15 @@ class TestSingleInheritance(test_case.DslTestCase):
              'SingleInheritanceChild::method2',
              'SingleInheritanceParent::method2'],
             self.traces)
+
+    def test_parts_created_lazily(self):
+        obj = self._runner.root
+        # none of the classes has properties or initializers
+        self.assertEqual(frozenset(), obj.type.initialized_types)
+        parent = helpers.cast(obj, 'SingleInheritanceParent')
+        self.assertIs(obj, parent.real_this)
+        self.assertIs(parent, helpers.cast(obj, 'SingleInheritanceParent'))
+        self.assertEqual(obj.object_id, parent.object_id)
+        sys_object = helpers.cast(obj, 'io.murano.Object')
+        self.assertIsNotNone(sys_object.extension)
+        self.assertFalse(hasattr(obj, '__dict__'))
@@ -0,0 +1,66 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from yaql.language import exceptions as yaql_exceptions
+
+from murano.dsl import constants
+from murano.dsl import yaql_expression
+from murano.dsl import yaql_integration
+from murano.tests.unit import base
+
+
+class TestParseCache(base.MuranoTestCase):
+    def setUp(self):
+        super(TestParseCache, self).setUp()
+        yaql_integration.PARSE_CACHE.clear()
+        self.addCleanup(yaql_integration.PARSE_CACHE.clear)
+
+    def test_statement_reused(self):
+        version = constants.RUNTIME_VERSION_1_3
+        first = yaql_integration.parse('$.foo + 1', version)
+        second = yaql_integration.parse('$.foo + 1', version)
+        self.assertIs(first, second)
+        self.assertEqual(1, yaql_integration.PARSE_CACHE.hits)
+        self.assertEqual(1, yaql_integration.PARSE_CACHE.misses)
+
+    def test_engines_are_not_mixed(self):
+        first = yaql_integration.parse(
+            '$.foo', constants.RUNTIME_VERSION_1_0)
+        second = yaql_integration.parse(
+            '$.foo', constants.RUNTIME_VERSION_1_3)
+        self.assertIsNot(first, second)
+        self.assertIs(first, yaql_integration.parse(
+            '$.foo', constants.RUNTIME_VERSION_1_1))
+
+    def test_parsing_errors_cached(self):
+        version = constants.RUNTIME_VERSION_1_3
+        errors = [
+            self.assertRaises(yaql_exceptions.YaqlParsingException,
+                              yaql_integration.parse, 'Hello, world!',
+                              version)
+            for _ in range(3)]
+        self.assertEqual(2, yaql_integration.PARSE_CACHE.hits)
+        # every hit raises a new exception equal to the original one
+        self.assertIsNot(errors[1], errors[2])
+        for error in errors[1:]:
+            self.assertIs(type(errors[0]), type(error))
+            self.assertEqual(
+                (errors[0].value, errors[0].position, errors[0].message),
+                (error.value, error.position, error.message))
+
+    def test_is_expression_parses_once(self):
+        version = constants.RUNTIME_VERSION_1_3
+        self.assertTrue(yaql_expression.YaqlExpression.is_expression(
+            '$.foo', version))
+        yaql_expression.YaqlExpression('$.foo', version)
+        self.assertEqual(1, yaql_integration.PARSE_CACHE.misses)
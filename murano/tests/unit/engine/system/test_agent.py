@@ -45,7 +45,7 @@ class TestExecutionPlan(base.MuranoTestCase):
         self.agent = agent.Agent(object_interface)
         self.resources = mock.Mock(spec=resource_manager.ResourceManager)
         self.resources.string.return_value = 'text'
-        self.uuids = ['ID1', 'ID2', 'ID3', 'ID4']
+        self.uuids = ['ID1', 'ID2', 'ID3', 'ID4', 'ID5', 'ID6', 'ID7']
         self.mock_uuid = self._stub_uuid(self.uuids)
         self.addCleanup(mock.patch.stopall)
 
@@ -97,6 +97,38 @@ class TestExecutionPlan(base.MuranoTestCase):
         template = self.agent.build_execution_plan(template, self.resources)
         self.assertEqual(self._get_app_with_files_in_template(), template)
 
+    def test_execution_plan_cached_per_package(self):
+        template = {
+            'FormatVersion': '2.0.0',
+            'Scripts': {
+                'deploy': {
+                    'Type': 'Application',
+                    'Version': '1.0.0',
+                    'EntryPoint': 'deploy.sh',
+                    'Files': ['common.sh']
+                }
+            },
+            'Parameters': {'name': 'host1'}
+        }
+        package = mock.Mock()
+        plan1 = self.agent.build_execution_plan(
+            template, self.resources, package)
+        self.assertEqual(2, self.resources.string.call_count)
+
+        template['Parameters']['name'] = 'host2'
+        plan2 = self.agent.build_execution_plan(
+            template, self.resources, package)
+        self.assertEqual(2, self.resources.string.call_count)
+        self.assertEqual('ID1', plan1['ID'])
+        self.assertEqual('ID4', plan2['ID'])
+        self.assertEqual({'name': 'host2'}, plan2['Parameters'])
+        self.assertEqual(plan1['Files'], plan2['Files'])
+        self.assertEqual(plan1['Scripts'], plan2['Scripts'])
+        self.assertIsNot(plan1['Files'], plan2['Files'])
+
+        self.agent.build_execution_plan(template, self.resources, mock.Mock())
+        self.assertEqual(4, self.resources.string.call_count)
+
     def _get_application(self):
         return {
             'Action': 'Execute',
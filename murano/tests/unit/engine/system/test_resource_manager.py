@@ -0,0 +1,84 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import shutil
+import tempfile
+
+import mock
+
+from murano.engine.system import resource_manager
+from murano.tests.unit import base
+
+ResourceManager = resource_manager.ResourceManager
+
+
+class TestResourceManager(base.MuranoTestCase):
+    def setUp(self):
+        super(TestResourceManager, self).setUp()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        package = mock.Mock()
+        package.get_resource.side_effect = lambda name: os.path.join(
+            self.directory, name)
+        patcher = mock.patch.object(
+            ResourceManager, '_get_package', return_value=package)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(resource_manager.resource_cache.clear)
+        resource_manager.resource_cache.clear()
+
+    def _write(self, name, text):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+
+    def test_string_cached(self):
+        self._write('file.txt', 'text')
+        with mock.patch('murano.engine.system.resource_manager.open',
+                        mock.mock_open(read_data='text'),
+                        create=True) as mock_open:
+            self.assertEqual('text', ResourceManager.string(None, 'file.txt'))
+            self.assertEqual('text', ResourceManager.string(None, 'file.txt'))
+        self.assertEqual(1, mock_open.call_count)
+
+    def test_modified_file_reloaded(self):
+        path = self._write('file.txt', 'text')
+        self.assertEqual('text', ResourceManager.string(None, 'file.txt'))
+        self._write('file.txt', 'new text')
+        os.utime(path, (0, 0))
+        self.assertEqual('new text', ResourceManager.string(None, 'file.txt'))
+
+    def test_parsed_values_copied(self):
+        self._write('file.yaml', 'key: [1, 2]')
+        self._write('file.json', '{"key": [1, 2]}')
+        for method in (ResourceManager.yaml, ResourceManager.json):
+            name = 'file.' + method.__name__
+            value = method(None, name)
+            self.assertEqual({'key': [1, 2]}, value)
+            value['key'].append(3)
+            self.assertEqual({'key': [1, 2]}, method(None, name))
+
+    def test_json_parsed_on_every_call(self):
+        self._write('file.json', '{"key": "value"}')
+        self.assertEqual(
+            {'key': 'value'}, ResourceManager.json(None, 'file.json'))
+        # only the text of the file is cached
+        self.assertEqual(1, len(resource_manager.resource_cache))
+
+    def test_cache_disabled(self):
+        self.override_config('resource_cache_size', 0, 'packages_opts')
+        self._write('file.yaml', 'key: value')
+        self.assertEqual(
+            {'key': 'value'}, ResourceManager.yaml(None, 'file.yaml'))
+        self.assertEqual(0, len(resource_manager.resource_cache))
@@ -10,6 +10,9 @@
 #  License for the specific language governing permissions and limitations
 #  under the License.
 
+import base64
+import copy
+import hashlib
 import os
 import shutil
 import tempfile
@@ -19,8 +22,12 @@ from oslo_config import cfg
 import semantic_version
 import testtools
 
+from murano.api.v1 import catalog
+from murano.dsl import exceptions
 from murano.dsl import murano_package as dsl_package
+from murano.engine import compiled_classes
 from murano.engine import package_loader
+from murano.packages import exceptions as pkg_exc
 from murano.tests.unit import base
 from murano_tempest_tests import utils
 
@@ -65,8 +72,9 @@ class TestPackageCache(base.MuranoTestCase):
 
         self.murano_client.packages.filter = mock.MagicMock(
             return_value=[package])
-        self.murano_client.packages.download = mock.MagicMock(
-            return_value=package_data)
+        response = mock.MagicMock(status_code=200, headers={})
+        response.iter_content.return_value = [package_data]
+        self.murano_client.http_client.request.return_value = response
 
         # load the package
         self.loader.load_class_package(fqn, spec)
@@ -82,7 +90,7 @@ class TestPackageCache(base.MuranoTestCase):
             self.location, fqn, package.version, first_id, 'manifest.yaml')))
 
         # assert, that we called download
-        self.assertEqual(self.murano_client.packages.download.call_count, 1)
+        self.assertEqual(self.murano_client.http_client.request.call_count, 1)
 
         # now that the cache is in place, call it for the 2d time
         self.loader._package_cache = {}
@@ -90,7 +98,7 @@ class TestPackageCache(base.MuranoTestCase):
         self.loader.load_class_package(fqn, spec)
 
         # check that we didn't download a thing
-        self.assertEqual(self.murano_client.packages.download.call_count, 1)
+        self.assertEqual(self.murano_client.http_client.request.call_count, 1)
 
         # changing id, new package would be downloaded.
         package.id = second_id
@@ -99,7 +107,7 @@ class TestPackageCache(base.MuranoTestCase):
         self.loader.load_class_package(fqn, spec)
 
         # check that we didn't download a thing
-        self.assertEqual(self.murano_client.packages.download.call_count, 2)
+        self.assertEqual(self.murano_client.http_client.request.call_count, 2)
 
         # check that old directories were not deleted
         # we did not call cleanup and did not release the locks
@@ -131,7 +139,7 @@ class TestPackageCache(base.MuranoTestCase):
         self.loader.load_class_package(fqn, spec)
 
         # check that we didn't download a thing
-        self.assertEqual(self.murano_client.packages.download.call_count, 3)
+        self.assertEqual(self.murano_client.http_client.request.call_count, 3)
 
         # check that old directories were *deleted*
         self.assertFalse(os.path.isdir(os.path.join(
@@ -145,6 +153,233 @@ class TestPackageCache(base.MuranoTestCase):
         self.assertTrue(os.path.isfile(os.path.join(
             self.location, fqn, package.version, third_id, 'manifest.yaml')))
 
+    def _prepare_download(self, fqn='io.murano.apps.test', md5=None,
+                          corrupt=False):
+        path, name = utils.compose_package(
+            'test',
+            os.path.join(self.location, 'manifest.yaml'),
+            self.location, archive_dir=self.location)
+        with open(path, 'rb') as f:
+            package_data = f.read()
+        if md5 is None:
+            # take the headers the API actually sends with the archive
+            api_response = catalog.create_resource().serializer.serialize(
+                package_data, 'application/octet-stream', 'download')
+            headers = dict(api_response.headers)
+            self.assertEqual(
+                base64.b64encode(
+                    hashlib.md5(package_data).digest()).decode('ascii'),
+                headers['Content-MD5'])
+        elif md5:
+            headers = {'Content-MD5': md5}
+        else:
+            headers = {}
+        if corrupt:
+            # trailing garbage keeps the archive readable, so only the
+            # checksum can tell that it was damaged in transit
+            package_data += b'\0'
+        response = mock.MagicMock(status_code=200, headers=headers)
+        response.iter_content.return_value = [
+            package_data[:100], package_data[100:]]
+        self.murano_client.http_client.request.return_value = response
+
+        package = mock.MagicMock()
+        package.fully_qualified_name = fqn
+        package.id = '123'
+        package.version = '0.0.1'
+        return package
+
+    @testtools.skipIf(os.name == 'nt', "Doesn't work on Windows")
+    def test_download_checksum_verified(self):
+        package = self._prepare_download()
+        app_package = self.loader._get_package_by_definition(package)
+        self.assertTrue(os.path.isfile(os.path.join(
+            app_package.source_directory, 'manifest.yaml')))
+
+        package = self._prepare_download(md5='wrong')
+        package.id = '456'
+        self.assertRaises(pkg_exc.PackageLoadError,
+                          self.loader._get_package_by_definition, package)
+
+    @testtools.skipIf(os.name == 'nt', "Doesn't work on Windows")
+    def test_download_checksum_mismatch(self):
+        package = self._prepare_download(corrupt=True)
+        self.assertRaises(pkg_exc.PackageLoadError,
+                          self.loader._get_package_by_definition, package)
+        self.assertFalse(os.path.exists(os.path.join(
+            self.location, package.fully_qualified_name, package.version,
+            package.id)))
+
+    @testtools.skipIf(os.name == 'nt', "Doesn't work on Windows")
+    def test_download_without_checksum(self):
+        package = self._prepare_download(md5='', corrupt=True)
+        app_package = self.loader._get_package_by_definition(package)
+        self.assertTrue(os.path.isfile(os.path.join(
+            app_package.source_directory, 'manifest.yaml')))
+
+    @testtools.skipIf(os.name == 'nt', "Doesn't work on Windows")
+    def test_identical_archives_shared(self):
+        package = self._prepare_download()
+        first = self.loader._get_package_by_definition(package)
+        first_stat = os.stat(os.path.join(
+            first.source_directory, 'manifest.yaml'))
+        os.mkdir(os.path.join(first.source_directory, '.compiled'))
+
+        package.id = '456'
+        second = self.loader._get_package_by_definition(package)
+        self.assertNotEqual(first.source_directory, second.source_directory)
+        second_stat = os.stat(os.path.join(
+            second.source_directory, 'manifest.yaml'))
+        self.assertEqual(first_stat.st_ino, second_stat.st_ino)
+        self.assertFalse(os.path.exists(os.path.join(
+            second.source_directory, '.compiled')))
+
+    @testtools.skipIf(os.name == 'nt', "Doesn't work on Windows")
+    def test_archive_compiled_classes_removed(self):
+        artifacts = os.path.join(self.location, '.compiled')
+        os.mkdir(artifacts)
+        with open(os.path.join(artifacts, 'MyTest.pickle'), 'w') as f:
+            f.write('payload')
+        package = self._prepare_download()
+        app_package = self.loader._get_package_by_definition(package)
+        self.assertFalse(os.path.exists(os.path.join(
+            app_package.source_directory, '.compiled')))
+        self.assertEqual(
+            '123', self.loader._get_cached_package_id(app_package))
+
+
+class TestPackageDefinitions(base.MuranoTestCase):
+    def setUp(self):
+        super(TestPackageDefinitions, self).setUp()
+        package_loader.definitions_cache.clear()
+        self.addCleanup(package_loader.definitions_cache.clear)
+        self.execution_session = mock.MagicMock(project_id='tenant')
+        self.loader = package_loader.ApiPackageLoader(self.execution_session)
+        self.addCleanup(self.loader.cleanup)
+        client_patcher = mock.patch.object(
+            package_loader.ApiPackageLoader, 'client')
+        self.client = client_patcher.start()
+        self.addCleanup(client_patcher.stop)
+        self.spec = semantic_version.Spec('*')
+
+    def _package(self, name, classes, owner='tenant'):
+        return mock.MagicMock(
+            fully_qualified_name=name, class_definitions=classes,
+            owner_id=owner, is_public=True)
+
+    def test_definition_cached(self):
+        package = self._package('foo', ['foo.Foo'])
+        self.client.packages.filter.return_value = [package]
+        filter_opts = {'class_name': 'foo.Foo', 'version': []}
+        self.assertIs(package, self.loader._get_definition(
+            dict(filter_opts)))
+        self.assertIs(package, self.loader._get_definition(
+            dict(filter_opts)))
+        self.assertEqual(1, self.client.packages.filter.call_count)
+
+    def test_definition_cache_scoped_by_tenant(self):
+        self.client.packages.filter.return_value = [
+            self._package('foo', ['foo.Foo'])]
+        filter_opts = {'class_name': 'foo.Foo', 'version': []}
+        self.loader._get_definition(dict(filter_opts))
+        self.execution_session.project_id = 'other_tenant'
+        self.loader._get_definition(dict(filter_opts))
+        self.assertEqual(2, self.client.packages.filter.call_count)
+
+    def test_definition_cache_disabled(self):
+        CONF.set_override('package_definitions_ttl', 0, 'packages_opts')
+        self.addCleanup(CONF.clear_override, 'package_definitions_ttl',
+                        'packages_opts')
+        self.client.packages.filter.return_value = [
+            self._package('foo', ['foo.Foo'])]
+        filter_opts = {'class_name': 'foo.Foo', 'version': []}
+        self.loader._get_definition(dict(filter_opts))
+        self.loader._get_definition(dict(filter_opts))
+        self.assertEqual(2, self.client.packages.filter.call_count)
+
+    def test_resolve_class_definitions(self):
+        foo = self._package('foo', ['foo.Foo', 'foo.Bar'])
+        foo_private = self._package('foo', ['foo.Foo'], owner='other')
+        baz = self._package('baz', ['baz.Baz'])
+        self.client.packages.filter.side_effect = [
+            [foo_private, foo, baz], []]
+        result = self.loader.resolve_class_definitions({
+            'foo.Foo': self.spec,
+            'foo.Bar': self.spec,
+            'baz.Baz': self.spec,
+            'qux.Qux': self.spec
+        })
+        self.assertEqual(
+            {'foo.Foo': foo, 'foo.Bar': foo, 'baz.Baz': baz}, result)
+        self.client.packages.filter.assert_has_calls([
+            mock.call(class_name=['baz.Baz', 'foo.Bar', 'foo.Foo',
+                                  'qux.Qux'], catalog=True),
+            mock.call(class_name='qux.Qux', version=['ge:0.0.0'],
+                      catalog=True)])
+
+        self.client.packages.filter.reset_mock()
+        self.assertIs(foo, self.loader._get_definition(
+            self.loader._get_class_filter('foo.Foo', self.spec)))
+        self.assertFalse(self.client.packages.filter.called)
+
+
+class TestPrefetch(base.MuranoTestCase):
+    def setUp(self):
+        super(TestPrefetch, self).setUp()
+        package_loader.definitions_cache.clear()
+        self.addCleanup(package_loader.definitions_cache.clear)
+        self.loader = package_loader.ApiPackageLoader(
+            mock.MagicMock(project_id='tenant'))
+        self.addCleanup(self.loader.cleanup)
+        for name in ('resolve_class_definitions', '_get_definition',
+                     '_lock_usage', '_get_package_by_definition',
+                     '_to_dsl_package'):
+            patcher = mock.patch.object(self.loader, name)
+            setattr(self, name.lstrip('_'), patcher.start())
+            self.addCleanup(patcher.stop)
+        self.spec = semantic_version.Spec('*')
+
+    def test_prefetch(self):
+        foo = mock.MagicMock(id='foo')
+        bar = mock.MagicMock(id='bar')
+        self.resolve_class_definitions.return_value = {
+            'foo.Foo': foo, 'foo.Bar': foo}
+        self.get_definition.return_value = bar
+        self.get_package_by_definition.side_effect = lambda d: d.id
+
+        self.loader.prefetch({'foo.Foo': self.spec, 'foo.Bar': self.spec},
+                             {'bar': self.spec})
+
+        self.resolve_class_definitions.assert_called_once_with(
+            {'foo.Foo': self.spec, 'foo.Bar': self.spec})
+        self.assertEqual(2, self.lock_usage.call_count)
+        self.assertEqual(2, self.get_package_by_definition.call_count)
+        self.assertEqual(
+            ['bar', 'foo'],
+            sorted(c[0][0] for c in self.to_dsl_package.call_args_list))
+
+    def test_prefetch_skips_loaded_and_failed(self):
+        loaded = mock.MagicMock(version=semantic_version.Version('1.0.0'))
+        self.loader._class_cache['foo.Foo'] = {loaded.version: loaded}
+        self.resolve_class_definitions.return_value = {
+            'foo.Bar': mock.MagicMock(id='foo')}
+        self.get_package_by_definition.side_effect = \
+            pkg_exc.PackageLoadError('error')
+
+        self.loader.prefetch({'foo.Foo': self.spec, 'foo.Bar': self.spec},
+                             {})
+
+        self.resolve_class_definitions.assert_called_once_with(
+            {'foo.Bar': self.spec})
+        self.assertFalse(self.to_dsl_package.called)
+
+    def test_prefetch_disabled(self):
+        CONF.set_override('prefetch_pool_size', 0, 'packages_opts')
+        self.addCleanup(CONF.clear_override, 'prefetch_pool_size',
+                        'packages_opts')
+        self.loader.prefetch({'foo.Foo': self.spec}, {})
+        self.assertFalse(self.resolve_class_definitions.called)
+
 
 class TestCombinedPackageLoader(base.MuranoTestCase):
     @classmethod
@@ -194,3 +429,192 @@ class TestCombinedPackageLoader(base.MuranoTestCase):
 
         self.api_loader.load_class_package.assert_called_with(
             self.api_pkg_name, spec)
+
+
+class TestDirectoryPackageLoader(base.MuranoTestCase):
+    def setUp(self):
+        super(TestDirectoryPackageLoader, self).setUp()
+        self.location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.location)
+        self.addCleanup(package_loader.directory_indexes.clear)
+        self.package_dir = os.path.join(self.location, 'MyTest')
+        shutil.copytree(os.path.join(os.path.dirname(__file__), 'meta'),
+                        self.package_dir)
+        self.spec = semantic_version.Spec('*')
+
+    def _set_version(self, version):
+        manifest = os.path.join(self.package_dir, 'manifest.yaml')
+        with open(manifest) as f:
+            contents = f.read()
+        with open(manifest, 'w') as f:
+            f.write(contents + 'Version: {0}\n'.format(version))
+
+    def test_index_shared(self):
+        first = package_loader.DirectoryPackageLoader(self.location)
+        second = package_loader.DirectoryPackageLoader(self.location)
+        self.assertIs(first._indexed_by_name, second._indexed_by_name)
+
+        first_package = first.load_package('io.murano.test.MyTest', self.spec)
+        second_package = second.load_class_package(
+            'io.murano.test.MyTest', self.spec)
+        self.assertIsInstance(first_package, dsl_package.MuranoPackage)
+        self.assertIsNot(first_package, second_package)
+        self.assertIs(first_package.application_package,
+                      second_package.application_package)
+        self.assertIs(first_package, first.load_class_package(
+            'io.murano.test.MyTest', self.spec))
+
+    def test_unchanged_packages_not_reloaded(self):
+        package_loader.DirectoryPackageLoader(self.location)
+        with mock.patch('murano.packages.load_utils.load_from_dir') as load:
+            package_loader.DirectoryPackageLoader(self.location)
+            self.assertFalse(load.called)
+
+    def test_modified_package_reloaded(self):
+        loader = package_loader.DirectoryPackageLoader(self.location)
+        self._set_version('2.0.0')
+        new_loader = package_loader.DirectoryPackageLoader(self.location)
+        self.assertEqual('0.0.0', str(loader.load_package(
+            'io.murano.test.MyTest', self.spec).version))
+        self.assertEqual('2.0.0', str(new_loader.load_package(
+            'io.murano.test.MyTest', self.spec).version))
+
+    def test_class_edited_in_place_reloaded(self):
+        loader = package_loader.DirectoryPackageLoader(self.location)
+        package = loader.load_package('io.murano.test.MyTest', self.spec)
+        classes_dir = os.path.join(self.package_dir, 'Classes')
+        dir_stat = os.stat(classes_dir)
+        with open(os.path.join(classes_dir, 'Mytest.yaml'), 'a') as f:
+            f.write('\n# edited\n')
+        os.utime(classes_dir, (dir_stat.st_atime, dir_stat.st_mtime))
+
+        new_loader = package_loader.DirectoryPackageLoader(self.location)
+        new_package = new_loader.load_package(
+            'io.murano.test.MyTest', self.spec)
+        self.assertIsNot(package.application_package,
+                         new_package.application_package)
+
+    def test_removed_package(self):
+        package_loader.DirectoryPackageLoader(self.location)
+        shutil.rmtree(self.package_dir)
+        loader = package_loader.DirectoryPackageLoader(self.location)
+        self.assertRaises(exceptions.NoPackageFound, loader.load_package,
+                          'io.murano.test.MyTest', self.spec)
+
+    def test_refresh_interval(self):
+        CONF.set_override('load_packages_from_refresh_interval', 3600,
+                          'packages_opts')
+        self.addCleanup(CONF.clear_override,
+                        'load_packages_from_refresh_interval',
+                        'packages_opts')
+        package_loader.DirectoryPackageLoader(self.location)
+        self._set_version('2.0.0')
+        loader = package_loader.DirectoryPackageLoader(self.location)
+        self.assertEqual('0.0.0', str(loader.load_package(
+            'io.murano.test.MyTest', self.spec).version))
+
+
+class TestClassCache(base.MuranoTestCase):
+    def setUp(self):
+        super(TestClassCache, self).setUp()
+        package_loader.class_cache.clear()
+        self.addCleanup(package_loader.class_cache.clear)
+        self.package = mock.MagicMock()
+        self.package.runtime_version = '1.0'
+        self.package.get_class.return_value = (
+            'Name: io.murano.test.MyTest', '/tmp/MyTest.yaml')
+
+    def test_class_parsed_once(self):
+        first = package_loader.get_class(self.package, 'MyTest')
+        second = package_loader.get_class(self.package, 'MyTest')
+        self.assertIs(first, second)
+        self.assertEqual(1, package_loader.class_cache.misses)
+        self.assertEqual(1, package_loader.class_cache.hits)
+
+    def test_changed_contents_are_reparsed(self):
+        first = package_loader.get_class(self.package, 'MyTest')
+        self.package.get_class.return_value = (
+            'Name: io.murano.test.MyTest2', '/tmp/MyTest.yaml')
+        second = package_loader.get_class(self.package, 'MyTest')
+        self.assertIsNot(first, second)
+        self.assertEqual('io.murano.test.MyTest2', second[0]['Name'])
+
+    def test_cache_disabled(self):
+        CONF.set_override('class_cache_size', 0, 'packages_opts')
+        self.addCleanup(CONF.clear_override, 'class_cache_size',
+                        'packages_opts')
+        first = package_loader.get_class(self.package, 'MyTest')
+        second = package_loader.get_class(self.package, 'MyTest')
+        self.assertIsNot(first, second)
+
+    @mock.patch('murano.dsl.murano_type.create')
+    def test_cached_class_not_modified(self, create):
+        data = [{'Namespaces': {'=': 'io.murano.test'}, 'Name': 'Other'},
+                {'Properties': {}}]
+        data_copy = copy.deepcopy(data)
+        loader = mock.Mock()
+        for _ in range(2):
+            package = dsl_package.MuranoPackage(loader, 'io.murano.test')
+            package.register_class(data, 'io.murano.test.MyTest')
+            package.find_class('io.murano.test.MyTest', False)
+            self.assertEqual(data_copy, data)
+            self.assertEqual({'Namespaces': {'=': 'io.murano.test'},
+                              'Name': 'Other'},
+                             package._load_queue['io.murano.test.Other'])
+        self.assertEqual(
+            ['io.murano.test.MyTest'] * 2,
+            [c[0][2] for c in create.call_args_list])
+
+    def test_compiled_class_reused(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.package.get_class.return_value = (
+            'Name: io.murano.test.MyTest\nValue: $.x + 1', '/tmp/MyTest.yaml')
+        first = package_loader.get_class(
+            self.package, 'MyTest', directory, '123')
+        self.assertTrue(os.path.isfile(
+            compiled_classes.get_path(directory, '123', 'MyTest')))
+
+        package_loader.class_cache.clear()
+        with mock.patch('murano.engine.yaql_yaml_loader.get_loader') as gl:
+            second = package_loader.get_class(
+                self.package, 'MyTest', directory, '123')
+            self.assertFalse(gl.called)
+        self.assertEqual(first[0]['Name'], second[0]['Name'])
+        self.assertEqual(first[0].source_file_position.file_path,
+                         second[0].source_file_position.file_path)
+        self.assertEqual(3, second[0]['Value']._parsed_expression.evaluate(
+            data={'x': 2}))
+
+    def test_stale_compiled_class_ignored(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        package_loader.get_class(self.package, 'MyTest', directory, '123')
+
+        package_loader.class_cache.clear()
+        self.package.get_class.return_value = (
+            'Name: io.murano.test.MyTest2', '/tmp/MyTest.yaml')
+        result = package_loader.get_class(
+            self.package, 'MyTest', directory, '123')
+        self.assertEqual('io.murano.test.MyTest2', result[0]['Name'])
+
+    def test_unsigned_compiled_class_not_loaded(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        package_loader.get_class(self.package, 'MyTest', directory, '123')
+        path = compiled_classes.get_path(directory, '123', 'MyTest')
+        with open(path, 'rb') as f:
+            contents = f.read()
+        with open(path, 'wb') as f:
+            f.write(b'0' * 32 + contents[32:])
+
+        package_loader.class_cache.clear()
+        with mock.patch('six.moves.cPickle.Unpickler') as unpickler:
+            result = package_loader.get_class(
+                self.package, 'MyTest', directory, '123')
+            self.assertFalse(unpickler.called)
+        self.assertEqual('io.murano.test.MyTest', result[0]['Name'])
+
+    def test_compiled_class_path(self):
+        path = compiled_classes.get_path('/cache', '123', '../../MyTest')
+        self.assertEqual('/cache/123', os.path.dirname(path))
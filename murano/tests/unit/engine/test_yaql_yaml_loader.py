@@ -0,0 +1,64 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from murano.dsl import dsl_types
+from murano.engine import yaql_yaml_loader
+from murano.tests.unit import base
+
+CONTENTS = u"""
+Name: Foo
+Methods:
+  bar:
+    Body:
+      - Return: $.x + 1
+      - !yaql "1"
+---
+"""
+
+
+class TestYaqlYamlLoader(base.MuranoTestCase):
+    def setUp(self):
+        super(TestYaqlYamlLoader, self).setUp()
+        self.load = yaql_yaml_loader.get_loader('1.3')
+
+    def test_loader_is_memoized(self):
+        self.assertIs(self.load, yaql_yaml_loader.get_loader('1.3'))
+
+    def test_empty_documents_skipped(self):
+        self.assertEqual(1, len(self.load(CONTENTS, 'foo.yaml')))
+
+    def test_positions(self):
+        data = self.load(CONTENTS, 'foo.yaml')[0]
+        position = data.source_file_position
+        self.assertEqual('foo.yaml', position.file_path)
+        self.assertEqual(2, position.start_line)
+        self.assertEqual(1, position.start_column)
+
+        body = data['Methods']['bar']['Body']
+        expr = body[0]['Return']
+        self.assertIsInstance(expr, dsl_types.YaqlExpression)
+        self.assertEqual('$.x + 1', expr.expression)
+        self.assertEqual(6, expr.source_file_position.start_line)
+        self.assertEqual(17, expr.source_file_position.start_column)
+        self.assertIsInstance(body[1], dsl_types.YaqlExpression)
+
+    def test_file_id_not_shared(self):
+        first = self.load(CONTENTS, 'foo.yaml')[0]
+        second = self.load(CONTENTS, 'bar.yaml')[0]
+        self.assertEqual('foo.yaml', first.source_file_position.file_path)
+        self.assertEqual('bar.yaml', second.source_file_position.file_path)
+
+    def test_plain_strings(self):
+        data = self.load(u'Name: Hello, world!\nVersion: 1.0', 'foo.yaml')[0]
+        self.assertEqual('Hello, world!', data['Name'])
+        self.assertEqual(1.0, data['Version'])
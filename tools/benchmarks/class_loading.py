@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measures parsing of MuranoPL class files.
+
+Compares pure-Python and libyaml based loaders on the core library
+classes (meta/io.murano/Classes by default):
+
+    python tools/benchmarks/class_loading.py [--rounds N] [path]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+
+import yaml
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from murano.dsl import yaql_integration  # noqa
+from murano.engine import compiled_classes  # noqa
+from murano.engine import yaql_yaml_loader  # noqa
+
+ROOT = os.path.join(os.path.dirname(__file__), '..', '..')
+
+
+def read_classes(path):
+    result = []
+    for dir_path, _, file_names in os.walk(path):
+        for file_name in sorted(file_names):
+            if not file_name.endswith('.yaml'):
+                continue
+            file_path = os.path.join(dir_path, file_name)
+            with open(file_path) as stream:
+                result.append((stream.read(), file_path))
+    return result
+
+
+def dump_positions(data):
+    position = getattr(data, 'source_file_position', None)
+    if position is not None:
+        # libyaml ends block mappings at the next token rather than at the
+        # last value, so only start positions are expected to match
+        yield position.start_line, position.start_column
+    if isinstance(data, dict):
+        for key, value in sorted(data.items(), key=lambda t: str(t[0])):
+            for t in dump_positions(key):
+                yield t
+            for t in dump_positions(value):
+                yield t
+    elif isinstance(data, list):
+        for item in data:
+            for t in dump_positions(item):
+                yield t
+
+
+def measure(name, loader, classes, rounds, cold):
+    def run():
+        if cold:
+            yaql_integration.PARSE_CACHE.clear()
+        for contents, file_id in classes:
+            loader(contents, file_id)
+
+    run()
+    best = min(timeit.repeat(run, number=1, repeat=rounds))
+    print('{0:<40} {1:8.2f} ms'.format(name, best * 1000))
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('path', nargs='?', default=os.path.join(
+        ROOT, 'meta', 'io.murano', 'Classes'))
+    parser.add_argument('--rounds', type=int, default=10)
+    parser.add_argument('--version', default='1.3')
+    args = parser.parse_args()
+
+    classes = read_classes(args.path)
+    py_loader = yaql_yaml_loader.get_loader(args.version, yaml.Loader)
+    loader = yaql_yaml_loader.get_loader(args.version)
+    print('{0} files, base loader: {1}'.format(
+        len(classes), yaql_yaml_loader.base_loader.__name__))
+
+    for contents, file_id in classes:
+        expected = list(dump_positions(py_loader(contents, file_id)))
+        actual = list(dump_positions(loader(contents, file_id)))
+        if expected != actual:
+            print('Source positions differ in {0}'.format(file_id))
+            return 1
+
+    for cold in (True, False):
+        suffix = 'cold' if cold else 'warm'
+        base = measure('yaml.Loader, {0} parse cache'.format(suffix),
+                       py_loader, classes, args.rounds, cold)
+        best = measure('{0}, {1} parse cache'.format(
+            yaql_yaml_loader.base_loader.__name__, suffix),
+            loader, classes, args.rounds, cold)
+        if cold:
+            cold_best = best
+        print('speedup: {0:.2f}x'.format(base / best))
+
+    directory = tempfile.mkdtemp()
+    try:
+        def get_artifact(file_id):
+            header = compiled_classes.get_header(
+                file_id, file_id, args.version, None)
+            return compiled_classes.get_path(
+                directory, 'benchmark', file_id), header
+
+        for contents, file_id in classes:
+            path, header = get_artifact(file_id)
+            compiled_classes.save(
+                directory, path, header, loader(contents, file_id))
+
+        def load_compiled(contents, file_id):
+            return compiled_classes.load(directory, *get_artifact(file_id))
+
+        best = measure('compiled classes', load_compiled, classes,
+                       args.rounds, False)
+        print('speedup over cold {0}: {1:.2f}x'.format(
+            yaql_yaml_loader.base_loader.__name__, cold_best / best))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
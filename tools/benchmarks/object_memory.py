@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measures memory retained by a loaded object model.
+
+Loads synthetic object models of the given sizes whose classes inherit
+from a diamond of stateless and stateful parents and reports memory held
+by the loaded objects:
+
+    python tools/benchmarks/object_memory.py [size ...]
+
+Memory is traced with tracemalloc when it is available (Python 3),
+otherwise the growth of the process RSS is reported.
+"""
+
+import argparse
+import gc
+import os
+import resource
+import shutil
+import sys
+import tempfile
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from murano.tests.unit.dsl.foundation import object_model as om  # noqa
+from murano.tests.unit.dsl.foundation import runner  # noqa
+from murano.tests.unit.dsl.foundation import test_package_loader  # noqa
+
+ROOT = os.path.join(os.path.dirname(__file__), '..', '..')
+
+CLASS_DEFINITION = """
+Name: Named
+
+Properties:
+  name:
+    Contract: $.string()
+
+Methods:
+  getName:
+    Body:
+      Return: $.name
+
+--- # ------------------------------------------------------------------
+Name: Mixin1
+
+Methods:
+  method1:
+    Body:
+      Return: 1
+
+--- # ------------------------------------------------------------------
+Name: Mixin2
+
+Methods:
+  method2:
+    Body:
+      Return: 2
+
+--- # ------------------------------------------------------------------
+Name: Node
+
+Extends: [Named, Mixin1, Mixin2]
+
+Properties:
+  peer:
+    Contract: $.class(Node)
+
+  children:
+    Contract: [$.class(Node)]
+"""
+
+
+def build_model(size, fan_out=10):
+    """Builds a tree of nodes where each node references its sibling"""
+    root = om.Object('Node', name='root')
+    level = [root]
+    count = 1
+    while count < size:
+        next_level = []
+        for parent in level:
+            children = []
+            for i in range(min(fan_out, size - count)):
+                children.append(om.Object('Node', name=str(count)))
+                count += 1
+            for child, peer in zip(children, children[1:]):
+                child.data['peer'] = om.Ref(peer)
+            parent.data['children'] = children
+            next_level.extend(children)
+        level = next_level
+    return root
+
+
+def get_rss():
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def measure(size, loader):
+    model = build_model(size)
+    gc.collect()
+    if tracemalloc is not None:
+        tracemalloc.start()
+    rss = get_rss()
+    dsl_runner = runner.Runner(model, loader, {})
+    gc.collect()
+    if tracemalloc is not None:
+        used = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        kind = 'traced'
+    else:
+        used = get_rss() - rss
+        kind = 'RSS growth'
+    print('{0} objects: {1:10.2f} MB {2}, {3:8.0f} bytes/object'.format(
+        size, used / 1048576.0, kind, float(used) / size))
+    return dsl_runner
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('sizes', type=int, nargs='*', default=[10000])
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        with open(os.path.join(directory, 'Node.yaml'), 'w') as f:
+            f.write(CLASS_DEFINITION)
+        sys_loader = test_package_loader.TestPackageLoader(
+            os.path.join(ROOT, 'meta', 'io.murano', 'Classes'), 'io.murano')
+        loader = test_package_loader.TestPackageLoader(
+            directory, 'benchmark', sys_loader)
+        # warm up class loading so that it is not counted
+        measure(10, loader)
+        for size in args.sizes:
+            measure(size, loader)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
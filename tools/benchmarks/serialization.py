@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measures serialization of object models.
+
+Serializes synthetic object models of the given sizes with the single
+pass serializer and with the previous multi-pass implementation:
+
+    python tools/benchmarks/serialization.py [--rounds N] [size ...]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+
+import six
+from yaql import utils
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from murano.dsl import dsl  # noqa
+from murano.dsl import dsl_types  # noqa
+from murano.dsl import serializer  # noqa
+from murano.tests.unit.dsl.foundation import object_model as om  # noqa
+from murano.tests.unit.dsl.foundation import runner  # noqa
+from murano.tests.unit.dsl.foundation import test_package_loader  # noqa
+
+ROOT = os.path.join(os.path.dirname(__file__), '..', '..')
+
+CLASS_DEFINITION = """
+Name: Node
+
+Properties:
+  name:
+    Contract: $.string()
+
+  peer:
+    Contract: $.class(Node)
+
+  children:
+    Contract: [$.class(Node)]
+"""
+
+
+def build_model(size, fan_out=10):
+    """Builds a tree of nodes where each node references its sibling"""
+    root = om.Object('Node', name='root')
+    level = [root]
+    count = 1
+    while count < size:
+        next_level = []
+        for parent in level:
+            children = []
+            for i in range(min(fan_out, size - count)):
+                children.append(om.Object('Node', name=str(count)))
+                count += 1
+            for child, peer in zip(children, children[1:]):
+                child.data['peer'] = om.Ref(peer)
+            parent.data['children'] = children
+            next_level.extend(children)
+        level = next_level
+    return root
+
+
+def legacy_serialize_model(root_object, executor):
+    """Multi-pass serializer that was used before"""
+    designer_attributes = executor.object_store.designer_attributes
+
+    def pass12(value, parent, serialized_objects, attributes):
+        if isinstance(value, dsl.MuranoObjectInterface):
+            value = value.object
+        if isinstance(value, (six.string_types,
+                              int, float, bool)) or value is None:
+            return value, False
+        if isinstance(value, dsl_types.MuranoObject):
+            if (value.owner is not parent or
+                    value.object_id in serialized_objects):
+                return serializer.ObjRef(value), True
+        elif isinstance(value, serializer.ObjRef):
+            if (value.ref_obj.object_id not in serialized_objects and
+                    serializer.is_nested_in(value.ref_obj.owner, parent)):
+                value = value.ref_obj
+            else:
+                return value, False
+        if isinstance(value, dsl_types.MuranoObject):
+            result = value.to_dictionary()
+            if attributes is not None:
+                result['?'].update(attributes(value.object_id))
+                result['?']['_actions'] = \
+                    serializer._serialize_available_action(
+                        value, result['?'].get('_actions', {}))
+            serialized_objects.add(value.object_id)
+            return pass12(result, value, serialized_objects, attributes)
+        elif isinstance(value, utils.MappingType):
+            result = {}
+            need_another_pass = False
+            for d_key, d_value in six.iteritems(value):
+                result[str(d_key)], nmp = pass12(
+                    d_value, parent, serialized_objects, attributes)
+                need_another_pass = need_another_pass or nmp
+            return result, need_another_pass
+        else:
+            need_another_pass = False
+            result = []
+            for t in value:
+                v, nmp = pass12(t, parent, serialized_objects, attributes)
+                need_another_pass = need_another_pass or nmp
+                result.append(v)
+            return result, need_another_pass
+
+    def pass3(value, serialized_objects):
+        if isinstance(value, dict):
+            for d_key, d_value in value.items():
+                if isinstance(d_value, serializer.ObjRef):
+                    value[d_key] = d_value.ref_obj.object_id
+                else:
+                    pass3(d_value, serialized_objects)
+        elif isinstance(value, list):
+            for index, item in enumerate(value):
+                if isinstance(item, serializer.ObjRef):
+                    value[index] = item.ref_obj.object_id
+                else:
+                    pass3(item, serialized_objects)
+        return value
+
+    def serialize_object(attributes):
+        serialized_objects = set()
+        obj = root_object
+        while True:
+            obj, need_another_pass = pass12(
+                obj, None, serialized_objects, attributes)
+            if not need_another_pass:
+                break
+        return pass3(obj, serialized_objects), serialized_objects
+
+    tree, serialized_objects = serialize_object(designer_attributes)
+    return {
+        'Objects': tree,
+        'ObjectsCopy': serialize_object(None)[0],
+        'Attributes': executor.attribute_store.serialize(serialized_objects)
+    }
+
+
+def measure(name, func, size, rounds):
+    best = min(timeit.repeat(func, number=1, repeat=rounds))
+    print('{0:<40} {1:8.2f} ms {2:8.2f} us/object'.format(
+        name, best * 1000, best * 1e6 / size))
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('sizes', type=int, nargs='*', default=[1000, 10000])
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        with open(os.path.join(directory, 'Node.yaml'), 'w') as f:
+            f.write(CLASS_DEFINITION)
+        sys_loader = test_package_loader.TestPackageLoader(
+            os.path.join(ROOT, 'meta', 'io.murano', 'Classes'), 'io.murano')
+        loader = test_package_loader.TestPackageLoader(
+            directory, 'benchmark', sys_loader)
+
+        for size in args.sizes:
+            dsl_runner = runner.Runner(build_model(size), loader, {})
+            root, executor = dsl_runner.root, dsl_runner.executor
+            if (serializer.serialize_model(root, executor) !=
+                    legacy_serialize_model(root, executor)):
+                print('Serialized models differ')
+                return 1
+            base = measure('{0} objects, multi-pass'.format(size),
+                           lambda: legacy_serialize_model(root, executor),
+                           size, args.rounds)
+            best = measure('{0} objects, single pass'.format(size),
+                           lambda: serializer.serialize_model(root, executor),
+                           size, args.rounds)
+            print('speedup: {0:.2f}x'.format(base / best))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())